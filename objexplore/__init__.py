@@ -1,3 +1,13 @@
 # flake8: noqa
 from .objexplore import explore
 from .objexplore import version
+from .walk import walk
+from .snapshot import export_snapshot
+from .objexplore import explore_snapshot
+from .remote import serve
+from .objexplore import explore_remote
+from .objexplore import explore_heap
+from .census import take_census
+from .objexplore import explore_heap_diff
+from .objexplore import explore_threads
+from .objexplore import aexplore
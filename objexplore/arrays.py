@@ -0,0 +1,166 @@
+import sys
+from typing import Any, Optional, Tuple
+
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import CachedObject, LazyRows, highlighter, register_cached_type
+from .config import array_stats_chunk_bytes
+from .tasks import BackgroundTask
+from .utils import format_bytes
+
+# Kinds of dtypes that are summarized: bool, signed and unsigned integers and floats
+NUMERIC_KINDS = "biuf"
+
+
+def is_ndarray(obj: Any) -> bool:
+    """True for numpy arrays. numpy is never imported by objexplore: an object can only be an
+    array if the program being explored has imported numpy already
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
+class ArrayStats:
+    """Vectorized summary of an array, computed a chunk of rows along the first axis at a time so
+    no more than `chunk_bytes` of the array are read or copied at once. Arrays larger than one
+    chunk, such as memory mapped arrays, are summarized in the background
+    """
+
+    def __init__(self, array: Any, chunk_bytes: int = array_stats_chunk_bytes):
+        self.array = array
+        self.chunk_bytes = chunk_bytes
+        self.min: Any = None
+        self.max: Any = None
+        self.mean: Optional[float] = None
+        # Only counted for floating point arrays
+        self.nan_count: Optional[int] = None
+        self.task: Optional[BackgroundTask] = None
+
+    def start(self) -> "ArrayStats":
+        if self.array.dtype.kind not in NUMERIC_KINDS or not self.array.size:
+            return self
+        if self.array.nbytes <= self.chunk_bytes:
+            self.compute(None)
+        else:
+            self.task = BackgroundTask(self.compute, name="array-stats").start()
+        return self
+
+    def compute(self, task: Optional[BackgroundTask]):
+        numpy = sys.modules["numpy"]
+        array = self.array.reshape(1) if self.array.ndim == 0 else self.array
+        row_bytes = max(array[:1].nbytes, 1)
+        rows_per_chunk = max(self.chunk_bytes // row_bytes, 1)
+        is_float = array.dtype.kind == "f"
+        if task:
+            task.total = len(array)
+
+        minimum = maximum = None
+        total = 0.0
+        count = 0
+        nan_count = 0
+        for start in range(0, len(array), rows_per_chunk):
+            if task and task.cancelled.is_set():
+                return
+            # A view, only the rows of this chunk are read from a memory mapped array
+            values = array[start : start + rows_per_chunk]
+            if is_float:
+                nans = numpy.isnan(values)
+                num_nans = int(nans.sum())
+                if num_nans:
+                    nan_count += num_nans
+                    values = values[~nans]
+            if values.size:
+                chunk_min, chunk_max = values.min(), values.max()
+                minimum = chunk_min if minimum is None else min(minimum, chunk_min)
+                maximum = chunk_max if maximum is None else max(maximum, chunk_max)
+                total += float(values.sum(dtype=numpy.float64))
+                count += values.size
+            if task:
+                task.progress = start + rows_per_chunk
+
+        self.min, self.max = minimum, maximum
+        self.mean = total / count if count else None
+        self.nan_count = nan_count if is_float else None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and self.task.running
+
+    def text(self) -> Text:
+        array = self.array
+        kind = "memmap " if isinstance(array, sys.modules["numpy"].memmap) else ""
+        text = Text.assemble(
+            (kind, "dim"),
+            ("shape ", "dim"),
+            highlighter(str(array.shape)),
+            ("  dtype ", "dim"),
+            (str(array.dtype), "magenta"),
+            ("  nbytes ", "dim"),
+            (format_bytes(array.nbytes), "magenta"),
+        )
+        if self.running and self.task and self.task.total:
+            text.append(
+                f"  summarizing {self.task.progress / self.task.total:.0%}", "dim"
+            )
+            return text
+        for label, value in (("min", self.min), ("max", self.max), ("mean", self.mean)):
+            if value is not None:
+                text.append(f"  {label} ", "dim")
+                text.append_text(highlighter(format_number(value)))
+        if self.nan_count is not None:
+            text.append("  NaN ", "dim")
+            text.append(str(self.nan_count), "red" if self.nan_count else "cyan")
+        return text
+
+
+def format_number(value: Any) -> str:
+    try:
+        return f"{value:.6g}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class ArrayCachedObject(CachedObject):
+    """A numpy array, listed as its rows along the first axis. Each row is a view of the array, so
+    exploring a row moves on to the next axis without copying any data, down to the scalars of a
+    one dimensional array. Rows are only built once they are displayed
+    """
+
+    def __init__(self, obj: Any, *args, **kwargs):
+        super().__init__(obj, *args, **kwargs)
+        self.container = "ndarray"
+        self._stats: Optional[ArrayStats] = None
+
+    def cache_items(self):
+        if self.obj.ndim:
+            self.list_rows = LazyRows(self.obj.shape[0], self.array_row)
+
+    def array_row(self, index: int) -> Tuple[Text, CachedObject]:
+        item = self.obj[index]
+        line = (
+            Text(" [", style=Style(color="white"))
+            + Text(str(index), style=Style(color="blue"))
+            + Text("] ", style=Style(color="white"))
+        )
+        if self.obj.ndim > 1:
+            line += highlighter(f"{item.dtype}{list(item.shape)}")
+        else:
+            line += highlighter(str(item))
+        line.overflow = "ellipsis"
+        return line, CachedObject(item, parent_path=self.dotpath, index=index)
+
+    summary_title = "array"
+
+    @property
+    def stats(self) -> ArrayStats:
+        """ The summary of the array, computed the first time it is displayed """
+        if self._stats is None:
+            self._stats = ArrayStats(self.obj).start()
+        return self._stats
+
+    def summary(self) -> Text:
+        return self.stats.text()
+
+
+register_cached_type(is_ndarray, ArrayCachedObject)
@@ -1,8 +1,18 @@
 from dataclasses import dataclass
 import importlib
 import inspect
-import pkgutil
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from rich.console import Console
 from rich.highlighter import ReprHighlighter
@@ -11,6 +21,11 @@ from rich.style import Style
 from rich.syntax import Syntax
 from rich.text import Text
 
+from .config import sort_deep_sizeof_max_nodes
+from .introspection import introspection_cache
+from .perf import stats
+from .sizeof import DeepSize, shallow_sizeof
+from .tasks import BackgroundTask
 from .utils import is_empty
 
 highlighter = ReprHighlighter()
@@ -19,16 +34,311 @@ highlighter = ReprHighlighter()
 PUBLIC = "PUBLIC"
 PRIVATE = "PRIVATE"
 
+
+def attribute_names(obj: Any) -> Tuple[List[str], List[str]]:
+    """ Return the sorted public and private attribute names of an object, as listed by the explorer """
+    attrs = dir(obj)
+
+    if "__weakref__" in attrs:
+        # Ignore weakrefs
+        # Why??? I don't remember
+        attrs.remove("__weakref__")
+
+    public = sorted(attr for attr in attrs if not attr.startswith("_"))
+    private = sorted(attr for attr in attrs if attr.startswith("_"))
+    return public, private
+
+
+def iter_items(obj: Any) -> Iterator[Tuple[Any, Any]]:
+    """ Yield (key, value) for every key of a dict, or (index, item) for every item of a list/tuple/set """
+    if type(obj) == dict:
+        yield from obj.items()
+    elif isinstance(obj, (list, tuple, set)):
+        yield from enumerate(obj)
+
+
+class SortMode:
+    default = "default"
+    name = "name"
+    type = "type"
+    size = "size"
+    deep_size = "deep size"
+
+    # Order the modes are cycled through in the explorer
+    modes = [default, name, type, size, deep_size]
+
+
 console = Console()
 
 
-def safegetattr(obj, attr):
+def safegetattr(obj, attr, errors: Optional[Dict[str, Exception]] = None):
+    """ Get an attribute, returning None if it raises. Exceptions are recorded in `errors` if given """
     try:
         return getattr(obj, attr)
-    except Exception:
+    except Exception as err:
+        if errors is not None:
+            errors[attr] = err
         return None
 
 
+def container_kind(obj: Any) -> Optional[str]:
+    """Return "dict", "list", "tuple" or "set" if the explorer lists the object's keys/items"""
+    for kind in (dict, list, tuple, set):
+        if isinstance(obj, kind):
+            return kind.__name__
+    return None
+
+
+class DotPath:
+    """The path from the explored object to one of its children, such as `obj.a["k"][3]`. Stored as
+    the parent's path and a single attribute name or key/index, so building the path of a child
+    costs the same however deep it is. The highlighted text is only built once the path is shown.
+    Paths are equal if they go through the same names and keys
+    """
+
+    __slots__ = ("parent", "attr_name", "index", "_hash", "_text")
+
+    def __init__(
+        self,
+        parent: Optional["DotPath"] = None,
+        attr_name: Optional[str] = None,
+        index: Any = None,
+    ):
+        self.parent = parent
+        self.attr_name = attr_name
+        self.index = index
+        self._hash: Optional[int] = None
+        self._text: Optional[Text] = None
+
+    def segments(self) -> List["DotPath"]:
+        """ Every path from the root down to this one """
+        path: Optional[DotPath] = self
+        segments = []
+        while path is not None:
+            segments.append(path)
+            path = path.parent
+        segments.reverse()
+        return segments
+
+    @property
+    def text(self) -> Text:
+        """ The highlighted path, built the first time it is shown """
+        if self._text is None:
+            text = Text()
+            for path in self.segments():
+                if path.attr_name is not None:
+                    if path.parent is not None:
+                        text.append(".", style=Style(color="white"))
+                    text.append(path.attr_name, style=Style(color="cyan"))
+                elif type(path.index) == str:
+                    text.append("[", style=Style(color="white"))
+                    text.append_text(console.render_str(f'"{path.index}"'))
+                    text.append("]", style=Style(color="white"))
+                else:
+                    text.append("[", style=Style(color="white"))
+                    text.append_text(console.render_str(str(path.index)))
+                    text.append("]", style=Style(color="white"))
+            self._text = text
+        return self._text
+
+    @property
+    def plain(self) -> str:
+        parts = []
+        for path in self.segments():
+            if path.attr_name is not None:
+                parts.append(f".{path.attr_name}" if path.parent else path.attr_name)
+            elif type(path.index) == str:
+                parts.append(f'["{path.index}"]')
+            else:
+                parts.append(f"[{path.index}]")
+        return "".join(parts)
+
+    def key(self) -> Tuple[Optional[str], Any]:
+        return self.attr_name, self.index
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            try:
+                key_hash = hash(self.key())
+            except TypeError:
+                # Such as a key that is only hashable by identity in the dict it came from
+                key_hash = hash(repr(self.key()))
+            self._hash = hash((hash(self.parent), key_hash))
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, DotPath) or hash(self) != hash(other):
+            return False
+        return self.key() == other.key() and self.parent == other.parent
+
+    def __str__(self) -> str:
+        return self.plain
+
+    def __repr__(self) -> str:
+        return f"DotPath({self.plain!r})"
+
+
+def build_dotpath(
+    parent_path: Optional[DotPath], attr_name: Optional[str], index: Any
+) -> DotPath:
+    """ Build the dotpath of a child from its parent's dotpath and its attribute name or key/index """
+    if attr_name is not None:
+        return DotPath(parent_path, attr_name=attr_name)
+    elif index is not None:
+        return DotPath(parent_path, index=index)
+    raise ValueError("Need to specify an attribute name or an index")
+
+
+def attribute_text(name: str, kind: str, empty: bool, hidden: bool = False) -> Text:
+    """Build the line shown in the explorer for an attribute
+
+    :param kind: One of "module", "class", "function", "dict", "list", "tuple", "set" or ""
+    :param empty: Strike through the name, for attributes that are None or an empty container
+    :param hidden: Dim the name, for submodules that are not referenced from `dir()`
+    """
+    text = Text(name, style=Style(), overflow="ellipsis")
+
+    if kind == "module":
+        text.style = Style(color="blue")
+    elif kind == "class":
+        text.style = Style(color="magenta")
+    elif kind == "function":
+        text.style = Style(color="cyan", italic=True)
+        text += Text("()", style=Style(color="white"))
+    elif kind == "dict":
+        text.style = Style(color="light_sea_green")
+        text = (
+            Text("{**", style=Style(color="white"))
+            + text
+            + Text("}", style=Style(color="white"))
+        )
+    elif kind == "list":
+        text.style = Style(color="indian_red1")
+        text = (
+            Text("[*", style=Style(color="white"))
+            + text
+            + Text("]", style=Style(color="white"))
+        )
+    elif kind == "tuple":
+        text.style = Style(color="pale_violet_red1")
+        text = (
+            Text("(*", style=Style(color="white"))
+            + text
+            + Text(")", style=Style(color="white"))
+        )
+    elif kind == "set":
+        text.style = Style(color="light_goldenrod3")
+        text = (
+            Text("{*", style=Style(color="white"))
+            + text
+            + Text("}", style=Style(color="white"))
+        )
+
+    if empty:
+        text.style += Style(dim=True, strike=True)  # type: ignore
+
+    if hidden:
+        text.style += Style(dim=True)  # type: ignore
+
+    return text
+
+
+def dict_row_text(key: Any, typeof: str, empty: bool) -> Text:
+    """ Build the line shown in the explorer for a key of a dict """
+    repr_key: Text
+    repr_val: Text
+
+    if type(key) == str:
+        repr_key = console.render_str(f'"{key}"')
+    elif type(key) in (int, float, dict, list, set, tuple, bool, None):
+        repr_key = console.render_str(str(key))
+    else:
+        repr_key = highlighter(str(key))
+
+    repr_val = highlighter(typeof)
+
+    if empty:
+        repr_val.style += " dim"  # type: ignore
+        repr_val.style = repr_val.style.strip()  # type: ignore
+
+    line = Text(" ") + repr_key + Text(": ") + repr_val
+    line.overflow = "ellipsis"
+    return line
+
+
+def list_row_text(index: int, typeof: str, empty: bool) -> Text:
+    """ Build the line shown in the explorer for an item of a list/tuple/set """
+    line = (
+        Text(" [", style=Style(color="white"))
+        + Text(str(index), style=Style(color="blue"))
+        + Text("] ", style=Style(color="white"))
+        + highlighter(typeof)
+    )
+    if empty:
+        line.style += Style(dim=True)  # type: ignore
+    return line
+
+
+class LazyRows(Sequence):
+    """The rows of a list/tuple/set, each built the first time it is displayed or selected, so
+    listing a huge container does not create an object for every item up front
+    """
+
+    def __init__(
+        self,
+        length: int,
+        build_row: Callable[[int], Tuple[Text, Any]],
+        get_item: Optional[Callable[[int], Any]] = None,
+    ):
+        self.length = length
+        self.build_row = build_row
+        # Gets the item a row is built for, without building it, see `item()`
+        self.get_item = get_item
+        self.rows: Dict[int, Tuple[Text, Any]] = {}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):  # type: ignore
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("row index out of range")
+        if index not in self.rows:
+            self.rows[index] = self.build_row(index)
+        return self.rows[index]
+
+    def item(self, index: int) -> Tuple[Text, Any]:
+        """Return the line and the item of a row without keeping the row, and without building it if
+        the item can be got on its own. Safe to call from a background task
+        """
+        row = self.rows.get(index)
+        if row is not None:
+            return row[0], row[1].obj
+        if self.get_item is not None:
+            item = self.get_item(index)
+            return (
+                list_row_text(index, typeof=str(type(item)), empty=not is_empty(item)),
+                item,
+            )
+        line, child = self.build_row(index)
+        return line, child.obj
+
+
+# Subclasses of `CachedObject` that are created instead of it for the objects they match,
+# see `register_cached_type()`
+CACHED_TYPES: List[Tuple[Callable[[Any], bool], type]] = []
+
+
+def register_cached_type(matches: Callable[[Any], bool], cached_type: type):
+    """ Create a `cached_type` instead of a `CachedObject` for every object that `matches` """
+    CACHED_TYPES.append((matches, cached_type))
+
+
 class CachedObject:
     """Internal representation of every object that is being inspected/explored by objexplore
 
@@ -36,76 +346,60 @@ class CachedObject:
     TODO look up how other libraries document thier attributes
     """
 
+    # Title of the panel showing `summary()` in the overview
+    summary_title = ""
+
+    # The `tables.RecordTable` the items are displayed as in table mode
+    table: Optional[Any] = None
+
+    def __new__(cls, obj: Any = None, *args, **kwargs):
+        if cls is CachedObject:
+            for matches, cached_type in CACHED_TYPES:
+                if matches(obj):
+                    return super().__new__(cached_type)
+        return super().__new__(cls)
+
     def __init__(
         self,
         obj: Any,
-        parent_path: Text = None,
-        attr_name: str = None,
+        parent_path: Optional[DotPath] = None,
+        attr_name: Optional[str] = None,
         index: Any = None,
         hidden: bool = False,
     ):
+        stats.num_alive += 1
         self.obj = obj
         self.is_callable = callable(obj)
         self.attr_name = attr_name if attr_name else repr(self.obj)
 
         if self.obj is None:
             # TODO this doesn't seem like the right choice but removing it causes a crash. Investigate!
-            self.dotpath = highlighter("None")
-
-        elif attr_name is not None:
-            if not parent_path:
-                self.dotpath = Text(attr_name, style=Style(color="cyan"))
-            else:
-                self.dotpath = (
-                    parent_path
-                    + Text(".", style=Style(color="white"))
-                    + Text(attr_name, style=Style(color="cyan"))
-                )
-
-        elif index is not None:
-            if type(index) == str:
-                repr_index = console.render_str(f'"{index}"')
-            else:
-                repr_index = console.render_str(str(index))
-            if not parent_path:
-                self.dotpath = (
-                    Text("[", style=Style(color="white"))
-                    + repr_index
-                    + Text("]", style=Style(color="white"))
-                )
-            else:
-                self.dotpath = (
-                    parent_path
-                    + Text("[", style=Style(color="white"))
-                    + repr_index
-                    + Text("]", style=Style(color="white"))
-                )
+            self.dotpath = DotPath(attr_name="None")
         else:
-            raise ValueError("Need to specify an attribute name or an index")
-
-        self.plain_attrs = dir(self.obj)
+            self.dotpath = build_dotpath(parent_path, attr_name, index)
 
-        if "__weakref__" in self.plain_attrs:
-            # Ignore weakrefs
-            # Why??? I don't remember
-            self.plain_attrs.remove("__weakref__")
-
-        self.plain_public_attributes = sorted(
-            attr for attr in self.plain_attrs if not attr.startswith("_")
-        )
-        self.plain_private_attributes = sorted(
-            attr for attr in self.plain_attrs if attr.startswith("_")
-        )
+        (
+            self.plain_public_attributes,
+            self.plain_private_attributes,
+        ) = attribute_names(self.obj)
 
         self.public_attributes: Dict[str, CachedObject] = {}
         self.private_attributes: Dict[str, CachedObject] = {}
         self.filtered_public_attributes: Dict[str, CachedObject] = {}
         self.filtered_private_attributes: Dict[str, CachedObject] = {}
 
-        try:
-            self._source = inspect.getsource(self.obj)  # type: ignore
-        except Exception:
-            self._source = ""
+        # Every key/item of a dict/list/tuple/set, built once by `cache()` and narrowed down by `filter()`
+        self.dict_rows: Dict[Any, FilteredDictKey] = {}
+        self.list_rows: Sequence[Tuple[Text, CachedObject]] = []
+        self.sort_mode: str = SortMode.default
+        self.sort_keys: Dict[str, Any] = {}
+        # Computes the deep sizes of the children to sort them by, see `sort()`
+        self.sort_task: Optional[BackgroundTask] = None
+        # Where each listed child is with the current filters and sort order, see `position_of()`
+        self.positions: Optional[Dict[Any, int]] = None
+
+        start = time.perf_counter()
+        self._source = introspection_cache.source(self.obj)
 
         self.length: Optional[int]
 
@@ -120,26 +414,29 @@ class CachedObject:
         self.ismethod: bool = inspect.ismethod(self.obj)
         self.ismethoddescriptor: bool = inspect.ismethoddescriptor(self.obj)
         self.ismodule: bool = inspect.ismodule(self.obj)
+        self.container: Optional[str] = container_kind(self.obj)
 
         self.filters: List[Union[bool, Callable[[Any], Any]]] = []
         self.search_filter: str = ""
+        self.is_cached = False
 
         # Highlighted attributes
         self.typeof: Text = highlighter(str(type(self.obj)))
-        self.docstring: Text = console.render_str(inspect.getdoc(self.obj) or "None")
-        self.docstring_lines = self.docstring.split()
+        self._docstring: Optional[Text] = None
+        stats.add("inspect", time.perf_counter() - start)
+
+        start = time.perf_counter()
         self.repr = highlighter(repr(self.obj))
         if "\n" in self.repr:
             self.repr = self.repr.split("\n")[0]
         self.repr.overflow = "ellipsis"
         self.pretty = Pretty(self.obj)
-
-        self.text = Text(self.attr_name, style=Style(), overflow="ellipsis")
+        stats.add("repr", time.perf_counter() - start)
 
         if self.ismodule:
-            self.text.style = Style(color="blue")
+            kind = "module"
         elif self.isclass:
-            self.text.style = Style(color="magenta")
+            kind = "class"
         elif (
             self.isfunction
             or self.ismethod
@@ -147,42 +444,31 @@ class CachedObject:
             # builtin_function_or_method type. Don't know where this is defined
             or isinstance(self.obj, type("".capitalize))
         ):
-            self.text.style = Style(color="cyan", italic=True)
-            self.text += Text("()", style=Style(color="white"))
-        elif type(self.obj) == dict:
-            self.text.style = Style(color="light_sea_green")
-            self.text = (
-                Text("{**", style=Style(color="white"))
-                + self.text
-                + Text("}", style=Style(color="white"))
-            )
-        elif type(self.obj) == list:
-            self.text.style = Style(color="indian_red1")
-            self.text = (
-                Text("[*", style=Style(color="white"))
-                + self.text
-                + Text("]", style=Style(color="white"))
-            )
-        elif type(self.obj) == tuple:
-            self.text.style = Style(color="pale_violet_red1")
-            self.text = (
-                Text("(*", style=Style(color="white"))
-                + self.text
-                + Text(")", style=Style(color="white"))
-            )
-        elif type(self.obj) == set:
-            self.text.style = Style(color="light_goldenrod3")
-            self.text = (
-                Text("{*", style=Style(color="white"))
-                + self.text
-                + Text("}", style=Style(color="white"))
-            )
+            kind = "function"
+        elif type(self.obj) in (dict, list, tuple, set):
+            kind = type(self.obj).__name__
+        else:
+            kind = ""
+
+        self.text = attribute_text(
+            self.attr_name, kind=kind, empty=not is_empty(self.obj), hidden=hidden
+        )
 
-        if not is_empty(self.obj):
-            self.text.style += Style(dim=True, strike=True)  # type: ignore
+    def __del__(self):
+        stats.num_alive -= 1
 
-        if hidden:
-            self.text.style += Style(dim=True)  # type: ignore
+    @property
+    def docstring(self) -> Text:
+        """ The highlighted docstring, only rendered once it is shown """
+        if self._docstring is None:
+            self._docstring = console.render_str(
+                introspection_cache.docstring(self.obj) or "None"
+            )
+        return self._docstring
+
+    @property
+    def docstring_lines(self) -> List[Text]:
+        return list(self.docstring.split())
 
     @property
     def title(self):
@@ -197,29 +483,34 @@ class CachedObject:
     def cache(self):
         """ Cache any attributes that are useful to this object for easy access later """
 
-        if not self.public_attributes:
-            for attr in self.plain_public_attributes:
-                self.public_attributes[attr] = CachedObject(
-                    safegetattr(self.obj, attr),
-                    parent_path=self.dotpath,
-                    attr_name=attr,
-                )
+        if self.is_cached:
+            stats.cache_hits += 1
+            self.filter()
+            return
+        stats.cache_misses += 1
+
+        for attr in self.plain_public_attributes:
+            self.public_attributes[attr] = CachedObject(
+                self.timed_getattr(attr),
+                parent_path=self.dotpath,
+                attr_name=attr,
+            )
 
-        if not self.private_attributes:
-            for attr in self.plain_private_attributes:
-                self.private_attributes[attr] = CachedObject(
-                    safegetattr(self.obj, attr),
-                    parent_path=self.dotpath,
-                    attr_name=attr,
-                )
+        for attr in self.plain_private_attributes:
+            self.private_attributes[attr] = CachedObject(
+                self.timed_getattr(attr),
+                parent_path=self.dotpath,
+                attr_name=attr,
+            )
 
         # Sometimes a module will have submodules that are not referenced from a call to `dir()`
         # This check will look through all submodules that are not referenced by `dir()` and add
         # them to the cached attributes
         if self.ismodule:
             prefix = safegetattr(self.obj, "__name__") + "."
-            path = safegetattr(self.obj, "__path__")
-            for importer, full_module_name, ispkg in pkgutil.iter_modules(path, prefix):
+            # Only packages have submodules, the directories they are in are listed once per change
+            path = safegetattr(self.obj, "__path__") or []
+            for full_module_name, ispkg in introspection_cache.submodules(path, prefix):
                 name = full_module_name.rsplit(".")[-1]
                 if name in self.public_attributes or name in self.private_attributes:
                     # Skip over submodules that have already been indexed
@@ -240,11 +531,67 @@ class CachedObject:
                         module, parent_path=self.dotpath, attr_name=name, hidden=True
                     )
 
+        self.cache_items()
+        introspection_cache.save()
+
         self.num_public_attributes: int = len(self.public_attributes)
         self.num_private_attributes: int = len(self.private_attributes)
+        self.is_cached = True
 
         self.filter()
 
+    def summary(self) -> Optional[Text]:
+        """ A summary of the object shown below its type in the overview, for objects that have one """
+        return None
+
+    def refresh(self):
+        """ Bring the rows up to date before they are drawn, for objects whose children change while they are explored """
+
+    def prefetch(self, end: int):
+        """ Make the first `end` rows available before they are drawn, for objects whose rows are produced on demand """
+
+    def return_value(self) -> Any:
+        """ The object returned from `explore()` when this object is selected and `r` is pressed """
+        return self.obj
+
+    def timed_getattr(self, attr: str) -> Any:
+        """ Get an attribute of this object, recording how long the lookup took """
+        start = time.perf_counter()
+        value = safegetattr(self.obj, attr)
+        seconds = time.perf_counter() - start
+        stats.add("getattr", seconds)
+        stats.record_attribute(seconds, self.dotpath.plain, attr)
+        return value
+
+    def cache_items(self):
+        """ Build the rows listed by the explorer for each key of a dict, or each item of a list/tuple/set """
+        if type(self.obj) == dict:
+            for key, val in iter_items(self.obj):
+                self.dict_rows[key] = self.dict_row(key, val)
+
+        elif isinstance(self.obj, (list, tuple, set)):
+            # A shallow copy, rows are only built from it when they are displayed
+            items = list(self.obj)
+            self.list_rows = LazyRows(
+                len(items),
+                lambda index: self.item_row(index, items[index]),
+                get_item=items.__getitem__,
+            )
+
+    def dict_row(self, key: Any, val: Any) -> "FilteredDictKey":
+        """ Build the row listed by the explorer for a key of a dict """
+        return FilteredDictKey(
+            text=dict_row_text(key, typeof=str(type(val)), empty=not is_empty(val)),
+            cached_object=CachedObject(val, parent_path=self.dotpath, index=key),
+        )
+
+    def item_row(self, index: int, item: Any) -> Tuple[Text, "CachedObject"]:
+        """ Build the row listed by the explorer for an item of a list/tuple/set """
+        return (
+            list_row_text(index, typeof=str(type(item)), empty=not is_empty(item)),
+            CachedObject(item, parent_path=self.dotpath, index=index),
+        )
+
     def set_filters(
         self, filters: List[Union[bool, Callable[[Any], Any]]], search_filter: str = ""
     ):
@@ -253,8 +600,17 @@ class CachedObject:
         self.search_filter = search_filter.lower()
         self.filter()
 
+    def set_sort(self, sort_mode: str):
+        """ Change the order the attributes/keys/items are listed in and re-sort the filtered rows """
+        self.sort_mode = sort_mode
+        if self.sort_task is not None:
+            self.sort_task.cancel()
+            self.sort_task = None
+        self.sort()
+
     def filter(self):
         """ Run the filters on all of this objects attributes """
+        start = time.perf_counter()
         self.filtered_public_attributes = {}
         for attr, cached_obj in self.public_attributes.items():
             if self.search_filter not in attr.lower():
@@ -283,70 +639,155 @@ class CachedObject:
                         break
         self.num_filtered_private_attributes = len(self.filtered_private_attributes)
 
-        self.filtered_dict: Dict[str, FilteredDictKey] = {}
-        if type(self.obj) == dict:
-            for key, val in self.obj.items():
-                repr_key: Text
-                repr_val: Text
-
-                if type(key) == str:
-                    repr_key = console.render_str(f'"{key}"')
-                elif type(key) in (int, float, dict, list, set, tuple, bool, None):
-                    repr_key = console.render_str(str(key))
-                else:
-                    repr_key = highlighter(str(key))
-
-                repr_val = highlighter(str(type(val)))
-
-                if not is_empty(val):
-                    repr_val.style += " dim"
-                    repr_val.style = repr_val.style.strip()
-
-                line = Text(" ") + repr_key + Text(": ") + repr_val
-                line.overflow = "ellipsis"
+        self.filtered_dict: Dict[Any, FilteredDictKey] = {}
+        for key, row in self.dict_rows.items():
+            if type(key) == str and self.search_filter not in key.lower():
+                continue
+            if not self.filters or any(
+                _filter(row.cached_object) for _filter in self.filters
+            ):
+                self.filtered_dict[key] = row
+        self.num_filtered_dict_keys = len(self.filtered_dict)
 
-                cached_obj = CachedObject(val, parent_path=self.dotpath, index=key)
+        self.filtered_list: Sequence[Tuple[Text, CachedObject]]
+        if self.filters:
+            self.filtered_list = [
+                row
+                for row in self.list_rows
+                if any(_filter(row[1]) for _filter in self.filters)
+            ]
+        else:
+            # Not copied, so rows that are built lazily stay lazy until they are filtered or sorted
+            self.filtered_list = self.list_rows
+        self.num_filtered_list_items = len(self.filtered_list)
 
-                if type(key) == str and self.search_filter not in key.lower():
-                    continue
-                if self.filters:
-                    for _filter in self.filters:
-                        if _filter(cached_obj):
-                            self.filtered_dict[key] = FilteredDictKey(
-                                text=line, cached_object=cached_obj
-                            )
-                            break
-                else:
-                    self.filtered_dict[key] = FilteredDictKey(
-                        text=line, cached_object=cached_obj
+        self.positions = None
+        stats.add("filter", time.perf_counter() - start)
+        self.sort()
+
+    def sort(self):
+        """Sort the filtered rows by the current sort mode. The filtered rows are always built in the
+        default order and Python's sort is stable, so the order is the same whatever filters are applied
+        """
+        if self.sort_mode == SortMode.default:
+            return
+
+        if self.sort_mode == SortMode.deep_size:
+            children = self.sort_children()
+            if any(SortMode.deep_size not in child.sort_keys for child in children):
+                # Listed in their current order until the deep sizes are computed in the background
+                if self.sort_task is None:
+                    self.sort_task = BackgroundTask(
+                        lambda task: self.compute_deep_sizes(task, children),
+                        name="sort-deep-size",
                     )
+                    self.sort_task.total = len(children)
+                    self.sort_task.start()
+                return
+
+        start = time.perf_counter()
+        mode = self.sort_mode
+        self.filtered_public_attributes = dict(
+            sorted(
+                self.filtered_public_attributes.items(),
+                key=lambda item: item[1].sort_key(mode, item[0]),
+            )
+        )
+        self.filtered_private_attributes = dict(
+            sorted(
+                self.filtered_private_attributes.items(),
+                key=lambda item: item[1].sort_key(mode, item[0]),
+            )
+        )
+        self.filtered_dict = dict(
+            sorted(
+                self.filtered_dict.items(),
+                key=lambda item: item[1].cached_object.sort_key(mode, str(item[0])),
+            )
+        )
+        self.filtered_list = sorted(
+            self.filtered_list, key=lambda row: row[1].sort_key(mode, "")
+        )
+        self.positions = None
+        stats.add("filter", time.perf_counter() - start)
+
+    def position_of(self, key: Any) -> Optional[int]:
+        """Return where the child at a dict key or list index is listed with the current filters and
+        sort order, None if it is not listed. Positions are indexed once per filter or sort, every
+        lookup after the first is a hash lookup
+        """
+        if self.dict_rows:
+            try:
+                if key not in self.filtered_dict:
+                    return None
+            except TypeError:
+                # Unhashable, it cannot be a key
+                return None
+            if self.positions is None:
+                self.positions = {
+                    key: position for position, key in enumerate(self.filtered_dict)
+                }
+            return self.positions[key]
+
+        if type(key) is not int:
+            return None
+        if key < 0:
+            key += len(self.list_rows)
+        if not 0 <= key < len(self.list_rows):
+            return None
+        if self.filtered_list is self.list_rows:
+            # Neither filtered nor sorted, items are listed at their own index
+            return key
+        if self.positions is None:
+            self.positions = {
+                id(row[1]): position for position, row in enumerate(self.filtered_list)
+            }
+        return self.positions.get(id(self.list_rows[key][1]))
+
+    def sort_children(self) -> List["CachedObject"]:
+        """ The filtered children that are sorted """
+        return (
+            list(self.filtered_public_attributes.values())
+            + list(self.filtered_private_attributes.values())
+            + [row.cached_object for row in self.filtered_dict.values()]
+            + [row[1] for row in self.filtered_list]
+        )
 
-        self.num_filtered_dict_keys = len(self.filtered_dict)
-
-        self.filtered_list: List[Tuple[Text, CachedObject]] = []
-        if isinstance(self.obj, (list, tuple, set)):
-            for index, item in enumerate(self.obj):
-                line = (
-                    Text(" [", style=Style(color="white"))
-                    + Text(str(index), style=Style(color="blue"))
-                    + Text("] ", style=Style(color="white"))
-                    + highlighter(str(type(item)))
-                )
-                if not is_empty(item):
-                    line.style += Style(dim=True)
-
-                self.filtered_list.append(
-                    (line, CachedObject(item, parent_path=self.dotpath, index=index))
+    @staticmethod
+    def compute_deep_sizes(task: BackgroundTask, children: List["CachedObject"]):
+        for child in children:
+            if SortMode.deep_size not in child.sort_keys:
+                size = DeepSize(child.obj, max_nodes=sort_deep_sizeof_max_nodes)
+                if not size.compute(task).done:
+                    return
+                # Negate sizes to sort them largest first
+                child.sort_keys[SortMode.deep_size] = -size.size
+            task.progress += 1
+
+    def update_sort(self):
+        """ Sort the rows once the deep sizes computed in the background are ready """
+        task = self.sort_task
+        if task is not None and task.done:
+            self.sort_task = None
+            if not task.cancelled.is_set() and not task.error:
+                self.sort()
+
+    def sort_key(self, sort_mode: str, name: str) -> Any:
+        """ Return the key used to sort this object amongst its siblings, computed once per sort mode """
+        if sort_mode not in self.sort_keys:
+            if sort_mode == SortMode.name:
+                self.sort_keys[sort_mode] = name.lower()
+            elif sort_mode == SortMode.type:
+                self.sort_keys[sort_mode] = (
+                    type(self.obj).__module__,
+                    type(self.obj).__qualname__,
                 )
-            if self.filters:
-                new_filtered_list: List[Tuple[Text, CachedObject]] = []
-                for line, cached_obj in self.filtered_list:
-                    for _filter in self.filters:
-                        if _filter(cached_obj):
-                            new_filtered_list.append((line, cached_obj))
-                            break
-                self.filtered_list = new_filtered_list
-        self.num_filtered_list_items = len(self.filtered_list)
+            elif sort_mode == SortMode.size:
+                # Negate sizes to sort them largest first
+                self.sort_keys[sort_mode] = -shallow_sizeof(self.obj)
+            else:
+                self.sort_keys[sort_mode] = 0
+        return self.sort_keys[sort_mode]
 
     def current_visible_attributes(self):
         """ TODO """
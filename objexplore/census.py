@@ -0,0 +1,381 @@
+import gc
+import inspect
+import operator
+import sys
+import threading
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import (
+    CachedObject,
+    DotPath,
+    FilteredDictKey,
+    LazyRows,
+    SortMode,
+    console,
+    highlighter,
+    list_row_text,
+)
+from .tasks import BackgroundTask
+from .utils import format_bytes, is_empty
+
+# Number of objects counted between progress updates and cancellation checks
+CHUNK_SIZE = 10_000
+
+
+def type_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class HeapCensus:
+    """Count the objects tracked by the garbage collector and their total shallow size per type.
+    The census runs in a background task and can be read while it is still running
+
+    Only the type objects are referenced once the census is done, never the counted objects.
+    With `record_ids=True` the id and type of every object are also recorded in compact arrays,
+    so later censuses can be compared against this one with `CensusDiff`
+    """
+
+    def __init__(self, record_ids: bool = False):
+        self.counts: Dict[type, int] = {}
+        self.sizes: Dict[type, int] = {}
+        self.lock = threading.Lock()
+        self.task: Optional[BackgroundTask] = None
+
+        self.record_ids = record_ids
+        # The id of every object counted, and the index of its type in `types`
+        self.ids = array("Q")
+        self.type_codes = array("I")
+        self.types: List[type] = []
+        self.codes: Dict[type, int] = {}
+
+    def start(self) -> "HeapCensus":
+        self.task = BackgroundTask(self.compute, name="heap-census").start()
+        return self
+
+    def compute(self, task: BackgroundTask):
+        objects = gc.get_objects()
+        task.total = len(objects)
+        for start in range(0, len(objects), CHUNK_SIZE):
+            if task.cancelled.is_set():
+                return
+            chunk = objects[start : start + CHUNK_SIZE]
+            counts = Counter(map(type, chunk))
+            if self.record_ids:
+                for cls in counts:
+                    if cls not in self.codes:
+                        self.codes[cls] = len(self.types)
+                        self.types.append(cls)
+                self.ids.extend(map(id, chunk))
+                self.type_codes.extend(map(self.codes.__getitem__, map(type, chunk)))
+            sizes: Dict[type, int] = dict.fromkeys(counts, 0)
+            for obj in chunk:
+                try:
+                    sizes[type(obj)] += sys.getsizeof(obj)
+                except Exception:
+                    pass
+            with self.lock:
+                for cls, count in counts.items():
+                    self.counts[cls] = self.counts.get(cls, 0) + count
+                    self.sizes[cls] = self.sizes.get(cls, 0) + sizes[cls]
+            task.progress = start + len(chunk)
+
+    def totals(self) -> List["TypeCount"]:
+        """ Return the count and size of every type counted so far, most common types first """
+        with self.lock:
+            totals = [
+                TypeCount(cls, count, self.sizes[cls])
+                for cls, count in self.counts.items()
+            ]
+        return sorted(totals, key=lambda total: -total.count)
+
+    def instances(self, cls: type) -> List[Any]:
+        """ Collect the live instances of a type """
+        return [obj for obj in gc.get_objects() if type(obj) is cls]
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and self.task.running
+
+    @property
+    def num_objects(self) -> int:
+        return self.task.progress if self.task else 0
+
+    def close(self):
+        """ Stop the census and drop every type it references """
+        if self.task:
+            self.task.cancel()
+        with self.lock:
+            self.counts = {}
+            self.sizes = {}
+            self.ids = array("Q")
+            self.type_codes = array("I")
+            self.types = []
+            self.codes = {}
+
+    def __repr__(self) -> str:
+        if self.running and self.task and self.task.total:
+            done = f"{self.task.progress / self.task.total:.0%} of {self.task.total:,}"
+            return f"<heap census, {done} objects counted>"
+        return (
+            f"<heap census of {self.num_objects:,} objects, {len(self.counts):,} types>"
+        )
+
+
+def take_census() -> HeapCensus:
+    """
+    Count every object tracked by the garbage collector now, recording their ids so the census
+    can be compared with the heap at a later point with `objexplore.explore_heap_diff()`:
+
+    >>> before = objexplore.take_census()
+    >>> run_for_a_while()
+    >>> objexplore.explore_heap_diff(before)
+
+    The census only references the types of the objects, never the objects themselves
+    """
+    census = HeapCensus(record_ids=True).start()
+    census.task.join()  # type: ignore
+    return census
+
+
+class CensusDiff:
+    """The change in the number and size of the objects of each type between a census taken
+    earlier and a new census taken in the background. Objects whose id was not recorded by the
+    earlier census are new. An object allocated at the address of an object freed in between
+    is not counted as new
+    """
+
+    def __init__(self, before: HeapCensus):
+        if not before.record_ids:
+            raise ValueError(
+                "The census was taken without recording ids, use objexplore.take_census()"
+            )
+        self.before = before
+        self.after = HeapCensus(record_ids=True)
+        self.new_counts: Dict[type, int] = {}
+        self.new_ids: Set[int] = set()
+        self.task: Optional[BackgroundTask] = None
+
+    def start(self) -> "CensusDiff":
+        self.task = self.after.task = BackgroundTask(
+            self.compute, name="heap-diff"
+        ).start()
+        return self
+
+    def compute(self, task: BackgroundTask):
+        self.after.compute(task)
+        if task.cancelled.is_set():
+            return
+
+        # Set and array operations only, nothing loops over the objects in Python
+        before_ids = set(self.before.ids)
+        is_new = list(map(operator.not_, map(before_ids.__contains__, self.after.ids)))
+        del before_ids
+        self.new_ids = set(compress(self.after.ids, is_new))
+        types = self.after.types
+        self.new_counts = {
+            types[code]: count
+            for code, count in Counter(compress(self.after.type_codes, is_new)).items()
+        }
+
+    def totals(self) -> List["TypeCount"]:
+        """Return the change in count and size since the earlier census of every type that changed,
+        types with the most new objects first
+        """
+        if self.running:
+            return []
+        before, after = self.before, self.after
+        totals = []
+        for cls in set(before.counts) | set(after.counts):
+            count = after.counts.get(cls, 0) - before.counts.get(cls, 0)
+            size = after.sizes.get(cls, 0) - before.sizes.get(cls, 0)
+            new = self.new_counts.get(cls, 0)
+            if count or size or new:
+                totals.append(TypeCount(cls, count, size, new=new))
+        return sorted(totals, key=lambda total: (-(total.new or 0), -total.count))
+
+    def instances(self, cls: type) -> List[Any]:
+        """ Collect the instances of a type that are new since the earlier census """
+        new_ids = self.new_ids
+        return [
+            obj for obj in gc.get_objects() if type(obj) is cls and id(obj) in new_ids
+        ]
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and self.task.running
+
+    @property
+    def num_objects(self) -> int:
+        return self.task.progress if self.task else 0
+
+    def close(self):
+        """ Stop the census and drop what was computed, the earlier census is left untouched """
+        self.after.close()
+        self.new_counts = {}
+        self.new_ids = set()
+
+    def __repr__(self) -> str:
+        if self.running:
+            return f"<heap diff, {self.after!r}>"
+        count = sum(self.after.counts.values()) - sum(self.before.counts.values())
+        size = sum(self.after.sizes.values()) - sum(self.before.sizes.values())
+        return f"<heap diff of {count:+,} objects, {signed_bytes(size)}, {len(self.new_ids):,} new>"
+
+
+def signed_bytes(num_bytes: int) -> str:
+    return ("+" if num_bytes >= 0 else "") + format_bytes(num_bytes)
+
+
+class TypeCount:
+    """ The number of instances of a type found by a census and their total shallow size """
+
+    def __init__(self, cls: type, count: int, size: int, new: Optional[int] = None):
+        self.cls = cls
+        self.count = count
+        self.size = size
+        # Only set by a `CensusDiff`, where the count and size are changes since the earlier census
+        self.new = new
+
+    @property
+    def num_instances(self) -> int:
+        """ The number of instances listed when the type is explored """
+        return self.count if self.new is None else self.new
+
+    def __repr__(self) -> str:
+        if self.new is None:
+            return f"<{self.count:,} {type_name(self.cls)} objects, {format_bytes(self.size)}>"
+        return f"<{self.count:+,} {type_name(self.cls)} objects, {signed_bytes(self.size)}, {self.new:,} new>"
+
+    def text(self, name: str) -> Text:
+        """ Build the line shown in the explorer for the type """
+        line = Text(" ") + Text(name, style=Style(color="magenta")) + Text(": ")
+        if self.new is None:
+            line += Text(f"{self.count:,}", style=Style(color="cyan"))
+            line += Text(f" {format_bytes(self.size)}", style=Style(dim=True))
+        else:
+            line += Text(
+                f"{self.count:+,}",
+                style=Style(color="red" if self.count > 0 else "green"),
+            )
+            line += Text(f" {signed_bytes(self.size)}", style=Style(dim=True))
+            line += Text(f" {self.new:,} new", style=Style(color="cyan"))
+        line.overflow = "ellipsis"
+        return line
+
+
+class TypeInstances(CachedObject):
+    """A census row that lists the instances of its type when it is explored. The instances are
+    only collected when the row is explored, and only referenced until `release()`
+    """
+
+    def __init__(
+        self,
+        census: Union[HeapCensus, CensusDiff],
+        record: TypeCount,
+        parent_path: DotPath,
+    ):
+        super().__init__(record, parent_path=parent_path, index=type_name(record.cls))
+        self.census = census
+        self.record = record
+        self.container = "list"
+        self.length = record.num_instances
+        self.typeof = highlighter(str(record.cls))
+        self._docstring = console.render_str(inspect.getdoc(record.cls) or "None")
+        self.instances: List[Any] = []
+
+    def cache(self):
+        if self.is_cached:
+            self.filter()
+            return
+
+        self.instances = self.census.instances(self.record.cls)
+        self.length = len(self.instances)
+        self.list_rows = LazyRows(len(self.instances), self.instance_row)
+        self.num_public_attributes = self.num_private_attributes = 0
+        self.is_cached = True
+        self.filter()
+
+    def instance_row(self, index: int) -> Tuple[Text, CachedObject]:
+        item = self.instances[index]
+        return (
+            list_row_text(index, typeof=str(type(item)), empty=not is_empty(item)),
+            CachedObject(item, parent_path=self.dotpath, index=index),
+        )
+
+    def release(self):
+        """ Drop the references to the instances, they are collected again if the row is explored again """
+        if self.is_cached:
+            self.instances = []
+            self.list_rows = []
+            self.is_cached = False
+            self.filter()
+
+    def sort_key(self, sort_mode: str, name: str) -> Any:
+        if sort_mode == SortMode.type:
+            return self.record.cls.__module__, self.record.cls.__qualname__
+        elif sort_mode in (SortMode.size, SortMode.deep_size):
+            return -self.record.size
+        return super().sort_key(sort_mode, name)
+
+
+class CensusCachedObject(CachedObject):
+    """The explorer listing of a `HeapCensus` or a `CensusDiff`: a dict-like listing of every type
+    counted, updated while the census is running
+    """
+
+    def __init__(self, census: Union[HeapCensus, CensusDiff], attr_name: str = "heap"):
+        super().__init__(census, attr_name=attr_name)
+        self.census = census
+        self.container = "dict"
+        self.length = 0
+        self.type_rows: Dict[type, TypeInstances] = {}
+        self.rows_progress: Optional[Tuple[int, bool]] = None
+
+    def cache(self):
+        if not self.is_cached:
+            self.num_public_attributes = self.num_private_attributes = 0
+            self.is_cached = True
+        self.refresh()
+
+    def refresh(self):
+        """ Update the rows if the census has progressed, and release the instances collected by rows explored earlier """
+        for row in self.type_rows.values():
+            row.release()
+
+        progress = (self.census.num_objects, self.census.running)
+        if progress == self.rows_progress:
+            return
+        self.rows_progress = progress
+
+        self.dict_rows = {}
+        for record in self.census.totals():
+            cls = record.cls
+            name = type_name(cls)
+            if name in self.dict_rows:
+                # Distinct classes can share a name, such as classes defined in functions
+                name = f"{name} at {id(cls):#x}"
+            if cls in self.type_rows:
+                # Rows are updated rather than rebuilt so the census stays cheap to redraw
+                row = self.type_rows[cls]
+                row.record.count = record.count
+                row.record.size = record.size
+                row.record.new = record.new
+                row.length = record.num_instances
+                row.repr = highlighter(repr(record))
+                row.sort_keys = {}
+            else:
+                row = self.type_rows[cls] = TypeInstances(
+                    self.census, record, parent_path=self.dotpath
+                )
+            self.dict_rows[name] = FilteredDictKey(
+                text=record.text(name), cached_object=row
+            )
+        self.length = len(self.dict_rows)
+        self.typeof = highlighter(repr(self.census))
+        self.filter()
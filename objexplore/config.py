@@ -1,6 +1,69 @@
+import os
+
 from rich.box import (
     # SQUARE,
     ROUNDED,
 )
 
 box_type = ROUNDED
+
+# Maximum number of objects visited when estimating the deep size of an object
+deep_sizeof_max_nodes = 100_000
+
+# Maximum number of objects visited per child when sorting by deep size
+sort_deep_sizeof_max_nodes = 10_000
+
+# Limits for the deep search across the object graph
+deep_search_max_depth = 8
+deep_search_max_nodes = 200_000
+deep_search_max_results = 1_000
+
+# Number of objects whose deep size, referrers or contents stay cached once another object is
+# selected. Cached objects are kept alive, the least recently selected ones are released
+object_cache_size = 32
+
+# Limits for the search for the referrers of an object
+referrers_time_budget = 2.0
+referrers_max_depth = 4
+referrers_max_per_object = 20
+
+# Watch mode: seconds between polls of the object being explored, number of items/attribute
+# values hashed per child to notice changes, and how long changed rows stay highlighted. Besides
+# the rows in view, this many other keys/items of a container are polled each time
+watch_interval = 1.0
+watch_hash_items = 32
+watch_highlight_seconds = 3.0
+watch_slice_size = 1_000
+
+# Arrays are summarized this many bytes at a time, in the background if they are any larger
+array_stats_chunk_bytes = 16 * 1024 * 1024
+
+# Table mode: number of items sampled to detect a list of records, most fields shown, and the
+# most distinct values of a column counted
+table_sample_size = 64
+table_max_fields = 32
+table_max_distinct = 100_000
+
+# Containers with at least this many items show what they hold in the overview, from a sample
+# of this many items taken "stratified" (evenly spread) or "random"
+contents_min_length = 10_000
+contents_sample_size = 1_000
+contents_sample_method = "stratified"
+# Number of containers whose contents stay cached once another object is selected
+contents_cache_size = 4
+
+# Iterators are pulled this many items at a time as they are scrolled through, and no more than
+# `iterator_buffer_size` items are ever pulled
+iterator_page_size = 100
+iterator_buffer_size = 10_000
+
+# Expression filter: children evaluated between checks for cancellation, or given at once to a
+# vectorized expression over an array or Series, and the most matches listed
+expression_chunk_size = 10_000
+expression_max_results = 1_000
+
+# The docstrings and source line ranges of the modules, classes and functions explored, and the
+# submodules of packages, are kept in this file across sessions. None to look them up every session
+introspection_cache_path = os.path.join(
+    os.path.expanduser("~"), ".cache", "objexplore", "introspection.db"
+)
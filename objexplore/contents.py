@@ -0,0 +1,234 @@
+import random
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from rich.style import Style
+from rich.text import Text
+
+from .config import (
+    contents_cache_size,
+    contents_min_length,
+    contents_sample_method,
+    contents_sample_size,
+)
+from .tasks import BackgroundTask
+from .utils import ObjectCache
+
+# Containers whose items are summarized, the values of a dict are summarized
+CONTAINER_TYPES = (list, tuple, set, frozenset, dict)
+
+
+def has_contents(obj: Any, min_length: int = contents_min_length) -> bool:
+    """ True for the live builtin containers too large to look through """
+    return type(obj) in CONTAINER_TYPES and len(obj) >= min_length
+
+
+def sample_positions(length: int, size: int, method: str) -> List[int]:
+    """The sorted positions of the items sampled. `stratified` takes one item from each of `size`
+    equal strata of the container, `random` takes `size` items uniformly at random
+    """
+    if length <= size:
+        return list(range(length))
+    if method == "random":
+        return sorted(random.sample(range(length), size))
+    elif method == "stratified":
+        return [position * length // size for position in range(size)]
+    raise ValueError(f"Unknown sample method {method!r}")
+
+
+def sample_items(
+    obj: Any,
+    size: int = contents_sample_size,
+    method: str = contents_sample_method,
+) -> List[Any]:
+    """Take a sample of the items of a container. Lists and tuples are indexed, dicts and sets are
+    iterated once, skipping over the items between the positions sampled without looking at them
+    """
+    positions = sample_positions(len(obj), size, method)
+    if type(obj) in (list, tuple):
+        return [obj[position] for position in positions]
+
+    items = iter(obj.values() if type(obj) == dict else obj)
+    sample: List[Any] = []
+    previous = -1
+    for position in positions:
+        sample.extend(islice(items, position - previous - 1, position - previous))
+        previous = position
+    return sample
+
+
+class ContentsSummary:
+    """The types of a container's items, the lengths of the containers among them and an example
+    of each type, from a sample of the items or all of them
+    """
+
+    def __init__(self, total: int):
+        # Number of items in the container
+        self.total = total
+        self.count = 0
+        self.types: Counter = Counter()
+        self.lengths: Counter = Counter()
+        self.examples: Dict[type, str] = {}
+
+    def add(self, items: Iterable[Any]):
+        for item in items:
+            cls = type(item)
+            self.types[cls] += 1
+            if cls in CONTAINER_TYPES:
+                self.lengths[len(item)] += 1
+            if cls not in self.examples:
+                self.examples[cls] = repr(item).split("\n")[0][:40]
+            self.count += 1
+
+    def length_percentile(self, percent: int) -> int:
+        rank = (sum(self.lengths.values()) - 1) * percent // 100
+        for length in sorted(self.lengths):
+            rank -= self.lengths[length]
+            if rank < 0:
+                return length
+        return 0
+
+    def get_lines(self, title: Text) -> List[Text]:
+        """ The summary in four lines: what it was computed from, the types, the nested lengths and the examples """
+        dim = Style(dim=True)
+        types = Text()
+        for cls, count in self.types.most_common(5):
+            types.append(f"{cls.__name__} ", Style(color="magenta"))
+            types.append(f"{count / max(self.count, 1):.0%}  ", Style(color="cyan"))
+        if len(self.types) > 5:
+            types.append(f"+{len(self.types) - 5} types", dim)
+
+        lengths = Text("nested len ", dim)
+        if self.lengths:
+            for label, percent in (
+                ("min", 0),
+                ("median", 50),
+                ("p90", 90),
+                ("max", 100),
+            ):
+                lengths.append(f"{label} ", dim)
+                lengths.append(f"{self.length_percentile(percent):,}  ", "cyan")
+        else:
+            lengths.append("no containers", dim)
+
+        examples = Text("e.g. ", dim)
+        for cls, _ in self.types.most_common(5):
+            examples.append(self.examples[cls], Style(color="white"))
+            examples.append("  ")
+
+        lines = [title, types, lengths, examples]
+        for line in lines:
+            line.no_wrap = True
+            line.overflow = "ellipsis"
+        return lines
+
+
+class Contents:
+    """What a large container holds, from a sample of its items taken when it is first displayed.
+    Dicts and sets can only be sampled by iterating over them up to the last item sampled, so they
+    are sampled in the background. An exact pass over every item can be run in the background on
+    request
+    """
+
+    def __init__(
+        self,
+        obj: Any,
+        size: int = contents_sample_size,
+        method: str = contents_sample_method,
+    ):
+        self.obj = obj
+        self.size = size
+        self.method = method
+        self.sample = ContentsSummary(len(obj))
+        self.sample_task: Optional[BackgroundTask] = None
+        if type(obj) in (list, tuple):
+            self.sample.add(sample_items(obj, size, method))
+        else:
+            self.sample_task = BackgroundTask(
+                self.compute_sample, name="contents-sample"
+            ).start()
+        self.exact: Optional[ContentsSummary] = None
+        self.task: Optional[BackgroundTask] = None
+
+    def compute_sample(self, task: BackgroundTask):
+        sample = ContentsSummary(len(self.obj))
+        sample.add(sample_items(self.obj, self.size, self.method))
+        # Only replaced once complete, it is drawn while this runs
+        self.sample = sample
+
+    def start_exact(self) -> "Contents":
+        if self.task is None or self.task.cancelled.is_set():
+            self.exact = ContentsSummary(len(self.obj))
+            self.task = BackgroundTask(self.compute_exact, name="contents").start()
+        return self
+
+    def compute_exact(self, task: BackgroundTask):
+        exact = self.exact
+        assert exact is not None
+        task.total = exact.total
+        items = iter(self.obj.values() if type(self.obj) == dict else self.obj)
+        while not task.cancelled.is_set():
+            chunk = list(islice(items, 10_000))
+            if not chunk:
+                break
+            exact.add(chunk)
+            task.progress = exact.count
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
+        if self.sample_task:
+            self.sample_task.cancel()
+
+    def get_lines(self) -> List[Text]:
+        dim = Style(dim=True)
+        task = self.task
+        if task is None or task.cancelled.is_set():
+            # An exact pass cancelled by another one is left unfinished
+            sample_task = self.sample_task
+            if sample_task is not None and sample_task.error:
+                title = Text(
+                    f"sampling failed: {sample_task.error!r}", Style(color="red")
+                )
+            elif sample_task is not None and sample_task.running:
+                title = Text(f"sampling {self.size:,} items ({self.method})…", dim)
+            else:
+                title = Text(f"sample of {self.sample.count:,} ({self.method})", dim)
+            return self.sample.get_lines(title)
+
+        assert self.exact is not None
+        if task.error:
+            title = Text(f"exact pass failed: {task.error!r}", Style(color="red"))
+        elif task.running:
+            title = Text(
+                f"exact pass {task.progress / max(self.exact.total, 1):.0%}", dim
+            )
+        else:
+            title = Text(f"exact, all {self.exact.count:,} items", dim)
+        return self.exact.get_lines(title)
+
+
+class ContentsCache:
+    """Contents of the large containers selected most recently, cached per object identity. Only
+    one exact pass runs at a time
+    """
+
+    def __init__(self, max_size: int = contents_cache_size):
+        self.contents = ObjectCache(max_size)
+        self.current: Optional[Contents] = None
+
+    def get(self, obj: Any) -> Contents:
+        contents = self.contents.get(obj)
+        if contents is None:
+            contents = Contents(obj)
+            for evicted in self.contents.put(obj, contents):
+                evicted.cancel()
+        return contents
+
+    def start_exact(self, obj: Any):
+        """ Go through every item of the container in the background, cancelling any other exact pass """
+        contents = self.get(obj)
+        if self.current and self.current is not contents:
+            self.current.cancel()
+        self.current = contents.start_exact()
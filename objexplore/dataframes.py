@@ -0,0 +1,233 @@
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import (
+    CachedObject,
+    FilteredDictKey,
+    LazyRows,
+    dict_row_text,
+    highlighter,
+    register_cached_type,
+)
+from .tasks import BackgroundTask
+from .utils import format_bytes
+
+# Number of rows of a Series taken at once with `iloc` when its values are listed
+PAGE_SIZE = 500
+
+
+def is_dataframe(obj: Any) -> bool:
+    """ True for pandas DataFrames, pandas is never imported by objexplore """
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(obj, pandas.DataFrame)
+
+
+def is_series(obj: Any) -> bool:
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(obj, pandas.Series)
+
+
+def format_value(value: Any, width: int = 80) -> str:
+    text = str(value)
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+class DeepMemory:
+    """The deep memory usage of a DataFrame or Series, which goes through every Python object it
+    holds, computed in the background. The null values of a Series are counted first in the same
+    task with `count_nulls`
+    """
+
+    def __init__(self, obj: Any, count_nulls: bool = False):
+        self.obj = obj
+        self.count_nulls = count_nulls
+        self.null_count: Optional[int] = None
+        self.task = BackgroundTask(self.compute, name="memory-usage").start()
+
+    def compute(self, task: BackgroundTask) -> int:
+        if self.count_nulls:
+            self.null_count = int(self.obj.isna().sum())
+        usage = self.obj.memory_usage(deep=True)
+        return int(usage.sum()) if is_series(usage) else int(usage)
+
+    def text(self) -> Text:
+        if self.task.running:
+            return Text("deep …", style="dim")
+        if self.task.error:
+            return Text("deep unavailable", style="dim")
+        return Text("deep ", style="dim") + Text(
+            format_bytes(self.task.result), style="magenta"
+        )
+
+    def null_text(self) -> Text:
+        if self.null_count is None:
+            return Text("…" if self.task.running else "unavailable", style="dim")
+        return Text(f"{self.null_count:,}", style="red" if self.null_count else "cyan")
+
+
+class ColumnCounts:
+    """ The number of null values of every column of a DataFrame, counted one column at a time in the background """
+
+    def __init__(self, frame: Any):
+        self.frame = frame
+        self.null_counts: Dict[int, int] = {}
+        self.task = BackgroundTask(self.compute, name="null-counts").start()
+
+    def compute(self, task: BackgroundTask):
+        task.total = self.frame.shape[1]
+        for position in range(self.frame.shape[1]):
+            if task.cancelled.is_set():
+                return
+            self.null_counts[position] = int(self.frame.iloc[:, position].isna().sum())
+            task.progress = position + 1
+
+
+class PandasCachedObject(CachedObject):
+    """Base class of the explorer listings of pandas objects. Their attributes are never looked up
+    as some of them convert the whole object, such as `DataFrame.values` or `DataFrame.T`
+    """
+
+    def cache(self):
+        if self.is_cached:
+            self.filter()
+            return
+
+        self.cache_items()
+        self.num_public_attributes = self.num_private_attributes = 0
+        self.is_cached = True
+        self.filter()
+
+
+class DataFrameCachedObject(PandasCachedObject):
+    """A pandas DataFrame, listed as its columns with their dtype, null count and memory usage.
+    Exploring a column gives its Series. Null counts are computed in the background and the deep
+    memory usage only once the frame is displayed
+    """
+
+    summary_title = "DataFrame"
+
+    def __init__(self, obj: Any, *args, **kwargs):
+        super().__init__(obj, *args, **kwargs)
+        self.container = "dict"
+        # The number of rows listed, one per column
+        self.length = obj.shape[1]
+        self.counts: Optional[ColumnCounts] = None
+        self.deep_memory: Optional[DeepMemory] = None
+        self.column_keys: List[Any] = []
+        self.num_null_counts = -1
+
+    def cache_items(self):
+        frame = self.obj
+        # Memory usage without looking into the objects held is a vectorized lookup of the buffers
+        memory = frame.memory_usage(index=False, deep=False)
+        for position, column in enumerate(frame.columns):
+            key = column
+            if key in self.dict_rows:
+                # Column names are not unique
+                key = f"{column} ({position})"
+            self.column_keys.append(key)
+            series = frame.iloc[:, position]
+            self.dict_rows[key] = FilteredDictKey(
+                text=self.column_text(key, series.dtype, int(memory.iloc[position])),
+                cached_object=CachedObject(series, parent_path=self.dotpath, index=key),
+            )
+        self.counts = ColumnCounts(frame)
+
+    def column_text(
+        self, key: Any, dtype: Any, memory: int, null_count: Optional[int] = None
+    ) -> Text:
+        line = dict_row_text(key, typeof=str(dtype), empty=False)
+        line += Text(f" {format_bytes(memory)}", style=Style(dim=True))
+        if null_count is not None:
+            line += Text(
+                f" {null_count:,} null",
+                style=Style(color="red" if null_count else "cyan", dim=not null_count),
+            )
+        return line
+
+    def refresh(self):
+        """ Add the null counts to the rows of the columns counted since the last draw """
+        if self.counts is None or len(self.counts.null_counts) == self.num_null_counts:
+            return
+        null_counts = dict(self.counts.null_counts)
+        self.num_null_counts = len(null_counts)
+        memory = self.obj.memory_usage(index=False, deep=False)
+        for position, null_count in null_counts.items():
+            key = self.column_keys[position]
+            row = self.dict_rows[key]
+            row.text = self.column_text(
+                key,
+                self.obj.dtypes.iloc[position],
+                int(memory.iloc[position]),
+                null_count,
+            )
+        self.filter()
+
+    def summary(self) -> Text:
+        if self.deep_memory is None:
+            self.deep_memory = DeepMemory(self.obj)
+        rows, columns = self.obj.shape
+        return Text.assemble(
+            ("shape ", "dim"),
+            highlighter(f"({rows:,} rows, {columns:,} columns)"),
+            ("  memory ", "dim"),
+            (format_bytes(int(self.obj.memory_usage(deep=False).sum())), "magenta"),
+            " ",
+            self.deep_memory.text(),
+        )
+
+
+class SeriesCachedObject(PandasCachedObject):
+    """A pandas Series, listed as its values by index label. Values are taken a page of rows at a
+    time with `iloc`, only when they are displayed
+    """
+
+    summary_title = "Series"
+
+    def __init__(self, obj: Any, *args, **kwargs):
+        super().__init__(obj, *args, **kwargs)
+        self.container = "Series"
+        self.pages: Dict[int, Tuple[List[Any], List[Any]]] = {}
+        self.deep_memory: Optional[DeepMemory] = None
+
+    def cache_items(self):
+        self.list_rows = LazyRows(len(self.obj), self.series_row)
+
+    def series_row(self, index: int) -> Tuple[Text, CachedObject]:
+        page, position = divmod(index, PAGE_SIZE)
+        if page not in self.pages:
+            window = self.obj.iloc[page * PAGE_SIZE : (page + 1) * PAGE_SIZE]
+            self.pages[page] = (list(window.index), list(window))
+        labels, values = self.pages[page]
+        label, value = labels[position], values[position]
+        line = (
+            Text(" [", style=Style(color="white"))
+            + highlighter(repr(label))
+            + Text("] ", style=Style(color="white"))
+            + highlighter(format_value(value))
+        )
+        line.overflow = "ellipsis"
+        return line, CachedObject(value, parent_path=self.dotpath, index=label)
+
+    def summary(self) -> Text:
+        if self.deep_memory is None:
+            self.deep_memory = DeepMemory(self.obj, count_nulls=True)
+        return Text.assemble(
+            ("dtype ", "dim"),
+            (str(self.obj.dtype), "magenta"),
+            ("  length ", "dim"),
+            (f"{len(self.obj):,}", "cyan"),
+            ("  null ", "dim"),
+            self.deep_memory.null_text(),
+            ("  memory ", "dim"),
+            (format_bytes(int(self.obj.memory_usage(deep=False))), "magenta"),
+            " ",
+            self.deep_memory.text(),
+        )
+
+
+register_cached_type(is_dataframe, DataFrameCachedObject)
+register_cached_type(is_series, SeriesCachedObject)
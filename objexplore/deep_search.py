@@ -0,0 +1,184 @@
+from typing import Any, List, NamedTuple, Optional
+
+from blessed.keyboard import Keystroke
+from rich.highlighter import ReprHighlighter
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import CachedObject, DotPath
+from .config import (
+    box_type,
+    deep_search_max_depth,
+    deep_search_max_nodes,
+    deep_search_max_results,
+)
+from .tasks import BackgroundTask
+from .walk import ATOMIC_TYPES, Steps, extend_dotpath, walk_nodes
+
+highlighter = ReprHighlighter()
+
+# Only this many characters of a value's repr are searched
+MAX_REPR_LENGTH = 200
+
+
+class SearchResult(NamedTuple):
+    steps: Steps
+    dotpath: DotPath
+    typeof: Text
+
+
+def matches(query: str, steps: Steps, obj: Any) -> bool:
+    """Match the query against the attribute name or key leading to the object, and against the
+    repr of the object itself if it is a simple value like a string or a number
+    """
+    if steps and query in str(steps[-1].name).lower():
+        return True
+    if isinstance(obj, ATOMIC_TYPES):
+        return query in repr(obj)[:MAX_REPR_LENGTH].lower()
+    return False
+
+
+class DeepSearch:
+    """Search every object reachable from the object being explored, not just its direct children.
+    The object graph is walked breadth-first in a background task and matches are listed as they
+    are found
+    """
+
+    title = "[i]deep search[/i] | [dim]names, keys and values"
+    prompt = "search: "
+
+    def __init__(self):
+        self.visible = False
+        self.receiving_input = False
+        self.query = ""
+        self.root: Optional[CachedObject] = None
+        self.results: List[SearchResult] = []
+        self.index = 0
+        self.window = 0
+        self.task: Optional[BackgroundTask] = None
+
+    def open(self, cached_obj: CachedObject):
+        self.cancel()
+        self.root = cached_obj
+        self.visible = True
+        self.receiving_input = True
+
+    def close(self):
+        self.cancel()
+        self.visible = False
+        self.receiving_input = False
+
+    def cancel(self):
+        if self.task and self.task.running:
+            self.task.cancel()
+
+    def add_char(self, key: Keystroke):
+        self.query += str(key)
+
+    def backspace(self):
+        if not self.query:
+            self.close()
+        self.query = self.query[:-1]
+
+    def start(self):
+        """ Start searching for the query in the background """
+        self.cancel()
+        self.receiving_input = False
+        self.results = []
+        self.index = self.window = 0
+        if not self.query or self.root is None:
+            return
+        self.task = BackgroundTask(self.search, name="deep-search").start()
+
+    def search(self, task: BackgroundTask):
+        query = self.query.lower()
+        root = self.root
+        results = self.results
+        for steps, obj in walk_nodes(
+            root.obj,  # type: ignore
+            max_depth=deep_search_max_depth,
+            max_nodes=deep_search_max_nodes,
+        ):
+            if task.cancelled.is_set():
+                return
+            task.progress += 1
+            if steps and matches(query, steps, obj):
+                results.append(
+                    SearchResult(
+                        steps=steps,
+                        dotpath=extend_dotpath(root.dotpath, steps),  # type: ignore
+                        typeof=highlighter(str(type(obj))),
+                    )
+                )
+                if len(results) >= deep_search_max_results:
+                    return
+
+    @property
+    def selected_result(self) -> Optional[SearchResult]:
+        if self.index < len(self.results):
+            return self.results[self.index]
+        return None
+
+    def move_up(self):
+        if self.index > 0:
+            self.index -= 1
+            if self.index < self.window:
+                self.window -= 1
+
+    def move_down(self, num_lines: int):
+        if self.index < len(self.results) - 1:
+            self.index += 1
+            if self.index >= self.window + num_lines:
+                self.window += 1
+
+    def move_top(self):
+        self.index = self.window = 0
+
+    def move_bottom(self, num_lines: int):
+        self.index = max(0, len(self.results) - 1)
+        self.window = max(0, self.index - num_lines + 1)
+
+    def get_layout(self, height: int) -> Layout:
+        num_lines = self.num_lines(height)
+        query = Text(self.query, style=Style(color="aquamarine1"))
+        if self.receiving_input:
+            query += Text("█", style=Style(blink=True, reverse=True))
+
+        lines = [Text(self.prompt, style=Style(italic=True)) + query, Text()]
+        for index, result in enumerate(
+            self.results[self.window : self.window + num_lines], start=self.window
+        ):
+            line = result.dotpath.text + Text("  ") + result.typeof
+            line.overflow = "ellipsis"
+            line.no_wrap = True
+            if index == self.index and not self.receiving_input:
+                line.style = Style(reverse=True)
+            lines.append(line)
+
+        layout = Layout()
+        layout.update(
+            Panel(
+                Text("\n").join(lines),
+                title=self.title,
+                title_align="left",
+                subtitle=f"[dim]{self.status()} [u]enter[/u]:jump [u]esc[/u]:close",
+                subtitle_align="left",
+                style=Style(color="aquamarine1"),
+                box=box_type,
+            )
+        )
+        return layout
+
+    def status(self) -> str:
+        if self.task and self.task.running:
+            return f"searching… {self.task.progress:,} objects, {len(self.results)} matches"
+        elif self.task:
+            return f"{len(self.results)} matches in {self.task.progress:,} objects"
+        else:
+            return "[u]enter[/u]:search"
+
+    @staticmethod
+    def num_lines(height: int) -> int:
+        return max(height - 8, 1)
@@ -1,4 +1,6 @@
-from typing import Optional
+import ast
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
 from blessed import Terminal
 from rich.console import Console
@@ -8,9 +10,13 @@ from rich.panel import Panel
 from rich.style import Style
 from rich.text import Text
 
-from .cached_object import CachedObject
+from .cached_object import CachedObject, SortMode
 from .filter import Filter
+from .prompt import Prompt
 from .stack import Stack, StackFrame
+from .tables import RecordTable, record_fields
+from .walk import ATTR, Step, Steps, parse_path
+from .watch import Watch
 from .config import box_type
 
 console = Console()
@@ -25,21 +31,53 @@ class ExplorerState:
     list = "ExplorerState.list"
     tuple = "ExplorerState.tuple"
     set = "ExplorerState.set"
+    ndarray = "ExplorerState.ndarray"
+    series = "ExplorerState.series"
+    iterator = "ExplorerState.iterator"
+
+
+# States that list the items of the object explored
+LIST_STATES = (
+    ExplorerState.list,
+    ExplorerState.tuple,
+    ExplorerState.set,
+    ExplorerState.ndarray,
+    ExplorerState.series,
+    ExplorerState.iterator,
+)
 
 
 def get_state(cached_obj: CachedObject):
-    if isinstance(cached_obj.obj, dict):
+    if cached_obj.container == "dict":
         return ExplorerState.dict
-    elif isinstance(cached_obj.obj, list):
+    elif cached_obj.container == "list":
         return ExplorerState.list
-    elif isinstance(cached_obj.obj, tuple):
+    elif cached_obj.container == "tuple":
         return ExplorerState.tuple
-    elif isinstance(cached_obj.obj, set):
+    elif cached_obj.container == "set":
         return ExplorerState.set
+    elif cached_obj.container == "ndarray":
+        return ExplorerState.ndarray
+    elif cached_obj.container == "Series":
+        return ExplorerState.series
+    elif cached_obj.container == "iterator":
+        return ExplorerState.iterator
     else:
         return ExplorerState.public
 
 
+# Number of paths whose cached objects are remembered by `Explorer.resolve_steps()`
+RESOLVED_PATHS_SIZE = 64
+
+
+def parse_key(text: str) -> Any:
+    """ The dict key or list index typed in a prompt: a Python literal such as `42`, `(1, 2)` or `'a'`, or else the text itself """
+    try:
+        return ast.literal_eval(text)
+    except Exception:
+        return text
+
+
 class Explorer:
     """
     Class representing the explorer object on the left hand side
@@ -83,6 +121,11 @@ class Explorer:
         self.list_index = list_index
         self.list_window = list_window
         self.extra_width = 0
+        self.watch: Optional[Watch] = None
+        self.prompt = Prompt()
+        self.resolved_paths: Dict[
+            Tuple[int, Steps], Tuple[CachedObject, List[CachedObject]]
+        ] = {}
 
         if state:
             self.state = state
@@ -92,17 +135,25 @@ class Explorer:
     def get_layout(self) -> Layout:
         """ Return the layout of the object explorer. This will be a list of lines representing the object attributes/keys/vals we are exploring """
         explorer_layout = Layout(size=self.layout_width)
+        self.cached_obj.refresh()
+        self.cached_obj.update_sort()
+        if self.watch is not None:
+            self.watch.poll(self.cached_obj, self.visible_keys())
 
         if self.state == ExplorerState.dict:
             top_panel = self.dict_panel
 
-        elif self.state in (ExplorerState.list, ExplorerState.tuple, ExplorerState.set):
+        elif self.state in LIST_STATES:
             top_panel = self.list_panel
 
         else:
             top_panel = self.dir_panel
 
-        if self.filter.layout.visible:
+        if self.prompt.visible:
+            combined_layout = Layout()
+            combined_layout.split_column(top_panel, self.prompt.get_layout())
+            explorer_layout.update(combined_layout)
+        elif self.filter.layout.visible:
             combined_layout = Layout()
             combined_layout.split_column(
                 top_panel, self.filter.get_layout(self.text_width)
@@ -139,6 +190,7 @@ class Explorer:
                 self.cached_obj.filtered_public_attributes.items()
             ):
                 line = cached_obj.text.copy()
+                self.highlight_change(line, cached_obj)
                 if index == self.public_index:
                     line.style += Style(reverse=True)  # type: ignore
 
@@ -160,12 +212,16 @@ class Explorer:
                 f"[/magenta][white]/[/white][magenta]{len(self.cached_obj.filtered_public_attributes)}[/magenta][white])"
             )
             if (
-                len(console.render_str(subtitle_help + subtitle_index))
+                len(
+                    console.render_str(
+                        self.status_subtitle + subtitle_help + subtitle_index
+                    )
+                )
                 >= self.text_width - 2
             ):
                 subtitle = subtitle_index
             else:
-                subtitle = subtitle_help + subtitle_index
+                subtitle = self.status_subtitle + subtitle_help + subtitle_index
             if lines == []:
                 lines.append(
                     Text("No public attributes", style=Style(color="red", italic=True))
@@ -186,6 +242,7 @@ class Explorer:
                 self.cached_obj.filtered_private_attributes.items()
             ):
                 line = cached_obj.text.copy()
+                self.highlight_change(line, cached_obj)
                 if index == self.private_index:
                     line.style += Style(reverse=True)  # type: ignore
 
@@ -203,7 +260,7 @@ class Explorer:
 
             title = "[i][cyan]dir[/cyan]()[/i] | [dim]public[/dim] [u]private[/u]"
             subtitle = (
-                "[dim][u][][/u]:switch pane [/dim]"
+                self.status_subtitle + "[dim][u][][/u]:switch pane [/dim]"
                 f"[white]([/white][magenta]{self.private_index + 1 if self.cached_obj.filtered_private_attributes else 0}"
                 f"[/magenta][white]/[/white][magenta]{len(self.cached_obj.filtered_private_attributes)}[/magenta][white])"
             )
@@ -276,10 +333,11 @@ class Explorer:
         end = start + num_lines
         index = start
 
-        for attr, (line, cached_obj) in list(self.cached_obj.filtered_dict.items())[
-            start:end
-        ]:
+        for attr, (line, cached_obj) in islice(
+            self.cached_obj.filtered_dict.items(), start, max(start, end)
+        ):
             new_line = line.copy()
+            self.highlight_change(new_line, cached_obj)
             if index == self.dict_index:
                 new_line.style = Style(reverse=True)
 
@@ -312,15 +370,67 @@ class Explorer:
             text,
             title="[i][cyan]dict[/cyan]()",
             title_align="right",
-            subtitle=f"([magenta]{self.dict_index + 1}[/magenta]/[magenta]{len(self.cached_obj.filtered_dict)}[/magenta])",
+            subtitle=self.status_subtitle
+            + f"([magenta]{self.dict_index + 1}[/magenta]/[magenta]{len(self.cached_obj.filtered_dict)}[/magenta])",
             subtitle_align="right",
             style="white",
             box=box_type,
         )
 
+    def table_panel(self, table: RecordTable) -> Panel:
+        """ Return the layout of a list of records in table mode """
+        if self.list_index >= len(self.cached_obj.filtered_list):
+            self.list_index = max(0, len(self.cached_obj.filtered_list) - 1)
+            self.list_window = max(0, self.list_index - self.num_lines)
+
+        # Leave room for the header and the summary of the columns
+        num_rows = max(self.num_lines - 4, 1)
+        start = min(self.list_window, self.list_index)
+        if self.list_index >= start + num_rows:
+            start = self.list_index - num_rows + 1
+        records = [
+            cached_obj.obj
+            for _, cached_obj in self.cached_obj.filtered_list[start : start + num_rows]
+        ]
+        lines = table.get_lines(records, selected=self.list_index - start)
+        for line in lines:
+            line.truncate(self.text_width)
+
+        return Panel(
+            Text("\n").join(lines),
+            title="[i][cyan]table[/cyan]()",
+            title_align="right",
+            subtitle=self.status_subtitle
+            + f"[dim][u]T[/u]:toggle [/dim]([magenta]{self.list_index + 1}[/magenta]/[magenta]{len(self.cached_obj.filtered_list)}[/magenta])",
+            subtitle_align="right",
+            style="white",
+            box=box_type,
+        )
+
+    def toggle_table(self) -> bool:
+        """ Switch between the rows and the table of a list of records, return False if the object is not a list of records """
+        if self.cached_obj.table is not None:
+            self.cached_obj.table.close()
+            self.cached_obj.table = None
+            self.extra_width = 0
+            return True
+        if type(self.cached_obj.obj) not in (list, tuple):
+            return False
+        fields = record_fields(self.cached_obj.obj)
+        if not fields:
+            return False
+        self.cached_obj.table = RecordTable(self.cached_obj.obj, fields)
+        # Tables need more room than the rows
+        self.extra_width = max(self.extra_width, self.term.width // 2)
+        return True
+
     @property
     def list_panel(self) -> Panel:
         """ TODO """
+        if self.cached_obj.table is not None:
+            return self.table_panel(self.cached_obj.table)
+        # Iterators are pulled from as far as the window reaches
+        self.cached_obj.prefetch(self.list_window + self.num_lines + 1)
         # Reset the list index / window in case applying a filter has now moved the index
         # farther down than it can access on the filtered attributes
         if self.list_index >= len(self.cached_obj.filtered_list):
@@ -333,6 +443,9 @@ class Explorer:
             ExplorerState.list: ["[", "]", "list"],
             ExplorerState.tuple: ["(", ")", "tuple"],
             ExplorerState.set: ["{", "}", "set"],
+            ExplorerState.ndarray: ["[", "]", "ndarray"],
+            ExplorerState.series: ["[", "]", "Series"],
+            ExplorerState.iterator: ["[", "]", "iter"],
         }
 
         if self.list_window == 0:
@@ -351,6 +464,7 @@ class Explorer:
 
         for line, cached_obj in self.cached_obj.filtered_list[start:end]:
             new_line = line.copy()
+            self.highlight_change(new_line, cached_obj)
 
             if index == self.list_index:
                 new_line.style = Style(reverse=True)
@@ -385,7 +499,8 @@ class Explorer:
             text,
             title=f"[i][cyan]{bracket_map[self.state][2]}[/cyan]()",
             title_align="right",
-            subtitle=f"([magenta]{self.list_index + 1}[/magenta]/[magenta]{len(self.cached_obj.filtered_list)}[/magenta])",
+            subtitle=self.status_subtitle
+            + f"([magenta]{self.list_index + 1}[/magenta]/[magenta]{len(self.cached_obj.filtered_list)}[/magenta])",
             subtitle_align="right",
             style="white",
             box=box_type,
@@ -393,6 +508,10 @@ class Explorer:
 
     def explore_selected_object(self) -> Optional[CachedObject]:
         """ TODO """
+        return self.explore_child(self.selected_object)
+
+    def explore_child(self, child: CachedObject) -> Optional[CachedObject]:
+        """ Push the current object onto the stack and start exploring the given child object """
 
         # Save current stack as a frame
         current_frame = StackFrame(
@@ -410,7 +529,7 @@ class Explorer:
         )
         self.stack.push(current_frame)
 
-        self.cached_obj = self.selected_object
+        self.cached_obj = child
         self.cached_obj.cache()
         self.state = get_state(self.cached_obj)
         self.filter = Filter(term=self.term)
@@ -425,6 +544,164 @@ class Explorer:
 
         return None
 
+    def explore_steps(self, steps: Steps) -> bool:
+        """Explore down a path of attribute names/keys/indexes from the current object, pushing every
+        object along the way onto the stack. Return False if a step could not be found
+        """
+        chain = self.resolve_steps(self.cached_obj, steps)
+        if chain is None:
+            return False
+        for step, child in zip(steps, chain):
+            self.select_child(step)
+            self.explore_child(child)
+        return True
+
+    def explore_path(self, path: str) -> bool:
+        """Explore the object at a dotpath such as `obj.a.b[3]["k"].c`, pushing every object along the
+        way onto the stack. Paths start from the object `explore()` was called on, or from the current
+        object if they start with `.` or `[` or an attribute name. Return False if the path could not
+        be resolved
+        """
+        try:
+            name, steps = parse_path(path)
+        except (SyntaxError, ValueError):
+            return False
+        if name is not None and name == self.stack.head_obj.dotpath.plain:
+            chain = self.resolve_steps(self.stack.head_obj, steps)
+            if chain is None:
+                return False
+            while self.stack.stack:
+                self.explore_parent_obj()
+        else:
+            if name is not None:
+                steps = (Step(ATTR, name),) + steps
+            chain = self.resolve_steps(self.cached_obj, steps)
+            if chain is None:
+                return False
+        for step, child in zip(steps, chain):
+            self.select_child(step)
+            self.explore_child(child)
+        return True
+
+    def resolve_steps(
+        self, start: CachedObject, steps: Steps
+    ) -> Optional[List[CachedObject]]:
+        """Return the cached objects the steps lead to from `start`, None if a step could not be
+        found. Paths resolved before are only checked against the cached children they went through,
+        so going back and forth between a few deep objects does not cache them again
+        """
+        resolved = self.resolved_paths.get((id(start), steps))
+        if resolved is not None and resolved[0] is start:
+            parent = start
+            for step, child in zip(steps, resolved[1]):
+                if self.find_child(step, parent) is not child:
+                    break
+                parent = child
+            else:
+                return resolved[1]
+
+        chain: List[CachedObject] = []
+        parent = start
+        for step in steps:
+            parent.cache()
+            found = self.find_child(step, parent)
+            if found is None:
+                return None
+            chain.append(found)
+            parent = found
+
+        if len(self.resolved_paths) >= RESOLVED_PATHS_SIZE:
+            # Forget the path resolved the longest time ago
+            del self.resolved_paths[next(iter(self.resolved_paths))]
+        self.resolved_paths[(id(start), steps)] = (start, chain)
+        return chain
+
+    def find_child(
+        self, step: Step, parent: Optional[CachedObject] = None
+    ) -> Optional[CachedObject]:
+        """ Return the cached child of the current object, or of `parent`, that the step leads to """
+        if parent is None:
+            parent = self.cached_obj
+        if step.kind == ATTR:
+            return parent.public_attributes.get(
+                step.name
+            ) or parent.private_attributes.get(step.name)
+
+        elif type(parent.obj) == dict or parent.dict_rows:
+            # Also the rows of listings shown as a dict, such as the columns of a DataFrame
+            try:
+                row = parent.dict_rows.get(step.name)
+            except TypeError:
+                return None
+            return row.cached_object if row else None
+
+        elif type(step.name) is int and step.name >= 0:
+            # Iterators only list the items pulled so far
+            parent.prefetch(step.name + 1)
+            if step.name < len(parent.list_rows):
+                return parent.list_rows[step.name][1]
+
+        return None
+
+    def select_child(self, step: Step):
+        """ Move the selection onto the child the step leads to, if it is visible with the current filters """
+        if step.kind == ATTR:
+            for state, attributes in (
+                (ExplorerState.public, self.cached_obj.filtered_public_attributes),
+                (ExplorerState.private, self.cached_obj.filtered_private_attributes),
+            ):
+                if step.name in attributes:
+                    self.state = state
+                    self.move_to(list(attributes).index(step.name))
+                    return
+        elif self.state == ExplorerState.dict or self.state in LIST_STATES:
+            position = self.cached_obj.position_of(step.name)
+            if position is not None:
+                self.move_to(position)
+
+    def go_to(self, text: str) -> bool:
+        """Select the dict key, list index or attribute name typed in the go to prompt, return False
+        if it is not listed. Keys are looked up by hash instead of searching through every key
+        """
+        if self.state in (ExplorerState.public, ExplorerState.private):
+            attributes = (
+                self.cached_obj.filtered_public_attributes
+                if self.state == ExplorerState.public
+                else self.cached_obj.filtered_private_attributes
+            )
+            if text not in attributes:
+                return False
+            self.move_to(list(attributes).index(text))
+            return True
+
+        key = parse_key(text)
+        if self.state in LIST_STATES and type(key) is int and key >= 0:
+            # Iterators only list the items pulled so far
+            self.cached_obj.prefetch(key + 1)
+        position = self.cached_obj.position_of(key)
+        if position is None and key != text:
+            # Such as the str key "42" typed without quotes
+            position = self.cached_obj.position_of(text)
+        if position is None:
+            return False
+        self.move_to(position)
+        return True
+
+    def move_to(self, index: int):
+        """ Select the row at the given index, scrolling the window so it is visible """
+        if self.state == ExplorerState.public:
+            self.public_index = index
+            self.public_window = max(0, index - self.num_lines + 1)
+        elif self.state == ExplorerState.private:
+            self.private_index = index
+            self.private_window = max(0, index - self.num_lines + 1)
+        elif self.state == ExplorerState.dict:
+            self.dict_index = index
+            self.dict_window = max(0, index - self.num_lines + 3)
+        else:
+            self.list_index = index
+            self.list_window = max(0, index - self.num_lines + 3)
+
     def explore_parent_obj(self):
         """ Go back to exploring the parent obj of the current obj """
         stack_frame = self.stack.pop()
@@ -460,6 +737,63 @@ class Explorer:
 
         return self.cached_obj
 
+    def cycle_sort(self):
+        """ Switch to the next sort mode for the listing of the current object """
+        modes = SortMode.modes
+        next_mode = modes[(modes.index(self.cached_obj.sort_mode) + 1) % len(modes)]
+        self.cached_obj.set_sort(next_mode)
+
+    @property
+    def status_subtitle(self) -> str:
+        subtitle = ""
+        if self.watch is not None:
+            subtitle += "[yellow]watching[/yellow] "
+        if self.cached_obj.sort_mode != SortMode.default:
+            subtitle += f"[dim]sort:[/dim][cyan]{self.cached_obj.sort_mode}[/cyan] "
+            task = self.cached_obj.sort_task
+            if task is not None and task.running:
+                subtitle += f"[dim]computing… {task.progress:,}/{task.total:,}[/dim] "
+        return subtitle
+
+    def visible_keys(self) -> Iterable[Hashable]:
+        """ The dict keys or list indexes of the rows in view """
+        if self.state == ExplorerState.dict:
+            return list(
+                islice(
+                    self.cached_obj.filtered_dict,
+                    self.dict_window,
+                    self.dict_window + self.num_lines + 1,
+                )
+            )
+        if (
+            self.state in LIST_STATES
+            and self.cached_obj.filtered_list is self.cached_obj.list_rows
+        ):
+            # Neither filtered nor sorted, the rows in view are the items at these indexes
+            return range(
+                self.list_window,
+                min(
+                    self.list_window + self.num_lines + 1,
+                    len(self.cached_obj.list_rows),
+                ),
+            )
+        return ()
+
+    def toggle_watch(self) -> bool:
+        """ Start or stop re-polling the object being explored for changes, return False if it cannot be watched """
+        if self.watch is not None:
+            self.watch = None
+            return True
+        if not Watch.can_watch(self.cached_obj):
+            return False
+        self.watch = Watch()
+        return True
+
+    def highlight_change(self, line: Text, child: CachedObject):
+        """ Highlight the row of a child that changed since it was last polled """
+        if self.watch is not None and self.watch.is_changed(child):
+            line.stylize(Style(color="yellow", bold=True))
+
     def move_up(self):
         """ Move the current selection up one """
         if self.state == ExplorerState.public:
@@ -482,7 +816,7 @@ class Explorer:
             elif self.dict_window == 1:
                 self.dict_window -= 1
 
-        elif self.state in (ExplorerState.list, ExplorerState.tuple, ExplorerState.set):
+        elif self.state in LIST_STATES:
             if self.list_index > 0:
                 self.list_index -= 1
                 if self.list_index < self.list_window - 1:
@@ -525,7 +859,7 @@ class Explorer:
             ):
                 self.dict_window += 1
 
-        elif self.state in (ExplorerState.list, ExplorerState.tuple, ExplorerState.set):
+        elif self.state in LIST_STATES:
             if self.list_index < self.num_filtered_attributes - 1:
                 self.list_index += 1
                 if self.list_index >= self.list_window + self.num_lines - 1:
@@ -550,7 +884,7 @@ class Explorer:
         elif self.state == ExplorerState.dict:
             self.dict_index = self.dict_window = 0
 
-        elif self.state in (ExplorerState.list, ExplorerState.tuple, ExplorerState.set):
+        elif self.state in LIST_STATES:
             self.list_index = self.list_window = 0
 
     def move_bottom(self):
@@ -580,7 +914,7 @@ class Explorer:
                 - self.num_lines
                 + (3 if self.num_hidden_attributes == 0 else 4),
             )
-        elif self.state in (ExplorerState.list, ExplorerState.tuple, ExplorerState.set):
+        elif self.state in LIST_STATES:
             self.list_index = self.num_filtered_attributes - 1
             self.list_window = max(
                 0,
@@ -635,6 +969,9 @@ class Explorer:
             return self.cached_obj.num_public_attributes
         elif self.state == ExplorerState.private:
             return self.cached_obj.num_private_attributes
+        elif self.state in LIST_STATES:
+            # Iterators have no length, only the items pulled so far are listed
+            return len(self.cached_obj.list_rows)
         else:
             return self.cached_obj.length or 0
 
@@ -687,11 +1024,7 @@ class Explorer:
                 key = list(self.cached_obj.filtered_dict)[self.dict_index]
                 return self.cached_obj.filtered_dict[key].cached_object
 
-            elif self.state in (
-                ExplorerState.list,
-                ExplorerState.tuple,
-                ExplorerState.set,
-            ):
+            elif self.state in LIST_STATES:
                 return self.cached_obj.filtered_list[self.list_index][1]
             else:
                 raise ValueError("Unexpected explorer state")
@@ -0,0 +1,203 @@
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from rich.text import Text
+
+from .arrays import is_ndarray
+from .cached_object import CachedObject
+from .config import expression_chunk_size, expression_max_results
+from .dataframes import is_series
+from .deep_search import DeepSearch, SearchResult, highlighter
+from .tasks import BackgroundTask
+from .walk import INDEX, Step, extend_dotpath, iter_children
+
+# Only this many characters of a matching value's repr are displayed
+MAX_PREVIEW_LENGTH = 80
+
+
+def compile_expression(expression: str):
+    """ Compile a predicate of `x` such as `x > 100` or `len(x) > 10` once, to be run over every child """
+    return compile(expression, "<expression>", "eval")
+
+
+def preview(value: Any) -> Text:
+    try:
+        text = repr(value).split("\n")[0]
+    except Exception:
+        text = object.__repr__(value)
+    return highlighter(text[:MAX_PREVIEW_LENGTH])
+
+
+class ExpressionFilter(DeepSearch):
+    """Find the children of the object being explored for which an expression of `x` is true: the
+    items of a list/tuple/set, the values of a dict or the attributes of any other object. The
+    expression is compiled once and run over the children a chunk at a time in the background,
+    matches are listed as they are found
+
+    Numpy arrays and pandas Series are given to the expression a whole chunk at a time, so `x > 100`
+    is evaluated vectorized. Rows of multidimensional arrays match if any of their values do
+    """
+
+    title = "[i]expression filter[/i] | [dim]items, values and attributes matching x"
+    prompt = "x → "
+
+    def __init__(self):
+        super().__init__()
+        self.error: Optional[str] = None
+        # Number of children the expression raised for, they do not match
+        self.num_errors = 0
+        self.first_error: Optional[BaseException] = None
+        self.vectorized = False
+
+    def start(self):
+        self.error = None
+        self.num_errors = 0
+        self.first_error = None
+        self.vectorized = False
+        try:
+            self.code = compile_expression(self.query)
+        except SyntaxError as err:
+            self.cancel()
+            self.results = []
+            self.task = None
+            self.error = f"SyntaxError: {err.msg}"
+            return
+        super().start()
+
+    def search(self, task: BackgroundTask):
+        root = self.root
+        assert root is not None
+        obj = root.obj
+        if is_ndarray(obj) or is_series(obj):
+            task.total = len(obj)
+            try:
+                self.vectorized = True
+                self.add_matches(self.vectorized_matches(obj, task))
+                return
+            except Exception:
+                # Not an element-wise expression such as `x.status == 'failed'`, run it per item
+                self.vectorized = False
+                self.results.clear()
+                task.progress = 0
+            children = self.array_children(obj)
+        elif type(root) is not CachedObject:
+            # Whatever the listing stands for, such as the columns of a DataFrame or the items
+            # pulled from an iterator, so evaluating the expression never pulls any more
+            children = self.row_children(root)
+            task.total = len(root.dict_rows or root.list_rows)
+        elif type(obj) == dict:
+            # Shallow copies, the container can change while it is searched
+            children = ((Step(INDEX, key), value) for key, value in list(obj.items()))
+            task.total = len(obj)
+        elif isinstance(obj, (list, tuple, set)):
+            items = list(obj)
+            children = ((Step(INDEX, index), item) for index, item in enumerate(items))
+            task.total = len(items)
+        else:
+            children = iter_children(obj, private=True)
+        self.add_matches(self.item_matches(children, task))
+
+    @staticmethod
+    def row_children(root: CachedObject) -> Iterator[Tuple[Step, Any]]:
+        for key, row in list(root.dict_rows.items()):
+            yield Step(INDEX, key), row.cached_object.obj
+        for index in range(len(root.list_rows)):
+            yield Step(INDEX, index), root.list_rows[index][1].obj
+
+    def add_matches(self, matches: Iterator[Tuple[Step, Any]]):
+        root = self.root
+        assert root is not None
+        # The values of a Series are listed by index label, the steps to them stay positions
+        labels = root.obj.index if is_series(root.obj) else None
+        for step, value in matches:
+            label_step = step
+            if labels is not None:
+                # Iterated like the labels listed, as python scalars instead of numpy ones
+                label_step = Step(INDEX, next(iter(labels[step.name : step.name + 1])))
+            self.results.append(
+                SearchResult(
+                    steps=(step,),
+                    dotpath=extend_dotpath(root.dotpath, (label_step,)),
+                    typeof=preview(value),
+                )
+            )
+            if len(self.results) >= expression_max_results:
+                return
+
+    def item_matches(
+        self, children: Iterator[Tuple[Step, Any]], task: BackgroundTask
+    ) -> Iterator[Tuple[Step, Any]]:
+        """ Run the expression over every child, one at a time """
+        code = self.code
+        namespace: Dict[str, Any] = {"__builtins__": __builtins__}
+        for step, value in children:
+            if task.progress % expression_chunk_size == 0 and task.cancelled.is_set():
+                return
+            task.progress += 1
+            namespace["x"] = value
+            try:
+                matched = eval(code, namespace)
+            except Exception as err:
+                self.num_errors += 1
+                if self.first_error is None:
+                    self.first_error = err
+                continue
+            try:
+                if matched:
+                    yield step, value
+            except Exception:
+                # Such as the truth value of an array being ambiguous
+                self.num_errors += 1
+
+    def vectorized_matches(
+        self, obj: Any, task: BackgroundTask
+    ) -> Iterator[Tuple[Step, Any]]:
+        """ Run the expression on a chunk of an array or Series at a time, the result must be a mask of the chunk """
+        numpy = sys.modules["numpy"]
+        namespace: Dict[str, Any] = {"__builtins__": __builtins__, "numpy": numpy}
+        rows = obj if is_ndarray(obj) else obj.iloc
+        for start in range(0, len(obj), expression_chunk_size):
+            if task.cancelled.is_set():
+                return
+            chunk = rows[start : start + expression_chunk_size]
+            namespace["x"] = chunk
+            mask = numpy.asarray(eval(self.code, namespace))
+            if mask.dtype != bool or not mask.ndim or mask.shape[0] != len(chunk):
+                raise TypeError("The expression does not give a mask of the items")
+            if mask.ndim > 1:
+                mask = mask.reshape(len(chunk), -1).any(axis=1)
+            for position in numpy.flatnonzero(mask):
+                index = start + int(position)
+                yield Step(INDEX, index), rows[index]
+            task.progress = start + len(chunk)
+
+    @staticmethod
+    def array_children(obj: Any) -> Iterator[Tuple[Step, Any]]:
+        """ The rows of an array or the values of a Series by position, taken a chunk at a time """
+        rows = obj if is_ndarray(obj) else obj.iloc
+        for start in range(0, len(obj), expression_chunk_size):
+            for position, value in enumerate(
+                list(rows[start : start + expression_chunk_size])
+            ):
+                yield Step(INDEX, start + position), value
+
+    def status(self) -> str:
+        if self.error:
+            return f"[red]{self.error}[/red]"
+        task = self.task
+        if task is None:
+            return "[u]enter[/u]:evaluate"
+        if task.error:
+            return f"[red]{task.error!r}[/red]"
+        kind = " vectorized" if self.vectorized else ""
+        progress = f"{task.progress:,}"
+        if task.total:
+            progress += f"/{task.total:,}"
+        errors = ""
+        if self.num_errors:
+            errors = f", raised for {self.num_errors:,}"
+            if self.first_error is not None:
+                errors += f" ({type(self.first_error).__name__})"
+        if task.running:
+            return f"evaluating{kind}… {progress}, {len(self.results)} matches{errors}"
+        return f"{len(self.results)} matches in {progress}{kind}{errors}"
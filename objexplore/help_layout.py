@@ -48,15 +48,22 @@ class HelpLayout(Layout):
                       j ↓ - [cyan]down[/cyan]
                         g - [cyan]go to top[/cyan]
                         G - [cyan]go to bottom[/cyan]
+                        : - [cyan]go to a dict key, list index or attribute name[/cyan]
+                        . - [cyan]explore the object at a dotpath such as [magenta]obj.a[3]["k"][/magenta][/cyan]
                 l → Enter - [cyan]select[/cyan]
                     Space - [cyan]select[/cyan]
                       h ← - [cyan]go back to parent object[/cyan]
                       [ ] - [cyan]switch attribute type (public/private)[/cyan]
+                        s - [cyan]cycle sort order (name/type/size/deep size)[/cyan]
+                        w - [cyan]watch the object for changes, highlighting changed rows[/cyan]
+                        T - [cyan]toggle the table of a list of dicts, dataclasses or namedtuples[/cyan]
                       { } - [cyan]switch pane[/cyan]
                         p - [cyan]toggle full preview[/cyan]
                         d - [cyan]toggle full docstring[/cyan]
                         n - [cyan]toggle filter view[/cyan]
                         / - [cyan]open search filter[/cyan]
+                        F - [cyan]deep search names, keys and values below the current object[/cyan]
+                        X - [cyan]list the items, values or attributes an expression of [magenta]x[/magenta] is true for[/cyan]
                       Esc - [cyan]close[/cyan]
                         c - [cyan]clear filters[/cyan]
                         o - [cyan]toggle stack view[/cyan]
@@ -64,11 +71,18 @@ class HelpLayout(Layout):
                         + - [cyan]increase explorer layout[/cyan]
                         - - [cyan]decrease explorer layout[/cyan]
                         = - [cyan]return explorer layout size to default[/cyan]
+                        t - [cyan]toggle performance HUD[/cyan]
+                        P - [cyan]profile every attribute of the current object[/cyan]
+                        C - [cyan]re-run the profile with [magenta]cProfile[/magenta][/cyan]
+                        e - [cyan]export the profile report as JSON[/cyan]
+                        z - [cyan]toggle deep size breakdown of the current object[/cyan]
+                        R - [cyan]toggle what holds references to the selected object[/cyan]
+                        x - [cyan]summarize every item of the selected large container in the background[/cyan]
                         O - [cyan]open source file in [i u]$EDITOR[/i u][/cyan]
                         H - [cyan]open help page on selected attribute[/cyan]
                         i - [cyan]run [magenta]rich[/magenta][white].[/white][magenta]inspect[/magenta][white](<[/white][bright_magenta]OBJECT[/bright_magenta]>, [yellow]methods[/yellow]=[italic bright_green]True[/italic bright_green][white])[/white][/cyan]
                         I - [cyan]run [magenta]rich[/magenta][white].[/white][magenta]inspect[/magenta][white](<[/white][bright_magenta]OBJECT[/bright_magenta]>, [yellow]all[/yellow]=[italic bright_green]True[/italic bright_green][white])[/white][/cyan]
-                        r - [cyan]return the selected object[/cyan]
+                        r - [cyan]return the selected object, iterators with the items pulled chained back on[/cyan]
                         ? - [cyan]toggle help page[/cyan]
                       q Q - [cyan]quit[/cyan]
                 """
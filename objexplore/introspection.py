@@ -0,0 +1,295 @@
+import atexit
+import inspect
+import json
+import linecache
+import os
+import pkgutil
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .config import introspection_cache_path
+
+INTROSPECTION_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    path TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    docstring TEXT,
+    first_line INTEGER NOT NULL,
+    num_lines INTEGER NOT NULL,
+    PRIMARY KEY (path, qualname)
+);
+CREATE TABLE IF NOT EXISTS packages (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    submodules TEXT NOT NULL
+);
+"""
+
+# Signature of a file or directory, it is introspected again once this changes
+Signature = Tuple[int, int]
+
+
+class Member(NamedTuple):
+    """ What is cached about a module, class or function defined in a file """
+
+    kind: str
+    docstring: Optional[str]
+    # The source is `num_lines` lines of the file from `first_line`, there is none if it is 0 lines
+    first_line: int
+    num_lines: int
+
+
+def signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def member_kind(obj: Any) -> Optional[str]:
+    """ The kind of object whose introspection is cached, None for any other object """
+    if inspect.ismodule(obj):
+        return "module"
+    elif inspect.isclass(obj):
+        return "class"
+    elif inspect.isfunction(obj) or inspect.ismethod(obj):
+        return "function"
+    return None
+
+
+def member_key(obj: Any, kind: str) -> Optional[Tuple[str, str]]:
+    """Return the source file an object is defined in and its qualified name in it, or None if it
+    is not defined in a python file or its name does not tell it apart from other objects
+    """
+    try:
+        if kind == "module":
+            path, qualname = obj.__file__, ""
+        elif kind == "class":
+            path, qualname = inspect.getsourcefile(obj), obj.__qualname__
+        else:
+            # Not the file of `__module__`, libraries like numpy and pandas set it to the package
+            # the function is exported from
+            func = inspect.unwrap(obj.__func__ if inspect.ismethod(obj) else obj)
+            path, qualname = func.__code__.co_filename, func.__qualname__
+    except Exception:
+        return None
+    if not isinstance(path, str) or not path.endswith(".py"):
+        return None
+    if not isinstance(qualname, str) or "<" in qualname:
+        # Such as `<locals>` or `<lambda>`, many objects of one file can have the same name
+        return None
+    return path, qualname
+
+
+def introspect(obj: Any, kind: str) -> Member:
+    """ Look up the docstring and source lines of an object """
+    docstring = inspect.getdoc(obj)
+    try:
+        lines, start = inspect.getsourcelines(obj)
+    except Exception:
+        lines, start = [], 0
+    return Member(
+        kind=kind, docstring=docstring, first_line=start, num_lines=len(lines)
+    )
+
+
+class IntrospectionCache:
+    """The docstrings and source line ranges of the modules, classes and functions explored, kept
+    on disk across sessions. Members are cached per file, keyed by its path and the modification
+    time and size it had when they were introspected, so the members of a file are introspected
+    again once it changes. The members of a file are only loaded from disk the first time one of
+    them is looked up, and members introspected since are written out by `save()`
+
+    The submodules of packages are cached the same way per package directory
+    """
+
+    def __init__(self, path: Optional[str] = introspection_cache_path):
+        self.path = path
+        self.connection: Optional[sqlite3.Connection] = None
+        # Set once the database could not be opened, objects are then always introspected
+        self.disabled = path is None
+        self.lock = threading.RLock()
+        self.files: Dict[str, Dict[str, Member]] = {}
+        self.packages: Dict[str, List[Tuple[str, bool]]] = {}
+        self.pending: List[Tuple] = []
+
+    def connect(self) -> Optional[sqlite3.Connection]:
+        if self.connection is None and not self.disabled:
+            assert self.path is not None
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.executescript(SCHEMA)
+                row = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'version'"
+                ).fetchone()
+                if row is None or int(row[0]) != INTROSPECTION_VERSION:
+                    connection.executescript(
+                        "DELETE FROM files; DELETE FROM members; DELETE FROM packages;"
+                    )
+                    connection.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                        (str(INTROSPECTION_VERSION),),
+                    )
+                    connection.commit()
+            except (sqlite3.Error, OSError, ValueError):
+                self.disabled = True
+                return None
+            self.connection = connection
+        return self.connection
+
+    def load_file(self, path: str) -> Dict[str, Member]:
+        """ The members of a file cached on disk, or none if it changed since they were cached """
+        members = self.files.get(path)
+        if members is not None:
+            return members
+        members = self.files[path] = {}
+        connection = self.connect()
+        current = signature(path)
+        if connection is None or current is None:
+            return members
+        try:
+            row = connection.execute(
+                "SELECT mtime, size FROM files WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None and tuple(row) == current:
+                for qualname, *fields in connection.execute(
+                    "SELECT qualname, kind, docstring, first_line, num_lines FROM members WHERE path = ?",
+                    (path,),
+                ):
+                    members[qualname] = Member(*fields)
+            else:
+                self.pending.append(("file", path, current))
+        except sqlite3.Error:
+            pass
+        return members
+
+    def lookup(self, obj: Any) -> Optional[Tuple[str, Member]]:
+        """The file a module, class or function is defined in and its cached introspection,
+        introspecting it on a miss. None for any other object
+        """
+        kind = member_kind(obj)
+        key = member_key(obj, kind) if kind else None
+        if kind is None or key is None or self.disabled:
+            return None
+        path, qualname = key
+        with self.lock:
+            members = self.load_file(path)
+            member = members.get(qualname)
+            if member is not None and member.kind == kind:
+                return path, member
+        member = introspect(obj, kind)
+        with self.lock:
+            members[qualname] = member
+            self.pending.append(("member", path, qualname, member))
+        return path, member
+
+    def docstring(self, obj: Any) -> Optional[str]:
+        found = self.lookup(obj)
+        if found is None:
+            return inspect.getdoc(obj)
+        return found[1].docstring
+
+    def source(self, obj: Any) -> str:
+        """ The source code of an object, or an empty string if it is not available """
+        found = self.lookup(obj)
+        if found is None:
+            try:
+                return inspect.getsource(obj)
+            except Exception:
+                return ""
+        path, member = found
+        if not member.num_lines:
+            return ""
+        lines = linecache.getlines(path)
+        start = max(member.first_line - 1, 0)
+        return "".join(lines[start : start + member.num_lines])
+
+    def submodules(self, path: List[str], prefix: str) -> Iterator[Tuple[str, bool]]:
+        """ Like `pkgutil.iter_modules()`, yield the full name of every submodule of a package and whether it is a package """
+        seen = set()
+        for directory in path:
+            for name, ispkg in self.package_submodules(directory):
+                if name not in seen:
+                    seen.add(name)
+                    yield prefix + name, ispkg
+
+    def package_submodules(self, directory: str) -> List[Tuple[str, bool]]:
+        with self.lock:
+            if directory in self.packages:
+                return self.packages[directory]
+            current = signature(directory)
+            connection = self.connect()
+            if connection is not None and current is not None:
+                try:
+                    row = connection.execute(
+                        "SELECT mtime, submodules FROM packages WHERE path = ?",
+                        (directory,),
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                # Adding or removing a file changes the modification time of the directory
+                if row is not None and row[0] == current[0]:
+                    submodules = [(name, ispkg) for name, ispkg in json.loads(row[1])]
+                    self.packages[directory] = submodules
+                    return submodules
+
+        submodules = [
+            (info.name, info.ispkg) for info in pkgutil.iter_modules([directory])
+        ]
+        with self.lock:
+            self.packages[directory] = submodules
+            if current is not None:
+                self.pending.append(("package", directory, current, submodules))
+        return submodules
+
+    def save(self):
+        """ Write out everything introspected since the last save """
+        with self.lock:
+            pending, self.pending = self.pending, []
+            if not pending:
+                return
+            connection = self.connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    for kind, path, *fields in pending:
+                        if kind == "file":
+                            # The file changed, forget everything cached about it before
+                            connection.execute(
+                                "DELETE FROM members WHERE path = ?", (path,)
+                            )
+                            connection.execute(
+                                "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                                (path, *fields[0]),
+                            )
+                        elif kind == "member":
+                            qualname, member = fields
+                            connection.execute(
+                                "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?)",
+                                (path, qualname, *member),
+                            )
+                        else:
+                            mtime = fields[0][0]
+                            connection.execute(
+                                "INSERT OR REPLACE INTO packages VALUES (?, ?, ?)",
+                                (path, mtime, json.dumps(fields[1])),
+                            )
+            except sqlite3.Error:
+                pass
+
+
+introspection_cache = IntrospectionCache()
+atexit.register(introspection_cache.save)
@@ -0,0 +1,148 @@
+import io
+from collections.abc import Iterator
+from itertools import chain, islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import (
+    CachedObject,
+    LazyRows,
+    is_empty,
+    list_row_text,
+    register_cached_type,
+)
+from .config import iterator_buffer_size, iterator_page_size
+
+
+def is_iterator(obj: Any) -> bool:
+    """True for iterators and generators, whose items can only be looked at by consuming them.
+    Files are left out, pulling from one such as `sys.stdin` would wait for input
+    """
+    return isinstance(obj, Iterator) and not isinstance(obj, io.IOBase)
+
+
+class IteratorBuffer:
+    """The items pulled from an iterator so far. Items are only pulled a page at a time on request,
+    never past `max_items`, and the iterator is never exhausted in one go
+    """
+
+    def __init__(
+        self,
+        source: Iterator,
+        page_size: int = iterator_page_size,
+        max_items: int = iterator_buffer_size,
+    ):
+        self.source = source
+        self.page_size = page_size
+        self.max_items = max_items
+        self.items: List[Any] = []
+        self.exhausted = False
+        self.error: Optional[BaseException] = None
+        # Set once the items were handed back, the iterator then belongs to whoever they were handed to
+        self.handed_off = False
+
+    @property
+    def full(self) -> bool:
+        return len(self.items) >= self.max_items
+
+    @property
+    def can_pull(self) -> bool:
+        return not (self.exhausted or self.full or self.handed_off)
+
+    def pull(self, end: int) -> bool:
+        """ Pull whole pages of items until there are at least `end` of them, return True if any were pulled """
+        if not self.can_pull or len(self.items) >= end:
+            return False
+        # Round up to a page so scrolling one row at a time does not call `next()` on every draw
+        end = min(-(-end // self.page_size) * self.page_size, self.max_items)
+        count = end - len(self.items)
+        try:
+            self.items.extend(islice(self.source, count))
+        except Exception as err:
+            # Such as a generator raising, it cannot be resumed
+            self.error = err
+            self.exhausted = True
+        if len(self.items) < end:
+            self.exhausted = True
+        return True
+
+    def handoff(self) -> Iterator:
+        """ Return an iterator over the items pulled followed by the rest of the source, as if none had been pulled """
+        self.handed_off = True
+        return chain(list(self.items), self.source)
+
+    def status(self) -> Text:
+        dim = Style(dim=True)
+        text = Text(f"{len(self.items):,} pulled", style=Style(color="cyan"))
+        if self.error is not None:
+            text.append(f", raised {self.error!r}", Style(color="red"))
+        elif self.exhausted:
+            text.append(", exhausted", dim)
+        elif self.full:
+            text.append(f", buffer full at {self.max_items:,}", dim)
+        elif self.handed_off:
+            text.append(", handed back", dim)
+        return text
+
+
+class IteratorRows(LazyRows):
+    """ The rows of the items of an `IteratorBuffer`, growing as more items are pulled """
+
+    def __init__(
+        self,
+        buffer: IteratorBuffer,
+        build_row: Callable[[int], Tuple[Text, Any]],
+    ):
+        self.buffer = buffer
+        self.build_row = build_row
+        self.rows: Dict[int, Tuple[Text, Any]] = {}
+
+    @property  # type: ignore
+    def length(self) -> int:  # type: ignore
+        return len(self.buffer.items)
+
+
+class IteratorCachedObject(CachedObject):
+    """An iterator or generator, listed as the items pulled from it so far. Pulling is destructive:
+    the items pulled are gone from the iterator, so they are kept in a bounded buffer and pulled
+    a page at a time as the explorer scrolls down. Returning the iterator with `r` hands back the
+    items pulled chained with the rest of it
+    """
+
+    summary_title = "iterator"
+
+    def __init__(self, obj: Any, *args, **kwargs):
+        super().__init__(obj, *args, **kwargs)
+        self.container = "iterator"
+        self.buffer = IteratorBuffer(obj)
+
+    def cache_items(self):
+        self.list_rows = IteratorRows(self.buffer, self.buffer_row)
+
+    def buffer_row(self, index: int) -> Tuple[Text, CachedObject]:
+        item = self.buffer.items[index]
+        return (
+            list_row_text(index, typeof=str(type(item)), empty=not is_empty(item)),
+            CachedObject(item, parent_path=self.dotpath, index=index),
+        )
+
+    def prefetch(self, end: int):
+        if self.buffer.pull(end):
+            self.filter()
+
+    def return_value(self) -> Any:
+        if not self.buffer.items:
+            return self.obj
+        return self.buffer.handoff()
+
+    def summary(self) -> Text:
+        return Text.assemble(
+            ("exploring consumes the iterator ", Style(color="yellow")),
+            self.buffer.status(),
+            ("  r returns the items pulled chained with the rest", Style(dim=True)),
+        )
+
+
+register_cached_type(is_iterator, IteratorCachedObject)
@@ -1,9 +1,13 @@
+import asyncio
 import inspect
 import os
 import pydoc
+import re
 import signal
 import subprocess
+import sys
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Any, Optional, Union
 
 import rich
@@ -14,18 +18,31 @@ from rich.layout import Layout
 from rich.panel import Panel
 from rich.style import Style
 from rich.syntax import Syntax
+from rich.table import Table
 from rich.text import Text
 
 from .cached_object import CachedObject
+
+# Imported to register the explorer listings of numpy arrays and pandas objects
+from . import arrays, dataframes, iterators  # noqa: F401
+from .census import CensusCachedObject, CensusDiff, HeapCensus
+from .deep_search import DeepSearch
+from .expression import ExpressionFilter
 from .explorer import Explorer, ExplorerState
 from .help_layout import HelpState, random_error_quote
 from .overview import Overview, OverviewState, PreviewState
 from .config import box_type
+from . import tasks
+from .perf import stats
+from .profiler import profile_attributes
+from .remote import RemoteModel
+from .snapshot import SnapshotModel
+from .threads import ThreadsCachedObject, snapshot_threads
+from .virtual import VirtualCachedObject
 
 # TODO object highlighted on stack view should be shown on the overview
 # TODO support ctrl-a + (whatever emacs keybinding to go to end of line)
 #  https://www.gnu.org/software/bash/manual/html_node/Commands-For-Moving.html
-# TODO builtin frame/stack explorer? from objexplore import stackexplore
 
 
 version = "1.6.2"
@@ -40,13 +57,17 @@ class ObjExploreApp:
     main_style = Style(color="blue")
     term = Terminal()
 
-    def __init__(self, obj: Any, name: str):
-        cached_obj = CachedObject(obj, attr_name=name)
+    def __init__(self, obj: Any, name: str, cached_obj: Optional[CachedObject] = None):
+        if cached_obj is None:
+            cached_obj = CachedObject(obj, attr_name=name)
         # Figure out all the attributes of the current obj's attributes
         cached_obj.cache()
 
         self.explorer = Explorer(term=self.term, cached_obj=cached_obj)
         self.overview = Overview(term=self.term, version=version)
+        self.hud_visible = False
+        self.deep_search = DeepSearch()
+        self.expression_filter = ExpressionFilter()
 
         # Run self.draw() whenever the win change signal is caught
         try:
@@ -68,22 +89,17 @@ class ObjExploreApp:
             while True:
                 try:
                     self.draw()
-                    key = self.term.inkey()
-                    self.process_key_event(key)
+                    key = self.term.inkey(timeout=self.redraw_timeout())
+                    if key:
+                        self.process_key_event(key)
 
                 except RuntimeError as err:
                     # Some kind of error thrown during resizing events. Ignore and continue
-                    if (
-                        err.args[0]
-                        == "reentrant call inside <_io.BufferedWriter name='<stdout>'>"
-                    ):
-                        pass
-                    # Otherwise it is a new error. Raise
-                    else:
+                    if not is_reentrant_error(err):
                         raise err
                 except StopIteration:
                     if key == "r":
-                        res = self.explorer.selected_object.obj
+                        res = self.explorer.selected_object.return_value()
                     break
 
         # Unhide the cursor
@@ -91,6 +107,91 @@ class ObjExploreApp:
 
         return res
 
+    async def aexplore(self, executor: Executor) -> Optional[Any]:
+        """Open the interactive explorer without blocking the running asyncio event loop. Keys are
+        read once stdin is readable, and drawing and processing keys run in the executor, so the
+        other tasks on the loop keep running while their objects are explored
+        """
+        loop = asyncio.get_running_loop()
+        # Set when stdin is readable or the terminal is resized, None if the loop cannot watch
+        # file descriptors (such as the proactor loop on Windows), keys are then read in the executor
+        wake: Optional[asyncio.Event] = asyncio.Event()
+        keyboard_fd = sys.stdin.fileno()
+        try:
+            loop.add_reader(keyboard_fd, wake.set)  # type: ignore
+        except NotImplementedError:
+            wake = None
+        previous_handler = None
+        if wake is not None and hasattr(signal, "SIGWINCH"):
+            previous_handler = signal.getsignal(signal.SIGWINCH)
+            loop.add_signal_handler(signal.SIGWINCH, wake.set)
+
+        key = None
+        res = None
+        print(self.term.clear, end="")
+        try:
+            with self.term.cbreak(), self.term.hidden_cursor():
+                while True:
+                    try:
+                        await loop.run_in_executor(executor, self.draw)
+                    except RuntimeError as err:
+                        if not is_reentrant_error(err):
+                            raise err
+                    key = await self.read_key(wake, executor)
+                    if key and await loop.run_in_executor(
+                        executor, self.handle_key, key
+                    ):
+                        if key == "r":
+                            res = self.explorer.selected_object.return_value()
+                        break
+        finally:
+            if wake is not None:
+                loop.remove_reader(keyboard_fd)
+            if previous_handler is not None:
+                loop.remove_signal_handler(signal.SIGWINCH)
+                signal.signal(signal.SIGWINCH, previous_handler)
+
+        print("\x1b[?25h", end="")
+        return res
+
+    async def read_key(
+        self, wake: Optional[asyncio.Event], executor: Executor
+    ) -> Keystroke:
+        """ Wait for a key without blocking the event loop, returning an empty keystroke when it is time to redraw """
+        timeout = self.redraw_timeout()
+        if wake is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, self.term.inkey, timeout
+            )
+        wake.clear()
+        # Keys already buffered by blessed do not make stdin readable again
+        key = self.term.inkey(timeout=0)
+        if key:
+            return key
+        try:
+            await asyncio.wait_for(wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.term.inkey(timeout=0)
+
+    def redraw_timeout(self) -> Optional[float]:
+        """ Seconds to wait for a key before redrawing, None to only redraw after a key """
+        # Keep redrawing while there is background work to show progress for
+        if tasks.any_running():
+            return tasks.REFRESH_INTERVAL
+        elif self.explorer.watch is not None:
+            # Redraw at least once per poll of the watched object
+            return self.explorer.watch.interval
+        return None
+
+    def handle_key(self, key: Keystroke) -> bool:
+        """ Process the key, return True if it closes the explorer """
+        try:
+            self.process_key_event(key)
+        except StopIteration:
+            return True
+        return False
+
     def process_key_event(self, key: Keystroke) -> Any:
         """ Process the incoming key """
 
@@ -118,6 +219,22 @@ class ObjExploreApp:
                 )
             return
 
+        if self.explorer.prompt.visible:
+            if key.code == self.term.KEY_BACKSPACE:
+                self.explorer.prompt.backspace()
+            elif key.code == self.term.KEY_ESCAPE:
+                self.explorer.prompt.close()
+            elif key.code == self.term.KEY_ENTER:
+                if not self.explorer.prompt.submit():
+                    self.error()
+            elif not key.is_sequence:
+                self.explorer.prompt.add_char(key)
+            return
+
+        if self.search_panel is not None:
+            self.process_search_key_event(self.search_panel, key)
+            return
+
         if key in ("q", "Q", "r"):
             raise StopIteration
 
@@ -279,6 +396,10 @@ class ObjExploreApp:
         elif key == "G":
             self.explorer.move_bottom()
 
+        # Cycle through the sort modes
+        elif key == "s":
+            self.explorer.cycle_sort()
+
         # Switch between public and private attributes
         elif key in ("[", "]"):
             if self.explorer.state == ExplorerState.public:
@@ -296,6 +417,20 @@ class ObjExploreApp:
         elif key == "=":
             self.explorer.extra_width = 0
 
+        # Re-poll the object being explored for changes
+        elif key == "w":
+            if not self.explorer.toggle_watch():
+                self.error()
+
+        # Display a list of records as a table
+        elif key == "T":
+            if not self.explorer.toggle_table():
+                self.error()
+
+        # Toggle the performance HUD
+        elif key == "t":
+            self.hud_visible = not self.hud_visible
+
         # Overview ############################################################
 
         elif key in ("{", "}"):
@@ -323,11 +458,90 @@ class ObjExploreApp:
                 else OverviewState.all
             )
 
+        # Profile every attribute of the current object
+        elif key == "P":
+            if self.overview.state == OverviewState.profile:
+                self.overview.state = OverviewState.all
+            else:
+                self.overview.profile_report = profile_attributes(
+                    self.explorer.cached_obj
+                )
+                self.overview.state = OverviewState.profile
+
+        elif key == "C" and self.overview.state == OverviewState.profile:
+            self.overview.profile_report = profile_attributes(
+                self.explorer.cached_obj, use_cprofile=True
+            )
+
+        elif key == "e" and self.overview.state == OverviewState.profile:
+            try:
+                name = re.sub(r"\W", "_", self.explorer.cached_obj.attr_name)[:64]
+                self.overview.profile_report.export(  # type: ignore
+                    f"objexplore_profile_{name}.json"
+                )
+            except Exception:
+                self.error()
+
+        # Search the whole object graph below the current object
+        elif key == "F":
+            self.explorer.stack.layout.visible = False
+            self.explorer.filter.layout.visible = False
+            self.deep_search.open(self.explorer.cached_obj)
+
+        # Go to a dict key, list index or attribute name
+        elif key == ":":
+            self.explorer.prompt.open("go to", self.explorer.go_to)
+
+        # Explore the object at a dotpath, starting from the current one
+        elif key == ".":
+            self.explorer.prompt.open(
+                "path",
+                self.explorer.explore_path,
+                text=self.explorer.cached_obj.dotpath.plain,
+            )
+
+        # Find the children of the current object an expression of `x` is true for
+        elif key == "X":
+            self.explorer.stack.layout.visible = False
+            self.explorer.filter.layout.visible = False
+            self.expression_filter.open(self.explorer.cached_obj)
+
+        # Toggle the deep size breakdown of the current object
+        elif key == "z":
+            self.overview.toggle_size_breakdown(self.explorer.cached_obj)
+
+        # Summarize every item of the selected container
+        elif key == "x":
+            if not self.overview.start_exact_contents(self.explorer.selected_object):
+                self.error()
+
+        # Toggle the referrers of the selected object
+        elif key == "R":
+            self.overview.toggle_referrers(self.explorer.selected_object)
+
         # Fullscreen
         elif key == "f":
-            printable: Union[str, Syntax, Text]
+            printable: Union[str, Syntax, Text, Table]
+
+            if (
+                self.overview.state == OverviewState.profile
+                and self.overview.profile_report
+            ):
+                printable = self.overview.profile_report.get_table()
+
+            elif (
+                self.overview.state == OverviewState.size
+                and self.overview.size_breakdown
+            ):
+                printable = self.overview.size_breakdown.get_table()
+
+            elif (
+                self.overview.state == OverviewState.referrers
+                and self.overview.referrers
+            ):
+                printable = self.overview.referrers.get_text()
 
-            if self.overview.state == OverviewState.docstring:
+            elif self.overview.state == OverviewState.docstring:
                 printable = self.explorer.selected_object.docstring
 
             elif self.overview.preview_state == PreviewState.repr:
@@ -377,17 +591,73 @@ class ObjExploreApp:
             str_out = capture.get()
             pydoc.pager(str_out)
 
+    @property
+    def search_panel(self) -> Optional[DeepSearch]:
+        """ The deep search or expression filter panel shown in place of the overview, if one is open """
+        for panel in (self.deep_search, self.expression_filter):
+            if panel.visible:
+                return panel
+        return None
+
+    def process_search_key_event(self, panel: DeepSearch, key: Keystroke):
+        """ Process keys while the deep search or expression filter panel is open """
+        if panel.receiving_input:
+            if key.code == self.term.KEY_BACKSPACE:
+                panel.backspace()
+            elif key.code == self.term.KEY_ESCAPE:
+                panel.close()
+            elif key.code == self.term.KEY_ENTER:
+                panel.start()
+            elif key.is_sequence:
+                return
+            else:
+                panel.add_char(key)
+            return
+
+        num_lines = panel.num_lines(self.term.height)
+        if key.code in (self.term.KEY_ESCAPE, self.term.KEY_BACKSPACE) or key == "q":
+            panel.close()
+        elif key in ("F", "X", "/"):
+            panel.open(self.explorer.cached_obj)
+        elif key == "j" or key.code == self.term.KEY_DOWN:
+            panel.move_down(num_lines)
+        elif key == "k" or key.code == self.term.KEY_UP:
+            panel.move_up()
+        elif key == "g":
+            panel.move_top()
+        elif key == "G":
+            panel.move_bottom(num_lines)
+        elif key in ("l", " ") or key.code in (
+            self.term.KEY_ENTER,
+            self.term.KEY_RIGHT,
+        ):
+            result = panel.selected_result
+            if result is None:
+                return
+            panel.close()
+            if not self.explorer.explore_steps(result.steps):
+                self.error()
+
     def draw(self, *_):
         """ Draw the application. the *_ argument is due to resize events and are unused """
         print(self.term.home, end="")
+        start = time.perf_counter()
         layout = Layout()
         layout.split_row(
             self.explorer.get_layout(),
-            self.overview.get_layout(self.explorer.selected_object),
+            (
+                self.search_panel.get_layout(self.term.height)
+                if self.search_panel is not None
+                else self.overview.get_layout(self.explorer.selected_object)
+            ),
         )
+        if self.hud_visible:
+            main_layout = layout
+            layout = Layout()
+            layout.split_column(main_layout, stats.get_layout())
 
         title = (
-            self.explorer.cached_obj.dotpath
+            self.explorer.cached_obj.dotpath.text
             + Text(" | ", style="white")
             + self.explorer.cached_obj.typeof
         )
@@ -405,7 +675,12 @@ class ObjExploreApp:
             style=self.main_style,
             box=box_type,
         )
+        stats.add("layout", time.perf_counter() - start)
+
+        start = time.perf_counter()
         rich.print(object_explorer, end="")
+        stats.add("render", time.perf_counter() - start)
+        stats.end_frame()
 
     def error(self):
         """ Color the outside red and pause for a split second """
@@ -441,20 +716,132 @@ def explore(obj: Any) -> Any:
     frame = inspect.currentframe()
     name = frame.f_back.f_code.co_names[1]  # type: ignore
     app = ObjExploreApp(obj, name=name)
+    return run(app)
+
+
+def explore_snapshot(path: str) -> Any:
+    """
+    Explore a snapshot saved with `objexplore.export_snapshot()` without the live objects.
+    Only the children of the objects being explored are loaded from the snapshot
+    """
+    model = SnapshotModel(path)
+    cached_obj = VirtualCachedObject(model, model.root(), attr_name=model.name)
+    app = ObjExploreApp(cached_obj.obj, name=model.name, cached_obj=cached_obj)
+    return run(app)
+
+
+def explore_remote(path: str) -> Any:
+    """
+    Explore the object served by another process with `objexplore.serve()` on the Unix domain
+    socket at `path`. Only the objects being explored are fetched from the other process
+    """
+    model = RemoteModel(path)
     try:
-        return app.explore()
+        cached_obj = VirtualCachedObject(model, model.root(), attr_name=model.name)
+        app = ObjExploreApp(cached_obj.obj, name=model.name, cached_obj=cached_obj)
+        return run(app)
+    finally:
+        model.close()
+
 
+def explore_heap() -> Any:
+    """
+    Explore every object tracked by the garbage collector, grouped by type with the number of
+    instances and their total shallow size. The census is taken in the background and the types
+    are listed as they are counted. Explore a type to list its instances
+    """
+    census = HeapCensus().start()
+    cached_obj = CensusCachedObject(census, attr_name="heap")
+    app = ObjExploreApp(census, name="heap", cached_obj=cached_obj)
+    try:
+        return run(app)
+    finally:
+        census.close()
+
+
+def explore_heap_diff(before: HeapCensus) -> Any:
+    """
+    Explore what changed on the heap since a census taken with `objexplore.take_census()`: the
+    change in the number and total size of the objects of each type. Explore a type to list its
+    instances that were created since the earlier census
+    """
+    diff = CensusDiff(before).start()
+    cached_obj = CensusCachedObject(diff, attr_name="heap_diff")
+    app = ObjExploreApp(diff, name="heap_diff", cached_obj=cached_obj)
+    try:
+        return run(app)
+    finally:
+        diff.close()
+
+
+def explore_threads() -> Any:
+    """
+    Explore what every thread is running right now: the stack of each thread, innermost frame
+    first. Explore a frame to see its locals. The stacks are taken once, without waiting for the
+    other threads, so this can be used on a live service
+    """
+    snapshot = snapshot_threads()
+    cached_obj = ThreadsCachedObject(snapshot, attr_name="threads")
+    app = ObjExploreApp(snapshot, name="threads", cached_obj=cached_obj)
+    try:
+        return run(app)
+    finally:
+        snapshot.close()
+
+
+async def aexplore(obj: Any, name: str = "obj") -> Any:
+    """
+    Run the explorer on the given object from a coroutine, without blocking the event loop:
+
+    >>> await objexplore.aexplore(service, name="service")
+
+    The other tasks on the loop keep running while the explorer is open, so their live state can
+    be explored as it changes. Introspection runs in a worker thread
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="objexplore") as executor:
+        cached_obj = await loop.run_in_executor(executor, cache_object, obj, name)
+        app = ObjExploreApp(obj, name=name, cached_obj=cached_obj)
+        try:
+            return await app.aexplore(executor)
+        except Exception as err:
+            report_error(app, err)
+
+
+def cache_object(obj: Any, name: str) -> CachedObject:
+    cached_obj = CachedObject(obj, attr_name=name)
+    cached_obj.cache()
+    return cached_obj
+
+
+def is_reentrant_error(err: RuntimeError) -> bool:
+    """ True for the error raised when the terminal is resized while it is being drawn to """
+    return (
+        bool(err.args)
+        and err.args[0] == "reentrant call inside <_io.BufferedWriter name='<stdout>'>"
+    )
+
+
+def run(app: ObjExploreApp) -> Any:
+    """ Run the app, printing a traceback and a link to report the issue if anything goes wrong """
+    try:
+        return app.explore()
     except Exception as err:
-        print(app.term.move_down(app.term.height))
-        console.print_exception(show_locals=True)
-        print()
-        rich.print(f"[red]{random_error_quote()}")
-        formatted_link = f"https://github.com/kylepollina/objexplore/issues/new?assignees=&labels=&template=bug_report.md&title={err}".replace(
-            " ", "+"
-        )
-        print("Please report the issue here:")
-        rich.print(f"   [link={formatted_link}][u]{formatted_link}[/u][/link]")
-        print()
-        rich.print(
-            "[yellow italic]Make sure to copy/paste the above traceback to the issue page to make this quicker to fix :)"
-        )
+        report_error(app, err)
+
+
+def report_error(app: ObjExploreApp, err: Exception):
+    """ Print the traceback of the error being handled and a link to report the issue """
+    print(app.term.move_down(app.term.height))
+    console.print_exception(show_locals=True)
+    print()
+    rich.print(f"[red]{random_error_quote()}")
+    formatted_link = f"https://github.com/kylepollina/objexplore/issues/new?assignees=&labels=&template=bug_report.md&title={err}".replace(
+        " ", "+"
+    )
+    print("Please report the issue here:")
+    rich.print(f"   [link={formatted_link}][u]{formatted_link}[/u][/link]")
+    print()
+    rich.print(
+        "[yellow italic]Make sure to copy/paste the above traceback to the issue page to make this quicker to fix :)"
+    )
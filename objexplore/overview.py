@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from blessed import Terminal
 from rich.layout import Layout
@@ -11,10 +11,16 @@ from rich.text import Text
 from .cached_object import CachedObject
 from .help_layout import HelpLayout
 from .config import box_type
+from .contents import Contents, ContentsCache, has_contents
+from .utils import format_bytes
+from .virtual import VirtualCachedObject
+from .profiler import ProfileReport
+from .referrers import ReferrerCache, ReferrerSearch
+from .sizeof import SizeBreakdown, SizeCache
 
 
 class OverviewState:
-    all, docstring, value = range(3)
+    all, docstring, value, profile, size, referrers = range(6)
 
 
 class PreviewState:
@@ -28,6 +34,13 @@ class Overview:
         self.help_layout = HelpLayout(version, visible=False, ratio=3)
         self.state = OverviewState.all
         self.preview_state = PreviewState.repr
+        self.profile_report: Optional[ProfileReport] = None
+        self.sizes = SizeCache()
+        self.size_breakdown: Optional[SizeBreakdown] = None
+        self.referrer_searches = ReferrerCache()
+        self.referrers: Optional[ReferrerSearch] = None
+        self.referrers_title = Text()
+        self.contents = ContentsCache()
 
     @property
     def layout_width(self):
@@ -53,6 +66,20 @@ class Overview:
             self.layout.update(self.get_value_panel(cached_obj))
             return self.layout
 
+        elif self.state == OverviewState.profile and self.profile_report:
+            self.layout.update(self.profile_report.get_panel(self.term.height))
+            return self.layout
+
+        elif self.state == OverviewState.size and self.size_breakdown:
+            self.layout.update(self.size_breakdown.get_panel(self.term.height))
+            return self.layout
+
+        elif self.state == OverviewState.referrers and self.referrers:
+            self.layout.update(
+                self.referrers.get_panel(self.referrers_title, self.term.height)
+            )
+            return self.layout
+
         elif self.state == OverviewState.all:
             layout = Layout()
             layout.split_column(
@@ -104,10 +131,10 @@ class Overview:
         )
 
     def get_info_layout(self, cached_obj: CachedObject):
+        layout = Layout(size=3)
+        panels = [Layout(self.get_type_panel(cached_obj))]
         if cached_obj.length is not None:
-            layout = Layout(size=3)
-            layout.split_row(
-                Layout(self.get_type_panel(cached_obj)),
+            panels.append(
                 Layout(
                     Panel(
                         str(cached_obj.length),
@@ -116,12 +143,99 @@ class Overview:
                         style="white",
                         box=box_type,
                     )
-                ),
+                )
             )
-            return layout
+        panels.append(Layout(self.get_size_panel(cached_obj), ratio=2))
+        layout.split_row(*panels)
+        summary = cached_obj.summary()
+        if summary is not None:
+            column = Layout(size=6)
+            column.split_column(
+                layout, Layout(self.get_summary_panel(cached_obj, summary))
+            )
+            return column
+        if not isinstance(cached_obj, VirtualCachedObject) and has_contents(
+            cached_obj.obj
+        ):
+            column = Layout(size=9)
+            column.split_column(
+                layout,
+                Layout(self.get_contents_panel(self.contents.get(cached_obj.obj))),
+            )
+            return column
+        return layout
 
+    def get_contents_panel(self, contents: Contents) -> Panel:
+        return Panel(
+            Text("\n").join(contents.get_lines()),
+            title="[i]contents",
+            title_align="left",
+            subtitle="[dim][u]x[/u]:exact pass",
+            subtitle_align="right",
+            style="white",
+            box=box_type,
+        )
+
+    def start_exact_contents(self, cached_obj: CachedObject) -> bool:
+        """ Summarize every item of a large container in the background, return False if it is not one """
+        if isinstance(cached_obj, VirtualCachedObject) or not has_contents(
+            cached_obj.obj
+        ):
+            return False
+        self.contents.start_exact(cached_obj.obj)
+        return True
+
+    def get_summary_panel(self, cached_obj: CachedObject, summary: Text) -> Panel:
+        summary.no_wrap = True
+        summary.overflow = "ellipsis"
+        return Panel(
+            summary,
+            title=f"[i]{cached_obj.summary_title}",
+            title_align="left",
+            style="white",
+            box=box_type,
+        )
+
+    def get_size_panel(self, cached_obj: CachedObject) -> Panel:
+        if isinstance(cached_obj, VirtualCachedObject):
+            # Only the shallow size is known for objects that are not live
+            size = Text(format_bytes(cached_obj.node.size), style="magenta")
         else:
-            return self.get_type_panel(cached_obj)
+            deep_size = self.sizes.get(cached_obj.obj)
+            size = (
+                Text(format_bytes(deep_size.shallow), style="magenta")
+                + Text(" / ", style="dim")
+                + deep_size.text
+            )
+        return Panel(
+            size,
+            title="[i][cyan]sizeof[/cyan]()[/i] [dim]shallow / deep",
+            title_align="left",
+            subtitle="[dim][u]z[/u]:breakdown",
+            subtitle_align="right",
+            style="white",
+            box=box_type,
+        )
+
+    def toggle_size_breakdown(self, cached_obj: CachedObject):
+        """ Show the deep size of every child of the cached object """
+        if self.size_breakdown:
+            self.size_breakdown.cancel()
+            self.size_breakdown = None
+        if self.state == OverviewState.size:
+            self.state = OverviewState.all
+        else:
+            self.size_breakdown = SizeBreakdown(cached_obj, self.sizes)
+            self.state = OverviewState.size
+
+    def toggle_referrers(self, cached_obj: CachedObject):
+        """ Show what holds references to the cached object, searched in the background and cached per object """
+        if self.state == OverviewState.referrers:
+            self.state = OverviewState.all
+        elif not isinstance(cached_obj, VirtualCachedObject):
+            self.referrers = self.referrer_searches.get(cached_obj.obj)
+            self.referrers_title = cached_obj.dotpath.text
+            self.state = OverviewState.referrers
 
     def get_type_panel(self, cached_obj: CachedObject):
         return Layout(
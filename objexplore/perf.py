@@ -0,0 +1,113 @@
+import heapq
+from typing import Dict, List, Tuple
+
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.style import Style
+from rich.table import Table
+from rich.text import Text
+
+from .config import box_type
+
+
+class PerfStats:
+    """Timing and cache statistics collected while exploring
+
+    Phases are accumulated into the current frame and rolled over into `last_frame` every time
+    the application finishes drawing, so the HUD always shows the timings of the previous frame
+    """
+
+    phases = ("getattr", "repr", "inspect", "filter", "layout", "render")
+
+    def __init__(self, num_slowest: int = 5):
+        self.num_slowest = num_slowest
+        self.current_frame: Dict[str, float] = dict.fromkeys(self.phases, 0.0)
+        self.last_frame: Dict[str, float] = dict.fromkeys(self.phases, 0.0)
+        self.num_frames = 0
+        self.num_alive = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Min-heap of (seconds, dotpath) so the fastest of the slowest is cheap to replace
+        self.slowest: List[Tuple[float, str]] = []
+
+    def add(self, phase: str, seconds: float):
+        """ Add the time spent in a phase to the current frame """
+        self.current_frame[phase] += seconds
+
+    def record_attribute(self, seconds: float, parent_path: str, attr: str):
+        """ Keep track of the slowest attribute lookups seen so far """
+        if len(self.slowest) < self.num_slowest:
+            heapq.heappush(self.slowest, (seconds, f"{parent_path}.{attr}"))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, f"{parent_path}.{attr}"))
+
+    def end_frame(self):
+        """ Roll the current frame over into the last frame """
+        self.last_frame = self.current_frame
+        self.current_frame = dict.fromkeys(self.phases, 0.0)
+        self.num_frames += 1
+
+    @property
+    def cache_hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    def get_layout(self) -> Layout:
+        """ Build the performance HUD shown along the bottom of the application """
+        timings = Table.grid(padding=(0, 1))
+        for _ in self.phases:
+            timings.add_column(justify="right")
+        timings.add_row(
+            *(Text(phase, style=Style(color="cyan")) for phase in self.phases)
+        )
+        timings.add_row(
+            *(f"{self.last_frame[phase] * 1000:.1f}ms" for phase in self.phases)
+        )
+
+        counters = Text.assemble(
+            ("objects ", "white"),
+            (str(self.num_alive), "magenta"),
+            ("  cache hits ", "white"),
+            (f"{self.cache_hit_rate:.0%}", "magenta"),
+            (f" ({self.cache_hits}/{self.cache_hits + self.cache_misses})", "dim"),
+            ("  frame ", "white"),
+            (str(self.num_frames), "magenta"),
+        )
+
+        slowest = Text("slowest: ", style=Style(color="white"))
+        slowest += Text(", ", style="dim").join(
+            Text(path, style="cyan") + Text(f" {seconds * 1000:.1f}ms", style="dim")
+            for seconds, path in sorted(self.slowest, reverse=True)
+        )
+        slowest.overflow = "ellipsis"
+        slowest.no_wrap = True
+
+        grid = Table.grid(expand=True)
+        grid.add_column()
+        grid.add_column(justify="right")
+        grid.add_row(timings, counters)
+
+        layout = Layout(size=5)
+        layout.update(
+            Panel(
+                _stack(grid, slowest),
+                title="[i]perf",
+                title_align="left",
+                subtitle="[dim][u]t[/u]:toggle",
+                subtitle_align="left",
+                style="yellow",
+                box=box_type,
+            )
+        )
+        return layout
+
+
+def _stack(*renderables) -> Table:
+    table = Table.grid(expand=True)
+    table.add_column()
+    for renderable in renderables:
+        table.add_row(renderable)
+    return table
+
+
+stats = PerfStats()
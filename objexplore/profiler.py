@@ -0,0 +1,190 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from .cached_object import CachedObject, safegetattr
+from .config import box_type
+from .utils import format_bytes
+
+
+@dataclass
+class AttributeProfile:
+    """ Measurements taken while evaluating a single attribute """
+
+    name: str
+    seconds: float
+    allocated: int
+    exception: Optional[str] = None
+    top_calls: List[str] = field(default_factory=list)
+
+
+class ProfileReport:
+    """ Ranked results of profiling every attribute of an object """
+
+    def __init__(
+        self, dotpath: str, profiles: List[AttributeProfile], use_cprofile: bool
+    ):
+        self.dotpath = dotpath
+        self.use_cprofile = use_cprofile
+        self.profiles = sorted(profiles, key=lambda p: p.seconds, reverse=True)
+        self.total_seconds = sum(p.seconds for p in profiles)
+        self.num_exceptions = sum(1 for p in profiles if p.exception)
+        self.exported_path: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "dotpath": self.dotpath,
+            "cprofile": self.use_cprofile,
+            "total_seconds": self.total_seconds,
+            "attributes": [asdict(profile) for profile in self.profiles],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def export(self, path: str) -> str:
+        """ Write the report as JSON to the given path """
+        with open(path, "w") as f:
+            f.write(self.to_json(indent=2))
+        self.exported_path = path
+        return path
+
+    def get_table(self, num_rows: Optional[int] = None) -> Table:
+        table = Table(box=None, expand=True, padding=(0, 1))
+        table.add_column("#", style="dim", justify="right")
+        table.add_column("attribute", style="cyan", overflow="ellipsis", no_wrap=True)
+        table.add_column("time", justify="right", style="magenta", no_wrap=True)
+        table.add_column("alloc", justify="right", style="magenta", no_wrap=True)
+        table.add_column("exception", style="red", overflow="ellipsis", no_wrap=True)
+        if self.use_cprofile:
+            table.add_column(
+                "top call", style="dim", overflow="ellipsis", no_wrap=True, ratio=2
+            )
+
+        for rank, profile in enumerate(self.profiles[:num_rows], start=1):
+            row = [
+                str(rank),
+                profile.name,
+                f"{profile.seconds * 1000:.2f}ms",
+                format_bytes(profile.allocated),
+                profile.exception or "",
+            ]
+            if self.use_cprofile:
+                row.append(profile.top_calls[0] if profile.top_calls else "")
+            table.add_row(*row)
+        return table
+
+    def get_panel(self, term_height: int) -> Panel:
+        subtitle = (
+            "[dim][u]P[/u]:toggle [u]C[/u]:cProfile [u]e[/u]:export [u]f[/u]:fullscreen"
+        )
+        if self.exported_path:
+            subtitle += f" [/dim][green]saved to {self.exported_path}"
+        return Panel(
+            self.get_table(num_rows=max(term_height - 8, 1)),
+            title=Text.assemble(
+                ("profile", "italic"),
+                " | ",
+                (self.dotpath, "cyan"),
+                (
+                    f" {len(self.profiles)} attributes in {self.total_seconds * 1000:.1f}ms,"
+                    f" {self.num_exceptions} raised",
+                    "dim",
+                ),
+            ),
+            title_align="left",
+            subtitle=subtitle,
+            subtitle_align="left",
+            style="white",
+            box=box_type,
+        )
+
+
+def profile_attributes(
+    cached_obj: CachedObject, use_cprofile: bool = False, num_top_calls: int = 3
+) -> ProfileReport:
+    """Evaluate every attribute of the object under a timer and record the time taken, memory
+    allocated and any exception raised. With `use_cprofile` the hottest calls made while
+    evaluating each attribute are recorded as well
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    errors: Dict[str, Exception] = {}
+    profiles = []
+    try:
+        for attr in (
+            cached_obj.plain_public_attributes + cached_obj.plain_private_attributes
+        ):
+            profiler = cProfile.Profile() if use_cprofile else None
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+
+            start = time.perf_counter()
+            if profiler:
+                profiler.enable()
+            safegetattr(cached_obj.obj, attr, errors=errors)
+            if profiler:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = (
+                peak if hasattr(tracemalloc, "reset_peak") else current
+            ) - baseline
+
+            exception = errors.get(attr)
+            profiles.append(
+                AttributeProfile(
+                    name=attr,
+                    seconds=seconds,
+                    allocated=max(allocated, 0),
+                    exception=(
+                        f"{type(exception).__name__}: {exception}"
+                        if exception
+                        else None
+                    ),
+                    top_calls=top_calls(profiler, num_top_calls) if profiler else [],
+                )
+            )
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return ProfileReport(
+        dotpath=cached_obj.dotpath.plain, profiles=profiles, use_cprofile=use_cprofile
+    )
+
+
+def top_calls(profiler: cProfile.Profile, num_calls: int) -> List[str]:
+    """ Return the calls with the highest cumulative time recorded by the profiler """
+    stats = pstats.Stats(profiler)
+    calls = sorted(
+        stats.stats.items(),  # type: ignore
+        key=lambda item: item[1][3],
+        reverse=True,
+    )
+    formatted = []
+    for (filename, lineno, funcname), (_, ncalls, _, cumtime, _) in calls:
+        # Skip over the calls made by the profiler itself
+        if filename == safegetattr.__code__.co_filename or funcname in (
+            "<built-in method builtins.getattr>",
+            "<method 'disable' of '_lsprof.Profiler' objects>",
+        ):
+            continue
+        location = f"{os.path.basename(filename)}:{lineno}" if lineno else "~"
+        formatted.append(f"{funcname} ({location}) x{ncalls} {cumtime * 1000:.2f}ms")
+        if len(formatted) == num_calls:
+            break
+    return formatted
@@ -0,0 +1,64 @@
+from typing import Callable, Optional
+
+from blessed.keyboard import Keystroke
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.style import Style
+from rich.text import Text
+
+from .config import box_type
+
+
+class Prompt:
+    """A line of input shown below the explorer, such as the key or index to go to. Pressing enter
+    hands the text to the action the prompt was opened with
+    """
+
+    def __init__(self):
+        self.layout = Layout(visible=False, size=3)
+        self.title = ""
+        self.text = ""
+        self.action: Optional[Callable[[str], bool]] = None
+
+    @property
+    def visible(self) -> bool:
+        return self.layout.visible
+
+    def open(self, title: str, action: Callable[[str], bool], text: str = ""):
+        self.title = title
+        self.action = action
+        self.text = text
+        self.layout.visible = True
+
+    def close(self):
+        self.layout.visible = False
+        self.action = None
+
+    def add_char(self, key: Keystroke):
+        self.text += str(key)
+
+    def backspace(self):
+        if not self.text:
+            self.close()
+        self.text = self.text[:-1]
+
+    def submit(self) -> bool:
+        """ Close the prompt and run its action on the text, return False if the action failed """
+        action = self.action
+        self.close()
+        return action is None or not self.text or action(self.text)
+
+    def get_layout(self) -> Layout:
+        self.layout.update(
+            Panel(
+                Text(self.text)
+                + Text("█", style=Style(underline=True, blink=True, reverse=True)),
+                title=f"\\[{self.title}]",
+                title_align="right",
+                subtitle="[dim][u]esc[/u]:cancel",
+                subtitle_align="right",
+                style=Style(color="aquamarine1"),
+                box=box_type,
+            )
+        )
+        return self.layout
@@ -0,0 +1,363 @@
+import gc
+import os
+import sys
+import time
+from types import CellType, FrameType, FunctionType, ModuleType
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from rich.panel import Panel
+from rich.style import Style
+from rich.text import Text
+
+from .config import (
+    box_type,
+    object_cache_size,
+    referrers_max_depth,
+    referrers_max_per_object,
+    referrers_time_budget,
+)
+from .tasks import BackgroundTask
+from .utils import ObjectCache
+from .walk import INDEX, Step
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Objects of these modules hold references to the objects being explored, such as
+# `CachedObject.obj` or `Pretty._object`, and are never listed as referrers
+INTERNAL_MODULES = ("objexplore", "rich.pretty")
+
+
+class ReferrerLine(NamedTuple):
+    """ A referrer found by a `ReferrerSearch`, `depth` is the number of steps from the object searched for """
+
+    depth: int
+    label: Text
+
+
+def is_internal(obj: Any, ignore: Set[int], depth: int = 2) -> bool:
+    """Return True if the object only exists for objexplore: its own objects and frames, and the
+    objects that are only referenced by them, looking up to `depth` levels of referrers
+    """
+    if id(obj) in ignore:
+        return True
+    if isinstance(obj, FrameType):
+        return obj.f_code.co_filename.startswith(PACKAGE_DIR)
+    if isinstance(obj, FunctionType):
+        return obj.__code__.co_filename.startswith(PACKAGE_DIR)
+    if type(obj).__module__.startswith(INTERNAL_MODULES):
+        return True
+    # Such as the dicts of objexplore's objects, or the bound methods of an object explored
+    if depth and not isinstance(obj, (ModuleType, type)):
+        holders = gc.get_referrers(obj)
+        ignore.add(id(holders))
+        try:
+            found = False
+            for holder in holders:
+                if id(holder) in ignore:
+                    continue
+                if not is_internal(holder, ignore, depth - 1):
+                    return False
+                found = True
+            return found
+        finally:
+            ignore.discard(id(holders))
+    return False
+
+
+def matching(pairs: Iterable[Tuple[Any, Any]], target: Any) -> List[Any]:
+    """Return the names of the (name, value) pairs whose value is the target. Comprehensions are
+    avoided while searching as the cells they capture `target` in would be found as referrers
+    """
+    names = []
+    for name, value in pairs:
+        if value is target:
+            names.append(name)
+    return names
+
+
+def dict_owner(namespace: dict, ignore: Set[int]) -> Optional[Any]:
+    """ Return the object or class whose `__dict__` is the given dict, if any """
+    holders = gc.get_referrers(namespace)
+    ignore.add(id(holders))
+    try:
+        for holder in holders:
+            if id(holder) in ignore or isinstance(holder, FrameType):
+                continue
+            if isinstance(holder, type):
+                # Classes expose a mappingproxy of their dict, the dict itself is a referent
+                for referent in gc.get_referents(holder):
+                    if referent is namespace:
+                        return holder
+            elif getattr(holder, "__dict__", None) is namespace:
+                return holder
+    finally:
+        ignore.discard(id(holders))
+    return None
+
+
+def describe(
+    referrer: Any, target: Any, modules: Dict[int, str], ignore: Set[int]
+) -> Tuple[Any, Text, bool]:
+    """Describe how `referrer` holds a reference to `target`
+
+    Return the object to keep looking for referrers of, the label of the reference, and whether
+    the search stops here, at module globals, frames and classes
+    """
+    if isinstance(referrer, FrameType):
+        code = referrer.f_code
+        names = matching(referrer.f_locals.items(), target)
+        label = Text.assemble(
+            ("frame ", "dim"),
+            (f"{code.co_name}()", "cyan"),
+            f" {os.path.basename(code.co_filename)}:{referrer.f_lineno}",
+            (" local ", "dim") if names else "",
+            ", ".join(names),
+        )
+        return referrer, label, True
+
+    if isinstance(referrer, ModuleType):
+        return (
+            referrer,
+            Text.assemble(("module ", "dim"), (referrer.__name__, "blue")),
+            True,
+        )
+
+    if type(referrer) == dict:
+        keys = matching(referrer.items(), target)
+        if id(referrer) in modules:
+            return (
+                referrer,
+                Text.assemble(
+                    ("module ", "dim"),
+                    (modules[id(referrer)], "blue"),
+                    "".join(f".{key}" for key in keys),
+                ),
+                True,
+            )
+        owner = dict_owner(referrer, ignore)
+        attributes = "".join(f".{key}" for key in keys)
+        if isinstance(owner, type):
+            return (
+                owner,
+                Text.assemble(
+                    ("class ", "dim"),
+                    (f"{owner.__module__}.{owner.__qualname__}", "magenta"),
+                    attributes,
+                ),
+                True,
+            )
+        elif owner is not None:
+            return (
+                owner,
+                Text.assemble((type(owner).__qualname__, "magenta"), attributes),
+                False,
+            )
+        return (
+            referrer,
+            Text.assemble(
+                ("dict", "light_sea_green"),
+                "".join(str(Step(INDEX, key)) for key in keys),
+            ),
+            False,
+        )
+
+    if isinstance(referrer, (list, tuple)):
+        indexes = matching(enumerate(referrer), target)
+        return (
+            referrer,
+            Text.assemble(
+                (type(referrer).__name__, "indian_red1"),
+                "".join(f"[{index}]" for index in indexes),
+            ),
+            False,
+        )
+
+    if isinstance(referrer, CellType):
+        return referrer, Text("closure cell", style="cyan"), False
+
+    if isinstance(referrer, type):
+        return (
+            referrer,
+            Text.assemble(
+                ("class ", "dim"),
+                (f"{referrer.__module__}.{referrer.__qualname__}", "magenta"),
+            ),
+            True,
+        )
+
+    attribute_names: List[str] = []
+    namespace = getattr(referrer, "__dict__", None)
+    if type(namespace) == dict:
+        attribute_names += matching(namespace.items(), target)
+    for cls in type(referrer).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if getattr(referrer, slot, None) is target:
+                attribute_names.append(slot)
+    return (
+        referrer,
+        Text.assemble(
+            (type(referrer).__qualname__, "magenta"),
+            "".join(f".{name}" for name in attribute_names),
+        ),
+        False,
+    )
+
+
+class ReferrerSearch:
+    """Find what holds references to an object with `gc.get_referrers()`, then what holds
+    references to those referrers, up toward module globals, classes and frames. The search runs
+    in the background until it has gone through every referrer or its time budget runs out
+    """
+
+    def __init__(
+        self,
+        obj: Any,
+        time_budget: float = referrers_time_budget,
+        max_depth: int = referrers_max_depth,
+        max_per_object: int = referrers_max_per_object,
+    ):
+        self.obj = obj
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.max_per_object = max_per_object
+        self.lines: List[ReferrerLine] = []
+        self.truncated = False
+        self.seconds = 0.0
+        self.frames: List[FrameType] = []
+        self.task: Optional[BackgroundTask] = None
+
+    def start(self) -> "ReferrerSearch":
+        self.task = BackgroundTask(self.search, name="referrers").start()
+        return self
+
+    def search(self, task: BackgroundTask):
+        start = time.perf_counter()
+        self.deadline = start + self.time_budget
+        modules = {
+            id(vars(module)): name
+            for name, module in list(sys.modules.items())
+            if isinstance(module, ModuleType)
+        }
+        # Frames are only seen by `gc.get_referrers()` once something has asked for them,
+        # so the frames running in every thread are checked as well
+        frames = []
+        for frame in list(sys._current_frames().values()):
+            while frame is not None:
+                if not is_internal(frame, set()):
+                    frames.append(frame)
+                frame = frame.f_back  # type: ignore
+        ignore = {id(self.lines), id(modules), id(frames)}
+        self.frames = frames
+        try:
+            self.expand(task, self.obj, 0, {id(self.obj)}, modules, ignore)
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.frames = []
+
+    def expand(
+        self,
+        task: BackgroundTask,
+        target: Any,
+        depth: int,
+        path: Set[int],
+        modules: Dict[int, str],
+        ignore: Set[int],
+    ):
+        referrers = gc.get_referrers(target)
+        referrer_ids = {id(referrer) for referrer in referrers}
+        for frame in self.frames:
+            if id(frame) not in referrer_ids and matching(
+                frame.f_locals.items(), target
+            ):
+                referrers.append(frame)
+        ignore.add(id(referrers))
+        try:
+            num_found = 0
+            for referrer in referrers:
+                if task.cancelled.is_set():
+                    return
+                if time.perf_counter() > self.deadline:
+                    self.truncated = True
+                    return
+                if id(referrer) in path or is_internal(referrer, ignore):
+                    continue
+                if num_found == self.max_per_object:
+                    self.truncated = True
+                    return
+
+                holder, label, stop = describe(referrer, target, modules, ignore)
+                self.lines.append(ReferrerLine(depth, label))
+                task.progress += 1
+                num_found += 1
+                if not stop and depth + 1 < self.max_depth and id(holder) not in path:
+                    self.expand(
+                        task, holder, depth + 1, path | {id(holder)}, modules, ignore
+                    )
+        finally:
+            ignore.discard(id(referrers))
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and self.task.running
+
+    @property
+    def cancelled(self) -> bool:
+        return self.task is not None and self.task.cancelled.is_set()
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
+
+    def get_text(self, num_lines: Optional[int] = None) -> Text:
+        lines = [
+            Text("  " * line.depth) + Text("← ", style="dim") + line.label
+            for line in self.lines[:num_lines]
+        ]
+        if not lines and not self.running:
+            lines.append(
+                Text("No referrers found", style=Style(color="red", italic=True))
+            )
+        return Text("\n").join(lines)
+
+    def get_panel(self, title: Text, term_height: int) -> Panel:
+        if self.running:
+            status = f"searching… {len(self.lines)} found"
+        else:
+            status = f"{len(self.lines)} found in {self.seconds:.1f}s"
+            if self.truncated:
+                status += ", stopped at the time or referrer budget"
+        text = self.get_text(num_lines=max(term_height - 8, 1))
+        text.no_wrap = True
+        text.overflow = "ellipsis"
+        return Panel(
+            text,
+            title=Text.assemble(("referrers", "italic"), " | ", title),
+            title_align="left",
+            subtitle=f"[dim][u]R[/u]:toggle {status}",
+            subtitle_align="left",
+            style="white",
+            box=box_type,
+        )
+
+
+class ReferrerCache:
+    """Referrer searches of the objects selected most recently, cached per object identity. Only
+    one search runs at a time
+    """
+
+    def __init__(self, max_size: int = object_cache_size):
+        self.searches = ObjectCache(max_size)
+        self.current: Optional[ReferrerSearch] = None
+
+    def get(self, obj: Any) -> ReferrerSearch:
+        """ Return the search for the object's referrers, starting it in the background if needed """
+        search = self.searches.get(obj)
+        if search is None or search.cancelled:
+            # A search cancelled when another object was selected only found some of the referrers
+            if self.current and self.current.running:
+                self.current.cancel()
+            search = ReferrerSearch(obj).start()
+            for evicted in self.searches.put(obj, search):
+                evicted.cancel()
+        self.current = search
+        return search
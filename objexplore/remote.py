@@ -0,0 +1,337 @@
+import inspect
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cached_object import attribute_names, container_kind, iter_items, safegetattr
+from .sizeof import shallow_sizeof
+from .snapshot import budgeted_repr
+from .virtual import ChildInfo, NodeInfo, ObjectModel
+from .walk import ATOMIC_TYPES, ATTR, INDEX, Step
+
+PROTOCOL_VERSION = 1
+
+
+class RemoteError(Exception):
+    """ An error raised in the process being explored while answering a request """
+
+
+def count_children(obj: Any) -> int:
+    """ Return the number of children `iter_children()` yields for an object, without getting them """
+    if type(obj) == dict or isinstance(obj, (list, tuple, set)):
+        return len(obj)
+    if isinstance(obj, ATOMIC_TYPES):
+        return 0
+    public_attributes, private_attributes = attribute_names(obj)
+    return len(public_attributes) + len(private_attributes)
+
+
+class Session:
+    """The objects handed out to one client. Node ids are only valid on the connection they were
+    sent on, and the objects are kept referenced until the client disconnects so that their ids
+    stay valid
+    """
+
+    def __init__(self, root: Any, name: str):
+        self.name = name
+        self.objects: List[Any] = [root]
+        self.node_ids: Dict[int, int] = {id(root): 0}
+        # Where the last window of each dict or set ended, as (offset, length, items left)
+        self.cursors: Dict[int, Tuple[int, int, Iterator[Tuple[Any, Any]]]] = {}
+
+    def node_id(self, obj: Any) -> int:
+        if id(obj) not in self.node_ids:
+            self.node_ids[id(obj)] = len(self.objects)
+            self.objects.append(obj)
+        return self.node_ids[id(obj)]
+
+    def children(self, node_id: int, offset: int, limit: int) -> List[Tuple[Step, Any]]:
+        """Return the children of a node from `offset`, in the order of `iter_children()`, without
+        going through the children before it. Lists and tuples are indexed and only the attributes
+        in the window are looked up. Dicts and sets carry on from where the previous window ended
+        while their length is unchanged
+        """
+        obj = self.objects[node_id]
+        if isinstance(obj, (list, tuple)):
+            return [
+                (Step(INDEX, index), obj[index])
+                for index in range(offset, min(offset + limit, len(obj)))
+            ]
+
+        if type(obj) == dict or isinstance(obj, set):
+            cursor = self.cursors.pop(node_id, None)
+            if cursor is not None and cursor[:2] == (offset, len(obj)):
+                items = cursor[2]
+            else:
+                items = islice(iter_items(obj), offset, None)
+            try:
+                window = list(islice(items, limit))
+            except RuntimeError:
+                # Changed size during iteration, skipped to the offset again
+                items = islice(iter_items(obj), offset, None)
+                window = list(islice(items, limit))
+            self.cursors[node_id] = (offset + len(window), len(obj), items)
+            return [(Step(INDEX, key), value) for key, value in window]
+
+        if isinstance(obj, ATOMIC_TYPES):
+            return []
+        public_attributes, private_attributes = attribute_names(obj)
+        names = (public_attributes + private_attributes)[offset : offset + limit]
+        return [(Step(ATTR, attr), safegetattr(obj, attr)) for attr in names]
+
+    def node(self, obj: Any, repr_budget: int) -> Dict[str, Any]:
+        try:
+            length: Optional[int] = len(obj)
+        except Exception:
+            length = None
+        return dict(
+            id=self.node_id(obj),
+            type=str(type(obj)),
+            repr=budgeted_repr(obj, repr_budget),
+            length=length,
+            size=shallow_sizeof(obj),
+            container=container_kind(obj),
+            is_callable=callable(obj),
+        )
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """ Answer a single request, errors are sent back to the client instead of being raised """
+        try:
+            op = request["op"]
+            repr_budget = request.get("repr_budget", 200)
+            if op == "hello":
+                result: Any = dict(version=PROTOCOL_VERSION, name=self.name)
+            elif op == "root":
+                result = self.node(self.objects[0], repr_budget)
+            elif op == "children":
+                children = self.children(
+                    request["node"], request.get("offset", 0), request.get("limit", 100)
+                )
+                result = dict(
+                    total=count_children(self.objects[request["node"]]),
+                    children=[
+                        dict(
+                            kind=step.kind,
+                            name=(
+                                step.name if type(step.name) == str else repr(step.name)
+                            ),
+                            key_type=type(step.name).__name__,
+                            node=self.node(child, repr_budget),
+                        )
+                        for step, child in children
+                    ],
+                )
+            elif op == "docstring":
+                result = inspect.getdoc(self.objects[request["node"]]) or ""
+            elif op == "source":
+                try:
+                    result = inspect.getsource(self.objects[request["node"]])
+                except Exception:
+                    result = ""
+            else:
+                raise ValueError(f"Unknown request {op!r}")
+        except Exception as err:
+            return dict(id=request.get("id"), error=f"{type(err).__name__}: {err}")
+        return dict(id=request.get("id"), result=result)
+
+
+class SessionHandler(socketserver.StreamRequestHandler):
+    """ Answer the requests of one client, one JSON object per line in each direction """
+
+    server: "ExploreServer"
+
+    def handle(self):
+        session = Session(self.server.obj, self.server.name)
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = dict(id=None, error="Malformed request")
+            else:
+                response = session.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class ExploreServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, obj: Any, name: str):
+        self.obj = obj
+        self.name = name
+        super().__init__(path, SessionHandler)
+
+
+class RemoteServer:
+    """Serve an object over a Unix domain socket from a background thread, so it can be explored
+    from another process with `objexplore.explore_remote()`. See `serve()`
+    """
+
+    def __init__(self, obj: Any, path: str, name: str = "obj"):
+        self.obj = obj
+        self.path = path
+        self.name = name
+        self.server: Optional[ExploreServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RemoteServer":
+        # Replace the socket left behind by a previous run, but never any other kind of file
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)
+        # Anyone who can connect can read any object in the process, so the socket is created
+        # readable and writable by its owner only rather than changing its mode once it is bound
+        umask = os.umask(0o177)
+        try:
+            self.server = ExploreServer(self.path, self.obj, self.name)
+        finally:
+            os.umask(umask)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="objexplore-server", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def __enter__(self) -> "RemoteServer":
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+
+def serve(obj: Any, path: str, name: str = "obj") -> RemoteServer:
+    """
+    Serve `obj` on the Unix domain socket at `path` so it can be explored from another process,
+    without blocking this one:
+
+    >>> server = objexplore.serve(app, "/tmp/app.sock", name="app")
+
+    and from a terminal:
+
+    >>> objexplore.explore_remote("/tmp/app.sock")
+
+    Requests are answered in a daemon thread. Only the objects that the client explores are
+    inspected, and listings are sent a window at a time. The socket is only accessible to the
+    current user. Call `stop()` on the returned server to close it
+    """
+    return RemoteServer(obj, path, name=name).start()
+
+
+class RemoteModel(ObjectModel):
+    """Object model of a process serving an object with `serve()`. Requests can be sent before the
+    responses to earlier ones have been read, so the pages of a listing are fetched in a single
+    round trip. Docstrings and sources are cached once fetched
+    """
+
+    def __init__(self, path: str, repr_budget: int = 200):
+        self.path = path
+        self.repr_budget = repr_budget
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(path)
+        self.file = self.connection.makefile("rwb")
+        # Used from the background tasks of the explorer as well as the main thread
+        self.send_lock = threading.Lock()
+        self.receive_lock = threading.Lock()
+        self.next_id = 0
+        self.responses: Dict[int, Dict[str, Any]] = {}
+        # Windows requested by `prefetch()` whose responses have not been read yet
+        self.pending: Dict[Tuple[Any, int, int], int] = {}
+        self.docstrings: Dict[Any, str] = {}
+        self.sources: Dict[Any, str] = {}
+
+        hello = self.request("hello")
+        if hello["version"] > PROTOCOL_VERSION:
+            raise ValueError(
+                f"{path} is served by a newer version of objexplore (protocol version {hello['version']})"
+            )
+        self.name = hello["name"]
+
+    def send(self, op: str, **params) -> int:
+        """ Send a request without waiting for the response, return the id to `receive()` it with """
+        with self.send_lock:
+            request_id = self.next_id
+            self.next_id += 1
+            request = dict(id=request_id, op=op, repr_budget=self.repr_budget, **params)
+            self.file.write(json.dumps(request).encode() + b"\n")
+            self.file.flush()
+        return request_id
+
+    def receive(self, request_id: int) -> Any:
+        """ Wait for the response to a request, keeping the responses to other requests that arrive first """
+        with self.receive_lock:
+            while request_id not in self.responses:
+                line = self.file.readline()
+                if not line:
+                    raise ConnectionError(f"{self.path} closed the connection")
+                response = json.loads(line)
+                self.responses[response["id"]] = response
+            response = self.responses.pop(request_id)
+        if "error" in response:
+            raise RemoteError(response["error"])
+        return response["result"]
+
+    def request(self, op: str, **params) -> Any:
+        return self.receive(self.send(op, **params))
+
+    def root(self) -> NodeInfo:
+        return NodeInfo(**self.request("root"))
+
+    def children(self, node_id: Any) -> List[ChildInfo]:
+        total, children = self.window(node_id, 0, self.page_size)
+        # Ask for every other page before reading any of the responses
+        offsets = range(self.page_size, total, self.page_size)
+        for offset in offsets:
+            self.prefetch(node_id, offset, self.page_size)
+        for offset in offsets:
+            children += self.window(node_id, offset, self.page_size)[1]
+        return children
+
+    def window(
+        self, node_id: Any, offset: int, limit: int
+    ) -> Tuple[int, List[ChildInfo]]:
+        request_id = self.pending.pop((node_id, offset, limit), None)
+        if request_id is None:
+            request_id = self.send("children", node=node_id, offset=offset, limit=limit)
+        result = self.receive(request_id)
+        children = [
+            ChildInfo(
+                kind=child["kind"],
+                name=child["name"],
+                key_type=child["key_type"],
+                node=NodeInfo(**child["node"]),
+            )
+            for child in result["children"]
+        ]
+        return result["total"], children
+
+    def prefetch(self, node_id: Any, offset: int, limit: int):
+        if (node_id, offset, limit) not in self.pending:
+            self.pending[node_id, offset, limit] = self.send(
+                "children", node=node_id, offset=offset, limit=limit
+            )
+
+    def docstring(self, node_id: Any) -> str:
+        if node_id not in self.docstrings:
+            self.docstrings[node_id] = self.request("docstring", node=node_id)
+        return self.docstrings[node_id]
+
+    def source(self, node_id: Any) -> str:
+        if node_id not in self.sources:
+            self.sources[node_id] = self.request("source", node=node_id)
+        return self.sources[node_id]
+
+    def close(self):
+        self.file.close()
+        self.connection.close()
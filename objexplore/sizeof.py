@@ -0,0 +1,237 @@
+import gc
+import sys
+import threading
+from types import FunctionType, ModuleType
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple
+
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from .config import box_type, deep_sizeof_max_nodes, object_cache_size
+from .tasks import BackgroundTask
+from .utils import ObjectCache, format_bytes
+
+# Objects of these types are shared by everything and are not counted as part of an object's size
+SHARED_TYPES = (type, ModuleType, FunctionType)
+
+# Number of objects visited between checks for cancellation
+STEP_SIZE = 1000
+
+
+def shallow_sizeof(obj: Any) -> int:
+    try:
+        return sys.getsizeof(obj)
+    except Exception:
+        return 0
+
+
+class DeepSize:
+    """Incrementally computed estimate of the memory retained by an object
+
+    The object graph is walked through `gc.get_referents`, visiting every object at most once so
+    cycles are handled, and stopping after `max_nodes` objects. Classes, modules and functions
+    are shared and are not counted
+    """
+
+    def __init__(self, obj: Any, max_nodes: int = deep_sizeof_max_nodes):
+        self.obj = obj
+        self.max_nodes = max_nodes
+        self.shallow = shallow_sizeof(obj)
+        self.size = self.shallow
+        self.num_nodes = 1
+        self.truncated = False
+        self.done = False
+        self.lock = threading.Lock()
+        self._seen: Set[int] = {id(obj)}
+        self._pending: List[Any] = gc.get_referents(obj)
+
+    def step(self, num_nodes: int = STEP_SIZE) -> bool:
+        """ Visit up to `num_nodes` more objects. Return True once the walk is finished """
+        pending = self._pending
+        seen = self._seen
+        for _ in range(num_nodes):
+            if not pending:
+                return self._finish()
+            if self.num_nodes >= self.max_nodes:
+                self.truncated = True
+                return self._finish()
+
+            obj = pending.pop()
+            if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+                continue
+            seen.add(id(obj))
+            self.size += shallow_sizeof(obj)
+            self.num_nodes += 1
+            pending.extend(gc.get_referents(obj))
+        return False
+
+    def _finish(self) -> bool:
+        self.done = True
+        # Release the bookkeeping, only the totals are needed from here on
+        self._seen = set()
+        self._pending = []
+        return True
+
+    def compute(self, task: Optional[BackgroundTask] = None) -> "DeepSize":
+        """ Walk until finished, or until the task is cancelled """
+        with self.lock:
+            while not self.done:
+                if task and task.cancelled.is_set():
+                    break
+                self.step()
+        return self
+
+    @property
+    def text(self) -> Text:
+        size = Text(("≥" if self.truncated else "") + format_bytes(self.size))
+        size.stylize("magenta")
+        if not self.done:
+            size += Text(f" computing… {self.num_nodes:,} objects", style="dim")
+        else:
+            size += Text(f" ({self.num_nodes:,} objects)", style="dim")
+        return size
+
+
+def deep_sizeof(obj: Any, max_nodes: int = deep_sizeof_max_nodes) -> int:
+    """ Return the estimated deep size of an object, computed in the foreground """
+    return DeepSize(obj, max_nodes=max_nodes).compute().size
+
+
+class SizeCache:
+    """Deep sizes of the objects selected most recently, cached per object identity. Sizes are
+    computed in the background on request, only one object is walked at a time and requesting a
+    new object cancels the previous walk
+    """
+
+    def __init__(
+        self, max_nodes: int = deep_sizeof_max_nodes, max_size: int = object_cache_size
+    ):
+        self.max_nodes = max_nodes
+        self.sizes = ObjectCache(max_size)
+        self.task: Optional[BackgroundTask] = None
+        self.task_entry: Optional[DeepSize] = None
+
+    def entry(self, obj: Any) -> DeepSize:
+        """ Return the (possibly unfinished) cached size of the object, or a new one that is not cached, without scheduling any work """
+        return self.sizes.peek(obj) or DeepSize(obj, max_nodes=self.max_nodes)
+
+    def get(self, obj: Any) -> DeepSize:
+        """ Return the cached size of the object, starting to compute it in the background if needed """
+        entry = self.sizes.get(obj)
+        if entry is None:
+            entry = DeepSize(obj, max_nodes=self.max_nodes)
+            for evicted in self.sizes.put(obj, entry):
+                if evicted is self.task_entry and self.task:
+                    self.task.cancel()
+        if not entry.done and not (self.task_entry is entry and self.task.running):  # type: ignore
+            if self.task and self.task.running:
+                self.task.cancel()
+            self.task_entry = entry
+            self.task = BackgroundTask(entry.compute, name="deep-sizeof").start()
+        return entry
+
+
+class SizeBreakdown:
+    """Deep size of every child of an object, computed one child at a time in the background. The
+    children are listed as they are reached, the rows of lists that were not displayed yet are not
+    built for it
+    """
+
+    def __init__(self, cached_obj, sizes: SizeCache):
+        self.cached_obj = cached_obj
+        self.sizes = sizes
+        self.children: List[Tuple[Text, DeepSize]] = []
+        num_children, get_child = children_of(cached_obj)
+        self.task = BackgroundTask(
+            lambda task: self.compute(task, num_children, get_child),
+            name="size-breakdown",
+        )
+        self.task.total = num_children
+        self.task.start()
+
+    def compute(
+        self,
+        task: BackgroundTask,
+        num_children: int,
+        get_child: Callable[[int], Tuple[Text, Any]],
+    ):
+        for index in range(num_children):
+            if task.cancelled.is_set():
+                return
+            label, obj = get_child(index)
+            entry = self.sizes.entry(obj)
+            self.children.append((label, entry))
+            entry.compute(task)
+            task.progress += 1
+
+    def cancel(self):
+        self.task.cancel()
+
+    @property
+    def total(self) -> int:
+        return sum(entry.size for _, entry in self.children)
+
+    def get_table(self, num_rows: Optional[int] = None) -> Table:
+        table = Table(box=None, expand=True, padding=(0, 1))
+        table.add_column("name", overflow="ellipsis", no_wrap=True, ratio=2)
+        table.add_column("shallow", justify="right", style="magenta", no_wrap=True)
+        table.add_column("deep", justify="right", style="magenta", no_wrap=True)
+        table.add_column("%", justify="right", style="dim", no_wrap=True)
+
+        total = self.total or 1
+        ranked = sorted(self.children, key=lambda child: child[1].size, reverse=True)
+        for label, entry in ranked[:num_rows]:
+            table.add_row(
+                label,
+                format_bytes(entry.shallow),
+                ("≥" if entry.truncated else "")
+                + format_bytes(entry.size)
+                + ("" if entry.done else "…"),
+                f"{entry.size / total:.0%}",
+            )
+        return table
+
+    def get_panel(self, term_height: int) -> Panel:
+        subtitle = "[dim][u]z[/u]:toggle"
+        if self.task.running:
+            subtitle += f" computing {self.task.progress}/{self.task.total}"
+        return Panel(
+            self.get_table(num_rows=max(term_height - 8, 1)),
+            title=Text.assemble(
+                ("sizeof", "italic"),
+                " | ",
+                self.cached_obj.dotpath.text,
+                (
+                    f" {format_bytes(self.total)} in {len(self.children)} children",
+                    "dim",
+                ),
+            ),
+            title_align="left",
+            subtitle=subtitle,
+            subtitle_align="left",
+            style="white",
+            box=box_type,
+        )
+
+
+def children_of(cached_obj) -> Tuple[int, Callable[[int], Tuple[Text, Any]]]:
+    """Return the number of children listed by the explorer for the cached object, and a function
+    giving the label and object of a child by position. The rows of a list that were not displayed
+    yet are not built, see `LazyRows.item()`
+    """
+    rows: Sequence
+    if cached_obj.filtered_dict:
+        rows = list(cached_obj.filtered_dict.values())
+    elif cached_obj.filtered_list:
+        rows = cached_obj.filtered_list
+        item = getattr(rows, "item", None)
+        if item is not None:
+            return len(rows), item
+    else:
+        rows = [
+            (child.text, child)
+            for child in list(cached_obj.filtered_public_attributes.values())
+            + list(cached_obj.filtered_private_attributes.values())
+        ]
+    return len(rows), lambda index: (rows[index][0], rows[index][1].obj)
@@ -0,0 +1,276 @@
+import os
+import reprlib
+import sqlite3
+import tempfile
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .cached_object import container_kind
+from .sizeof import shallow_sizeof
+from .virtual import ChildInfo, NodeInfo, ObjectModel
+from .walk import ATOMIC_TYPES, iter_children
+
+SNAPSHOT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    repr TEXT NOT NULL,
+    length INTEGER,
+    size INTEGER NOT NULL,
+    container TEXT,
+    is_callable INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    parent INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    key_type TEXT,
+    child INTEGER NOT NULL
+);
+"""
+
+# Created once every row has been written, building it incrementally would slow down the export
+INDEX = "CREATE INDEX IF NOT EXISTS edges_parent ON edges (parent, position);"
+
+
+def budgeted_repr(obj: Any, budget: int) -> str:
+    """ Return the repr of an object, limited to `budget` characters """
+    shortener = reprlib.Repr()
+    shortener.maxstring = budget
+    shortener.maxother = budget
+    try:
+        text = shortener.repr(obj)
+    except Exception:
+        text = f"<unrepresentable {type(obj).__name__} object>"
+    return text if len(text) <= budget else text[: budget - 3] + "..."
+
+
+class SnapshotWriter:
+    """Append nodes and edges to a snapshot database, writing them out in chunks so the memory
+    used does not depend on the size of the graph being exported. The snapshot is written to a
+    temporary file next to `path` and only replaces any file at `path` once it is closed
+    """
+
+    def __init__(self, path: str, chunk_size: int = 10_000):
+        self.path = path
+        fd, self.temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        os.close(fd)
+        self.connection = sqlite3.connect(self.temp_path)
+        self.connection.executescript(SCHEMA)
+        self.chunk_size = chunk_size
+        self.nodes: List[Tuple] = []
+        self.edges: List[Tuple] = []
+        self.num_nodes = 0
+        self.num_edges = 0
+
+    def add_node(self, obj: Any, repr_budget: int) -> int:
+        node_id = self.num_nodes
+        self.num_nodes += 1
+        try:
+            length: Optional[int] = len(obj)
+        except Exception:
+            length = None
+        self.nodes.append(
+            (
+                node_id,
+                str(type(obj)),
+                budgeted_repr(obj, repr_budget),
+                length,
+                shallow_sizeof(obj),
+                container_kind(obj),
+                callable(obj),
+            )
+        )
+        if len(self.nodes) >= self.chunk_size:
+            self.flush()
+        return node_id
+
+    def add_edge(self, parent: int, position: int, kind: str, name: Any, child: int):
+        self.num_edges += 1
+        self.edges.append(
+            (
+                parent,
+                position,
+                kind,
+                name if type(name) == str else repr(name),
+                type(name).__name__,
+                child,
+            )
+        )
+        if len(self.edges) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)", self.nodes
+            )
+            self.connection.executemany(
+                "INSERT INTO edges VALUES (?, ?, ?, ?, ?, ?)", self.edges
+            )
+        self.nodes = []
+        self.edges = []
+
+    def set_meta(self, **meta):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [(key, str(value)) for key, value in meta.items()],
+            )
+
+    def close(self):
+        self.flush()
+        with self.connection:
+            self.connection.execute(INDEX)
+        self.connection.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """ Throw away the partial snapshot, leaving any file at `path` as it was """
+        self.connection.close()
+        try:
+            os.unlink(self.temp_path)
+        except OSError:
+            pass
+
+
+def export_snapshot(
+    obj: Any,
+    path: str,
+    name: str = "obj",
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    private: bool = False,
+    callables: bool = False,
+    repr_budget: int = 200,
+    chunk_size: int = 10_000,
+) -> int:
+    """
+    Walk the object graph starting at `obj` and save it to a SQLite snapshot at `path` that can be
+    explored later without the live objects, see `explore_snapshot()`. Return the number of
+    objects saved
+
+    Every object is saved once with its type, repr (limited to `repr_budget` characters), length
+    and shallow size. Attributes, keys and items are saved as edges, so objects referenced from
+    several places are shared in the snapshot just like in the live graph
+
+    :param max_depth: Do not descend further than this many steps from the root
+    :param max_nodes: Stop after saving this many objects
+    :param private: Also save private attributes
+    :param callables: Also save callable attributes such as methods
+    :param chunk_size: Number of rows buffered before they are written to disk
+    """
+    writer = SnapshotWriter(path, chunk_size=chunk_size)
+    try:
+        writer.set_meta(
+            version=SNAPSHOT_VERSION,
+            name=name,
+            created=time.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        root_id = writer.add_node(obj, repr_budget)
+        # Objects are kept referenced here so their ids cannot be reused during the export
+        node_ids: Dict[int, Tuple[int, Any]] = {id(obj): (root_id, obj)}
+        queue: Deque[Tuple[int, int, Any]] = deque([(root_id, 0, obj)])
+
+        while queue:
+            parent_id, depth, node = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            for position, (step, child) in enumerate(
+                iter_children(node, private=private, callables=callables)
+            ):
+                atomic = isinstance(child, ATOMIC_TYPES)
+                if not atomic and id(child) in node_ids:
+                    child_id = node_ids[id(child)][0]
+                else:
+                    if max_nodes is not None and writer.num_nodes >= max_nodes:
+                        queue.clear()
+                        break
+                    child_id = writer.add_node(child, repr_budget)
+                    if not atomic:
+                        node_ids[id(child)] = (child_id, child)
+                        queue.append((child_id, depth + 1, child))
+                writer.add_edge(parent_id, position, step.kind, step.name, child_id)
+
+        writer.set_meta(num_nodes=writer.num_nodes, num_edges=writer.num_edges)
+        writer.close()
+    except BaseException:
+        # Such as KeyboardInterrupt or a failed write, an existing snapshot is kept intact
+        writer.abort()
+        raise
+
+    return writer.num_nodes
+
+
+class SnapshotModel(ObjectModel):
+    """Object model backed by a snapshot saved with `export_snapshot()`. Nothing is loaded up front,
+    the children of a node are queried through the index on edges when the node is explored
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Opened read only, and usable from the background tasks of the explorer
+        self.connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self.meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+        if int(self.meta.get("version", 0)) > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{path} was saved by a newer version of objexplore (snapshot version {self.meta['version']})"
+            )
+        self.name = self.meta.get("name", "obj")
+
+    def root(self) -> NodeInfo:
+        row = self.connection.execute(
+            "SELECT id, type, repr, length, size, container, is_callable FROM nodes WHERE id = 0"
+        ).fetchone()
+        return node_info(row)
+
+    def children(self, node_id: Any) -> List[ChildInfo]:
+        return self.query_children("WHERE edges.parent = ?", (node_id,))
+
+    def window(
+        self, node_id: Any, offset: int, limit: int
+    ) -> Tuple[int, List[ChildInfo]]:
+        (total,) = self.connection.execute(
+            "SELECT count(*) FROM edges WHERE parent = ?", (node_id,)
+        ).fetchone()
+        # Positions are consecutive so the window is a range scan of the index on edges
+        children = self.query_children(
+            "WHERE edges.parent = ? AND edges.position >= ? AND edges.position < ?",
+            (node_id, offset, offset + limit),
+        )
+        return total, children
+
+    def query_children(self, where: str, parameters: Tuple) -> List[ChildInfo]:
+        rows = self.connection.execute(
+            "SELECT edges.kind, edges.name, edges.key_type,"
+            " nodes.id, nodes.type, nodes.repr, nodes.length, nodes.size, nodes.container, nodes.is_callable"
+            f" FROM edges JOIN nodes ON nodes.id = edges.child {where} ORDER BY edges.position",
+            parameters,
+        )
+        return [
+            ChildInfo(kind, name, key_type, node_info(node))
+            for kind, name, key_type, *node in rows
+        ]
+
+
+def node_info(row: Any) -> NodeInfo:
+    node_id, type_, repr_, length, size, container, is_callable = row
+    return NodeInfo(
+        id=node_id,
+        type=type_,
+        repr=repr_,
+        length=length,
+        size=size,
+        container=container,
+        is_callable=bool(is_callable),
+    )
@@ -0,0 +1,170 @@
+import dataclasses
+from typing import Any, Dict, List, Optional, Sequence
+
+from rich.style import Style
+from rich.text import Text
+
+from .config import table_max_distinct, table_max_fields, table_sample_size
+from .tasks import BackgroundTask
+
+# Value of a field missing from a record, such as a key missing from one of the dicts
+MISSING = object()
+
+NUMERIC_TYPES = (int, float)
+
+
+def sample(items: Sequence, size: int) -> List[Any]:
+    """ Take up to `size` items spread evenly over the sequence, always including the first and last items """
+    if len(items) <= size:
+        return list(items)
+    step = (len(items) - 1) / (size - 1)
+    return [items[round(position * step)] for position in range(size)]
+
+
+def record_fields(
+    items: Sequence,
+    sample_size: int = table_sample_size,
+    max_fields: int = table_max_fields,
+) -> Optional[List[str]]:
+    """Return the fields of the records held by the sequence, or None if a sample of its items
+    are not all dicts with str keys, instances of the same dataclass or of the same namedtuple
+    """
+    records = sample(items, sample_size)
+    if not records:
+        return None
+    cls = type(records[0])
+    if any(type(record) is not cls for record in records):
+        return None
+
+    if cls is dict:
+        fields: Dict[str, None] = {}
+        for record in records:
+            if not all(type(key) is str for key in record):
+                return None
+            fields.update(dict.fromkeys(record))
+            if len(fields) > max_fields:
+                return None
+        return list(fields) or None
+    elif dataclasses.is_dataclass(cls):
+        return [field.name for field in dataclasses.fields(cls)][:max_fields]
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        return list(cls._fields)[:max_fields]  # type: ignore
+    return None
+
+
+def get_field(record: Any, field: str) -> Any:
+    if type(record) is dict:
+        return record.get(field, MISSING)
+    return getattr(record, field, MISSING)
+
+
+class ColumnSummary:
+    """ The distinct count, number of nulls and range of numeric values of a field """
+
+    def __init__(self):
+        self.distinct: set = set()
+        # Set once there are more distinct values than are counted, or values are not hashable
+        self.distinct_overflow = False
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+
+    def add(self, value: Any):
+        if value is None or value is MISSING:
+            self.nulls += 1
+            return
+        if not self.distinct_overflow:
+            try:
+                self.distinct.add(value)
+            except TypeError:
+                self.distinct_overflow = True
+            if len(self.distinct) > table_max_distinct:
+                self.distinct_overflow = True
+                self.distinct = set()
+        if isinstance(value, NUMERIC_TYPES) and not isinstance(value, bool):
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @property
+    def distinct_text(self) -> str:
+        if self.distinct_overflow:
+            return f">{table_max_distinct:,}"
+        return f"{len(self.distinct):,}"
+
+
+class RecordTable:
+    """A list of records displayed as a table, with a column per field. Only the values of the
+    rows displayed are looked up when the table is drawn. The summaries of the columns are
+    computed in a single background pass over the records
+    """
+
+    def __init__(self, items: Sequence, fields: List[str]):
+        self.items = items
+        self.fields = fields
+        self.summaries: Dict[str, ColumnSummary] = {
+            field: ColumnSummary() for field in fields
+        }
+        self.task = BackgroundTask(self.summarize, name="table-summary").start()
+
+    def summarize(self, task: BackgroundTask):
+        task.total = len(self.items)
+        summaries = [(field, self.summaries[field]) for field in self.fields]
+        for index, record in enumerate(self.items):
+            if index % 1000 == 0:
+                if task.cancelled.is_set():
+                    return
+                task.progress = index
+            for field, summary in summaries:
+                summary.add(get_field(record, field))
+        task.progress = len(self.items)
+
+    def close(self):
+        self.task.cancel()
+
+    def get_lines(self, records: List[Any], selected: Optional[int]) -> List[Text]:
+        """Return the header, the rows of the given records, and the summary of every column.
+        The values of each column are looked up once for the records displayed
+        """
+        columns = [
+            [format_cell(get_field(record, field)) for record in records]
+            for field in self.fields
+        ]
+        summaries = [self.summaries[field] for field in self.fields]
+        footer = [
+            [f"{s.distinct_text} distinct" for s in summaries],
+            [f"{s.nulls:,} null" for s in summaries],
+            [f"{s.min}…{s.max}" if s.min is not None else "" for s in summaries],
+        ]
+        widths = [
+            min(max(len(cell) for cell in [field, *cells, *summary]), 24)
+            for field, cells, summary in zip(self.fields, columns, zip(*footer))
+        ]
+
+        def line(cells: List[str], style: Style = Style()) -> Text:
+            text = Text(" ", style=style)
+            for cell, width in zip(cells, widths):
+                if len(cell) > width:
+                    cell = cell[: width - 1] + "…"
+                text.append(cell.ljust(width) + "  ")
+            text.overflow = "ellipsis"
+            return text
+
+        lines = [line(self.fields, Style(color="cyan", bold=True))]
+        for row, cells in enumerate(zip(*columns)):
+            lines.append(
+                line(list(cells), Style(reverse=True) if row == selected else Style())
+            )
+
+        dim = Style(dim=True)
+        lines.extend(line(cells, dim) for cells in footer)
+        if self.task.running and self.task.total:
+            lines[-3].append(f"{self.task.progress / self.task.total:.0%}", dim)
+        return lines
+
+
+def format_cell(value: Any) -> str:
+    if value is MISSING:
+        return ""
+    return repr(value).split("\n")[0]
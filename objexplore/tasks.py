@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Callable, Optional, Set
+
+# Seconds between redraws while there is work running in the background
+REFRESH_INTERVAL = 0.1
+
+active_tasks: Set["BackgroundTask"] = set()
+
+
+class BackgroundTask:
+    """Run a function in a daemon thread so long running introspection does not block the UI
+
+    The target function is given the task itself so it can update `progress` and check
+    `cancelled` between chunks of work
+    """
+
+    def __init__(self, target: Callable[["BackgroundTask"], Any], name: str = ""):
+        self.target = target
+        self.name = name
+        self.cancelled = threading.Event()
+        self.progress = 0
+        self.total: Optional[int] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        try:
+            self.result = self.target(self)
+        except Exception as err:
+            self.error = err
+        finally:
+            self.done = True
+            active_tasks.discard(self)
+
+    def start(self) -> "BackgroundTask":
+        active_tasks.add(self)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def running(self) -> bool:
+        return not self.done
+
+    def join(self, timeout: Optional[float] = None):
+        self.thread.join(timeout)
+
+
+def any_running() -> bool:
+    """ True if there is any background work whose progress should be redrawn """
+    return bool(active_tasks)
@@ -0,0 +1,162 @@
+import os
+import sys
+import threading
+from types import FrameType
+from typing import List, Optional, Tuple
+
+from rich.style import Style
+from rich.text import Text
+
+from .cached_object import (
+    CachedObject,
+    DotPath,
+    FilteredDictKey,
+    LazyRows,
+    highlighter,
+)
+from .referrers import PACKAGE_DIR
+
+
+class ThreadStack:
+    """ The frames a thread was running when the threads were snapshotted, innermost frame first """
+
+    def __init__(
+        self, ident: int, thread: Optional[threading.Thread], frames: List[FrameType]
+    ):
+        self.ident = ident
+        self.thread = thread
+        self.frames = frames
+
+    @property
+    def name(self) -> str:
+        # Threads started with `_thread.start_new_thread()` have no `threading.Thread`
+        return self.thread.name if self.thread else f"thread {self.ident}"
+
+    @property
+    def daemon(self) -> bool:
+        return bool(self.thread and self.thread.daemon)
+
+    def __repr__(self) -> str:
+        daemon = " daemon" if self.daemon else ""
+        return f"<{self.name}{daemon} thread, {len(self.frames)} frames>"
+
+
+class ThreadsSnapshot:
+    """The stack of every thread at one point in time. The frames stay referenced, along with their
+    locals, until `close()`
+    """
+
+    def __init__(self, stacks: List[ThreadStack]):
+        self.stacks = stacks
+
+    def close(self):
+        self.stacks = []
+
+    def __repr__(self) -> str:
+        return f"<{len(self.stacks)} threads>"
+
+
+def snapshot_threads() -> ThreadsSnapshot:
+    """Take the stack of every running thread. Only the current frame of each thread is looked up,
+    the rest of the stack is reached through `f_back`, so the other threads are never waited for
+    """
+    frames = sys._current_frames()
+    threads = {thread.ident: thread for thread in threading.enumerate()}
+    current = threading.get_ident()
+
+    stacks: List[ThreadStack] = []
+    for ident, frame in frames.items():
+        stack = []
+        while frame is not None:
+            stack.append(frame)
+            frame = frame.f_back  # type: ignore
+        if ident == current:
+            # Leave out objexplore's own frames, from the call to `explore_threads()` inward
+            while stack and stack[0].f_code.co_filename.startswith(PACKAGE_DIR):
+                stack.pop(0)
+        stacks.append(ThreadStack(ident, threads.get(ident), stack))
+
+    # Same order as `threading.enumerate()`, with threads unknown to `threading` last
+    order = {ident: position for position, ident in enumerate(threads)}
+    stacks.sort(key=lambda stack: order.get(stack.ident, len(order)))
+    return ThreadsSnapshot(stacks)
+
+
+def frame_text(frame: FrameType) -> Text:
+    """ The function and line a frame is running, such as `run() server.py:42` """
+    code = frame.f_code
+    return Text.assemble(
+        (f"{code.co_name}()", Style(color="cyan", italic=True)),
+        (f" {os.path.basename(code.co_filename)}:{frame.f_lineno}", Style(dim=True)),
+    )
+
+
+class StackCachedObject(CachedObject):
+    """The explorer listing of a thread's stack. Each frame is explored as a regular object, so
+    its locals are only cached once the frame itself is explored
+    """
+
+    def __init__(self, stack: ThreadStack, parent_path: DotPath, key: str):
+        super().__init__(stack, parent_path=parent_path, index=key)
+        self.stack = stack
+        self.container = "list"
+        self.length = len(stack.frames)
+
+    def cache(self):
+        if self.is_cached:
+            self.filter()
+            return
+
+        self.list_rows = LazyRows(len(self.stack.frames), self.frame_row)
+        self.num_public_attributes = self.num_private_attributes = 0
+        self.is_cached = True
+        self.filter()
+
+    def frame_row(self, index: int) -> Tuple[Text, CachedObject]:
+        frame = self.stack.frames[index]
+        line = (
+            Text(" [", style=Style(color="white"))
+            + Text(str(index), style=Style(color="blue"))
+            + Text("] ", style=Style(color="white"))
+            + frame_text(frame)
+        )
+        line.overflow = "ellipsis"
+        return line, CachedObject(frame, parent_path=self.dotpath, index=index)
+
+
+class ThreadsCachedObject(CachedObject):
+    """ The explorer listing of a `ThreadsSnapshot`: the stack of each thread, by thread name """
+
+    def __init__(self, snapshot: ThreadsSnapshot, attr_name: str = "threads"):
+        super().__init__(snapshot, attr_name=attr_name)
+        self.snapshot = snapshot
+        self.container = "dict"
+        self.typeof = highlighter(repr(snapshot))
+
+        for stack in snapshot.stacks:
+            key = stack.name
+            if key in self.dict_rows:
+                # Thread names are not unique
+                key = f"{key} ({stack.ident})"
+            line = (
+                Text(" ")
+                + Text(key, style=Style(color="magenta"))
+                + Text(": ")
+                + Text(f"{len(stack.frames)} frames", style=Style(color="cyan"))
+            )
+            if stack.daemon:
+                line += Text(" daemon", style=Style(dim=True))
+            if stack.frames:
+                line += Text(" in ") + frame_text(stack.frames[0])
+            line.overflow = "ellipsis"
+            self.dict_rows[key] = FilteredDictKey(
+                text=line,
+                cached_object=StackCachedObject(stack, self.dotpath, key),
+            )
+        self.length = len(self.dict_rows)
+
+    def cache(self):
+        if not self.is_cached:
+            self.num_public_attributes = self.num_private_attributes = 0
+            self.is_cached = True
+        self.filter()
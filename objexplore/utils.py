@@ -1,3 +1,7 @@
+from collections import OrderedDict
+from typing import Any, List
+
+
 def is_empty(obj):
     """ Check to see if the object is equal to any of the following objects """
     return not any(obj is x for x in [None, [], (), {}, set()])
@@ -6,3 +10,68 @@ def is_empty(obj):
     # except Exception:
     #     # TODO this might not be needed anymore
     #     return True
+
+
+def format_bytes(num_bytes: int) -> str:
+    """ Format a number of bytes for display, e.g. 1536 -> '1.5KB' """
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+class CacheEntry:
+    """ An object and the value cached for it. Its own type so it is never listed as a referrer """
+
+    __slots__ = ("obj", "value")
+
+    def __init__(self, obj: Any, value: Any):
+        self.obj = obj
+        self.value = value
+
+
+class ObjectCache:
+    """Values computed for objects, cached per object identity. Entries keep their object alive so
+    its id cannot be reused while it is cached, so only the `max_size` most recently used objects
+    are kept and the rest are released
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+
+    def get(self, obj: Any) -> Any:
+        """ Return the value cached for the object, None if there is none """
+        entry = self.entries.get(id(obj))
+        if entry is None or entry.obj is not obj:
+            return None
+        self.entries.move_to_end(id(obj))
+        return entry.value
+
+    def peek(self, obj: Any) -> Any:
+        """ Like `get()`, without marking the object as used. Safe to call from a background task """
+        entry = self.entries.get(id(obj))
+        if entry is None or entry.obj is not obj:
+            return None
+        return entry.value
+
+    def put(self, obj: Any, value: Any) -> List[Any]:
+        """ Cache a value for the object, return the values evicted to make room for it """
+        evicted = []
+        replaced = self.entries.get(id(obj))
+        if replaced is not None:
+            # An object that was released and whose id was reused since
+            evicted.append(replaced.value)
+        self.entries[id(obj)] = CacheEntry(obj, value)
+        self.entries.move_to_end(id(obj))
+        while len(self.entries) > self.max_size:
+            evicted.append(self.entries.popitem(last=False)[1].value)
+        return evicted
+
+    def values(self) -> List[Any]:
+        return [entry.value for entry in self.entries.values()]
+
+    def __len__(self) -> int:
+        return len(self.entries)
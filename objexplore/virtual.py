@@ -0,0 +1,277 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from rich.pretty import Pretty
+from rich.text import Text
+
+from .cached_object import (
+    CachedObject,
+    FilteredDictKey,
+    LazyRows,
+    SortMode,
+    attribute_text,
+    DotPath,
+    build_dotpath,
+    console,
+    dict_row_text,
+    highlighter,
+    list_row_text,
+)
+from .perf import stats
+from .tasks import BackgroundTask
+
+# reprs of the objects that `is_empty()` strikes through in the explorer
+EMPTY_REPRS = ("None", "[]", "()", "{}", "set()")
+
+
+class NodeInfo(NamedTuple):
+    """ Everything the explorer needs to know about an object that is not a live Python object """
+
+    id: Any
+    type: str
+    repr: str
+    length: Optional[int]
+    size: int
+    container: Optional[str]
+    is_callable: bool
+
+
+class ChildInfo(NamedTuple):
+    """ An edge from a node to one of its children """
+
+    kind: str  # "attr" or "index"
+    name: str
+    key_type: str  # type of the key/index, the name of a non-str key is its repr
+    node: NodeInfo
+
+
+class ObjectModel:
+    """Base class for the sources of objects that are explored without having the live objects,
+    such as snapshots on disk or objects in another process
+    """
+
+    name = "obj"
+
+    # Number of items of a list/tuple/set fetched at once, see `window()`
+    page_size = 500
+
+    def root(self) -> NodeInfo:
+        raise NotImplementedError
+
+    def children(self, node_id: Any) -> List[ChildInfo]:
+        raise NotImplementedError
+
+    def window(
+        self, node_id: Any, offset: int, limit: int
+    ) -> Tuple[int, List[ChildInfo]]:
+        """ Return the total number of children of a node and up to `limit` of them starting at `offset` """
+        children = self.children(node_id)
+        return len(children), children[offset : offset + limit]
+
+    def prefetch(self, node_id: Any, offset: int, limit: int):
+        """ Hint that `window()` is likely to be called with these arguments soon """
+
+    def docstring(self, node_id: Any) -> str:
+        return ""
+
+    def source(self, node_id: Any) -> str:
+        return ""
+
+
+class VirtualObject:
+    """ Stand-in for an object that only exists in an object model """
+
+    def __init__(self, node: NodeInfo):
+        self.node = node
+
+    def __repr__(self) -> str:
+        return self.node.repr
+
+
+class VirtualCallable(VirtualObject):
+    """ Stand-in for a callable object, so the explorer offers its source code """
+
+    def __call__(self, *args, **kwargs):
+        raise TypeError(f"{self.node.repr} is not a live object and cannot be called")
+
+
+class RawKey(str):
+    """ The repr of a non-str dict key, displayed without quotes """
+
+
+def node_kind(node: NodeInfo) -> str:
+    """ The kind of attribute used to style the node in the explorer, see `attribute_text()` """
+    if node.type == "<class 'module'>":
+        return "module"
+    elif node.type == "<class 'type'>":
+        return "class"
+    elif node.is_callable:
+        return "function"
+    elif node.container and node.type == f"<class '{node.container}'>":
+        return node.container
+    return ""
+
+
+class VirtualCachedObject(CachedObject):
+    """A `CachedObject` backed by an `ObjectModel` instead of a live Python object. Children are
+    only fetched from the model when the object is explored
+    """
+
+    def __init__(
+        self,
+        model: ObjectModel,
+        node: NodeInfo,
+        parent_path: Optional[DotPath] = None,
+        attr_name: Optional[str] = None,
+        index: Any = None,
+        hidden: bool = False,
+    ):
+        stats.num_alive += 1
+        self.model = model
+        self.node = node
+        self.obj = VirtualCallable(node) if node.is_callable else VirtualObject(node)
+        self.is_callable = node.is_callable
+        self.attr_name = attr_name if attr_name else node.repr
+        self.dotpath = build_dotpath(parent_path, attr_name, index)
+
+        self.plain_public_attributes: List[str] = []
+        self.plain_private_attributes: List[str] = []
+        self.public_attributes: Dict[str, CachedObject] = {}
+        self.private_attributes: Dict[str, CachedObject] = {}
+        self.filtered_public_attributes: Dict[str, CachedObject] = {}
+        self.filtered_private_attributes: Dict[str, CachedObject] = {}
+        self.dict_rows: Dict[Any, FilteredDictKey] = {}
+        self.list_rows: Sequence[Tuple[Text, CachedObject]] = []
+        # Pages of the items of a list/tuple/set fetched so far, see `list_row()`
+        self.pages: Dict[int, List[ChildInfo]] = {}
+        self.sort_mode = SortMode.default
+        # The snapshot or remote session gives the size, nothing is computed in the background
+        self.sort_keys: Dict[str, Any] = {SortMode.deep_size: -node.size}
+        self.sort_task: Optional[BackgroundTask] = None
+        self.positions: Optional[Dict[Any, int]] = None
+
+        self.length = node.length
+        kind = node_kind(node)
+        self.isbuiltin = False
+        self.isclass = kind == "class"
+        self.isfunction = kind == "function"
+        self.ismethod = False
+        self.ismethoddescriptor = False
+        self.ismodule = kind == "module"
+        self.container = node.container
+
+        self.filters = []
+        self.search_filter = ""
+        self.is_cached = False
+
+        self.typeof = highlighter(node.type)
+        self.repr = highlighter(node.repr.split("\n")[0])
+        self.repr.overflow = "ellipsis"
+        self.pretty = Pretty(self.obj)
+        self.text = attribute_text(
+            self.attr_name, kind=kind, empty=node.repr in EMPTY_REPRS, hidden=hidden
+        )
+        self._docstring: Optional[Text] = None
+        self._fetched_source: Optional[str] = None
+
+    @property
+    def docstring(self) -> Text:  # type: ignore
+        if self._docstring is None:
+            self._docstring = console.render_str(
+                self.model.docstring(self.node.id) or "None"
+            )
+        return self._docstring
+
+    @property
+    def docstring_lines(self) -> List[Text]:  # type: ignore
+        return list(self.docstring.split())
+
+    @property
+    def _source(self) -> str:  # type: ignore
+        if self._fetched_source is None:
+            self._fetched_source = (
+                self.model.source(self.node.id) if self.is_callable else ""
+            )
+        return self._fetched_source
+
+    def cache(self):
+        """ Fetch the children of this object from the model """
+        if self.is_cached:
+            stats.cache_hits += 1
+            self.filter()
+            return
+        stats.cache_misses += 1
+
+        if self.container in ("list", "tuple", "set"):
+            # Items are only fetched a page at a time, when they are displayed
+            total, self.pages[0] = self.model.window(
+                self.node.id, 0, self.model.page_size
+            )
+            self.list_rows = LazyRows(total, self.list_row)
+        else:
+            for child in self.model.children(self.node.id):
+                self.add_child(child)
+
+        self.plain_public_attributes = list(self.public_attributes)
+        self.plain_private_attributes = list(self.private_attributes)
+        self.num_public_attributes = len(self.public_attributes)
+        self.num_private_attributes = len(self.private_attributes)
+        self.is_cached = True
+
+        self.filter()
+
+    def add_child(self, child: ChildInfo):
+        """ Add an attribute or a dict key fetched from the model """
+        if child.kind == "attr":
+            cached_child = VirtualCachedObject(
+                self.model,
+                child.node,
+                parent_path=self.dotpath,
+                attr_name=child.name,
+            )
+            if child.name.startswith("_"):
+                self.private_attributes[child.name] = cached_child
+            else:
+                self.public_attributes[child.name] = cached_child
+        else:
+            key = child.name if child.key_type == "str" else RawKey(child.name)
+            self.dict_rows[key] = FilteredDictKey(
+                text=dict_row_text(
+                    key,
+                    typeof=child.node.type,
+                    empty=child.node.repr in EMPTY_REPRS,
+                ),
+                cached_object=VirtualCachedObject(
+                    self.model, child.node, parent_path=self.dotpath, index=key
+                ),
+            )
+
+    def list_row(self, index: int) -> Tuple[Text, CachedObject]:
+        """ Build the row of an item of a list/tuple/set, fetching the page it is on if needed """
+        page_size = self.model.page_size
+        page, position = divmod(index, page_size)
+        if page not in self.pages:
+            self.pages[page] = self.model.window(
+                self.node.id, page * page_size, page_size
+            )[1]
+            # The next page is likely to be scrolled to, ask for it before it is needed
+            if (page + 1) * page_size < len(self.list_rows):
+                self.model.prefetch(self.node.id, (page + 1) * page_size, page_size)
+
+        child = self.pages[page][position]
+        return (
+            list_row_text(
+                index,
+                typeof=child.node.type,
+                empty=child.node.repr in EMPTY_REPRS,
+            ),
+            VirtualCachedObject(
+                self.model, child.node, parent_path=self.dotpath, index=index
+            ),
+        )
+
+    def sort_key(self, sort_mode: str, name: str) -> Any:
+        if sort_mode == SortMode.type:
+            return self.node.type
+        elif sort_mode in (SortMode.size, SortMode.deep_size):
+            return -self.node.size
+        return super().sort_key(sort_mode, name)
@@ -0,0 +1,250 @@
+import ast
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .cached_object import DotPath, attribute_names, iter_items, safegetattr
+from .sizeof import shallow_sizeof
+
+# Objects of these types are always leaves, they are never descended into
+ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)
+
+ATTR = "attr"
+INDEX = "index"
+
+BFS = "bfs"
+DFS = "dfs"
+
+
+class Step(NamedTuple):
+    """ A single step from an object to one of its children: an attribute name or a key/index """
+
+    kind: str
+    name: Any
+
+    def __str__(self) -> str:
+        if self.kind == ATTR:
+            return f".{self.name}"
+        elif type(self.name) == str:
+            return f'["{self.name}"]'
+        else:
+            return f"[{self.name}]"
+
+
+Steps = Tuple[Step, ...]
+
+
+def format_path(name: str, steps: Steps) -> str:
+    """ Format the steps from the root object as a dotpath, the same way the explorer does """
+    return name + "".join(str(step) for step in steps)
+
+
+def extend_dotpath(dotpath: DotPath, steps: Steps) -> DotPath:
+    """ The dotpath of the object reached by taking the steps from the object at `dotpath` """
+    for step in steps:
+        if step.kind == ATTR:
+            dotpath = DotPath(dotpath, attr_name=step.name)
+        else:
+            dotpath = DotPath(dotpath, index=step.name)
+    return dotpath
+
+
+@lru_cache(maxsize=256)
+def parse_path(path: str) -> Tuple[Optional[str], Steps]:
+    """Parse a dotpath such as `obj.a.b[3]["k"].c`, the inverse of `format_path()`. Return the name
+    the path starts from and the steps from there, the name is None for paths starting with `.` or
+    `[`. Keys and indexes must be Python literals
+    """
+    path = path.strip()
+    relative = path.startswith((".", "["))
+    node = ast.parse(f"_{path}" if relative else path, mode="eval").body
+    steps = []
+    while not isinstance(node, ast.Name):
+        if isinstance(node, ast.Attribute):
+            steps.append(Step(ATTR, node.attr))
+        elif isinstance(node, ast.Subscript):
+            key = node.slice
+            if isinstance(key, getattr(ast, "Index", ())):
+                # Python < 3.9 wraps subscripts
+                key = key.value  # type: ignore
+            steps.append(Step(INDEX, ast.literal_eval(key)))
+        else:
+            raise ValueError(f"Not a path: {path}")
+        node = node.value
+    return (None if relative else node.id), tuple(reversed(steps))
+
+
+class WalkRecord(NamedTuple):
+    """ Lightweight summary of an object visited by `walk()` """
+
+    dotpath: str
+    depth: int
+    type: type
+    length: Optional[int]
+    size: int
+
+
+def iter_children(
+    obj: Any, private: bool = False, callables: bool = False
+) -> Iterator[Tuple[Step, Any]]:
+    """Yield (step, child) for every child of the object as enumerated by the explorer: the keys of
+    a dict, the items of a list/tuple/set and the attributes of any other object
+    """
+    if type(obj) == dict or isinstance(obj, (list, tuple, set)):
+        for key, value in iter_items(obj):
+            yield Step(INDEX, key), value
+        return
+
+    if isinstance(obj, ATOMIC_TYPES):
+        return
+
+    public_attributes, private_attributes = attribute_names(obj)
+    for attr in public_attributes + (private_attributes if private else []):
+        value = safegetattr(obj, attr)
+        if not callables and callable(value):
+            continue
+        yield Step(ATTR, attr), value
+
+
+def walk_nodes(
+    obj: Any,
+    order: str = BFS,
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    private: bool = False,
+    callables: bool = False,
+    unique: bool = True,
+) -> Iterator[Tuple[Steps, Any]]:
+    """Yield (steps, obj) for every object reachable from `obj`, starting with `obj` itself
+
+    Every object is visited at most once so cycles are not followed. With `unique=False` a
+    depth-first walk only tracks the objects on the current path, which keeps memory
+    proportional to the depth of the walk, but an object reachable through several paths is
+    visited once per path. Breadth-first walks always remember every object visited
+    """
+    if order not in (BFS, DFS):
+        raise ValueError(f"Unknown walk order {order!r}, expected {BFS!r} or {DFS!r}")
+
+    walk_children = (
+        _walk_breadth_first(obj, max_depth, private, callables)
+        if order == BFS
+        else _walk_depth_first(obj, max_depth, private, callables, unique)
+    )
+    for num_nodes, node in enumerate(walk_children, start=1):
+        yield node
+        if max_nodes is not None and num_nodes >= max_nodes:
+            return
+
+
+def _walk_breadth_first(
+    obj: Any, max_depth: Optional[int], private: bool, callables: bool
+) -> Iterator[Tuple[Steps, Any]]:
+    queue: Deque[Tuple[Steps, Any]] = deque([((), obj)])
+    seen: Set[int] = {id(obj)}
+    while queue:
+        steps, node = queue.popleft()
+        yield steps, node
+
+        if max_depth is not None and len(steps) >= max_depth:
+            continue
+        for step, child in iter_children(node, private=private, callables=callables):
+            if not isinstance(child, ATOMIC_TYPES):
+                if id(child) in seen:
+                    continue
+                seen.add(id(child))
+            queue.append((steps + (step,), child))
+
+
+def _walk_depth_first(
+    obj: Any,
+    max_depth: Optional[int],
+    private: bool,
+    callables: bool,
+    unique: bool,
+) -> Iterator[Tuple[Steps, Any]]:
+    yield (), obj
+
+    on_path: Set[int] = {id(obj)}
+    seen: Optional[Set[int]] = {id(obj)} if unique else None
+    stack: List[Tuple[Steps, Any, Iterator[Tuple[Step, Any]]]] = [
+        ((), obj, iter_children(obj, private=private, callables=callables))
+    ]
+    while stack:
+        steps, node, children = stack[-1]
+        for step, child in children:
+            child_steps = steps + (step,)
+            atomic = isinstance(child, ATOMIC_TYPES)
+            if not atomic and (
+                id(child) in on_path or (seen is not None and id(child) in seen)
+            ):
+                continue
+
+            yield child_steps, child
+
+            if not atomic and (max_depth is None or len(child_steps) < max_depth):
+                on_path.add(id(child))
+                if seen is not None:
+                    seen.add(id(child))
+                stack.append(
+                    (
+                        child_steps,
+                        child,
+                        iter_children(child, private=private, callables=callables),
+                    )
+                )
+            break
+        else:
+            stack.pop()
+            on_path.discard(id(node))
+
+
+def walk(
+    obj: Any,
+    name: str = "obj",
+    order: str = BFS,
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    types: Optional[Tuple[type, ...]] = None,
+    private: bool = False,
+    callables: bool = False,
+    unique: bool = True,
+) -> Iterator[WalkRecord]:
+    """
+    Walk the object graph starting at `obj` without opening the explorer, yielding a `WalkRecord`
+    for every object visited
+
+    >>> for record in objexplore.walk(config, name="config", max_depth=3):
+    ...     print(record.dotpath, record.type.__name__, record.size)
+
+    :param name: The name used for the root of every dotpath
+    :param order: "bfs" for breadth-first or "dfs" for depth-first
+    :param max_depth: Do not descend further than this many steps from the root
+    :param max_nodes: Stop after visiting this many objects
+    :param types: Only yield records for objects that are instances of these types.
+        Every object is still walked through
+    :param private: Also descend into private attributes
+    :param callables: Also descend into callable attributes such as methods
+    :param unique: See `walk_nodes()`
+    """
+    for steps, node in walk_nodes(
+        obj,
+        order=order,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+        private=private,
+        callables=callables,
+        unique=unique,
+    ):
+        if types is not None and not isinstance(node, types):
+            continue
+        try:
+            length: Optional[int] = len(node)
+        except Exception:
+            length = None
+        yield WalkRecord(
+            dotpath=format_path(name, steps),
+            depth=len(steps),
+            type=type(node),
+            length=length,
+            size=shallow_sizeof(node),
+        )
@@ -0,0 +1,322 @@
+import time
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .cached_object import (
+    CachedObject,
+    LazyRows,
+    SortMode,
+    attribute_names,
+    iter_items,
+    safegetattr,
+)
+from .config import (
+    watch_hash_items,
+    watch_highlight_seconds,
+    watch_interval,
+    watch_slice_size,
+)
+
+Fingerprint = Tuple[int, Optional[int], int]
+
+# Changes to these are always seen through their id, they are never hashed
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+def fingerprint(obj: Any, max_items: int = watch_hash_items) -> Fingerprint:
+    """Return the id and length of an object and a hash of the ids of its first `max_items`
+    items or attribute values, so any rebinding, resizing or replaced item is noticed without
+    going through the whole object
+    """
+    try:
+        length: Optional[int] = len(obj)
+    except Exception:
+        length = None
+    if isinstance(obj, IMMUTABLE_TYPES):
+        return id(obj), length, 0
+    if callable(obj) and hasattr(obj, "__self__"):
+        # Bound methods are created anew every time they are looked up
+        return id(obj.__self__), length, hash(getattr(obj, "__name__", None))
+
+    try:
+        if type(obj) == dict:
+            values = islice(obj.values(), max_items)
+        elif isinstance(obj, (list, tuple, set)):
+            values = islice(obj, max_items)
+        else:
+            namespace = getattr(obj, "__dict__", None)
+            values = islice(
+                namespace.values() if type(namespace) == dict else (), max_items
+            )
+        digest = hash(tuple(map(id, values)))
+    except Exception:
+        # Such as a dict resized by another thread while it is being read
+        digest = -1
+    return id(obj), length, digest
+
+
+def items_between(obj: Any, start: int, stop: int) -> List[Tuple[int, Any]]:
+    """ The (index, item) of the items of a list/tuple from `start` to `stop` """
+    return list(enumerate(obj[start:stop], start))
+
+
+class Watch:
+    """Re-poll the children of the object being explored every `interval` seconds, rebuilding only
+    the rows of the children that changed. Children are compared by their `fingerprint()`, and
+    the changed rows are highlighted for `highlight_seconds`
+
+    The keys/items of a dict/list/tuple/set are not all polled every time: the rows in view are,
+    along with the next `slice_size` of the rest, so every child is polled once in a while. Keys
+    added or removed and items appended or removed are noticed on every poll. Dicts and sets can
+    only be read in order, the iterator of the slices is kept from one poll to the next and only
+    started over once it reaches the end or the container is resized
+
+    Attributes are looked up again on every poll, so properties that build a new value each time
+    are always seen as changed. Only live objects are watched, the rows of a `CachedObject`
+    subclass are built from whatever it stands in for and are left alone
+    """
+
+    def __init__(
+        self,
+        interval: float = watch_interval,
+        highlight_seconds: float = watch_highlight_seconds,
+        slice_size: int = watch_slice_size,
+    ):
+        self.interval = interval
+        self.highlight_seconds = highlight_seconds
+        self.slice_size = slice_size
+        self.cached_obj: Optional[CachedObject] = None
+        self.fingerprints: Dict[Hashable, Fingerprint] = {}
+        self.changed: Dict[CachedObject, float] = {}
+        # Position in the container of the next slice of children polled
+        self.cursor = 0
+        # The keys/items of a dict/set from `cursor` on, and the length it had when it was started
+        self.items: Optional[Iterator[Tuple[Any, Any]]] = None
+        self.items_length = 0
+        self.next_poll = 0.0
+        self.num_polls = 0
+
+    @staticmethod
+    def can_watch(cached_obj: CachedObject) -> bool:
+        return type(cached_obj) is CachedObject
+
+    def poll(self, cached_obj: CachedObject, visible: Iterable[Hashable] = ()):
+        """Bring the rows of the object up to date if it is time to poll it again. `visible` are the
+        keys or indexes of the rows in view, they are polled every time
+        """
+        if not self.can_watch(cached_obj):
+            return
+        now = time.monotonic()
+        if cached_obj is not self.cached_obj:
+            # Start over from the children as they are now when another object is explored
+            self.cached_obj = cached_obj
+            self.fingerprints = {}
+            if not cached_obj.container:
+                self.fingerprints = {
+                    key: fingerprint(value)
+                    for key, value in self.attributes(cached_obj)
+                }
+            self.changed = {}
+            self.cursor = 0
+            self.items = None
+            self.next_poll = now + self.interval
+            return
+        if now < self.next_poll:
+            return
+        self.next_poll = now + self.interval
+        self.num_polls += 1
+
+        self.changed = {
+            child: when
+            for child, when in self.changed.items()
+            if now - when < self.highlight_seconds
+        }
+        obj = cached_obj.obj
+        num_changed = len(self.changed)
+        try:
+            if type(obj) == dict:
+                resized = self.poll_dict(cached_obj, list(visible), now)
+            elif isinstance(obj, (list, tuple, set)):
+                resized = self.poll_items(cached_obj, list(visible), now)
+            else:
+                self.poll_attributes(cached_obj, now)
+                return
+        except RuntimeError:
+            # Resized by another thread while it was read, it is read again on the next poll
+            self.items = None
+            return
+        if resized or (
+            len(self.changed) > num_changed
+            and (cached_obj.filters or cached_obj.sort_mode != SortMode.default)
+        ):
+            # Rows changed in place are already listed, unless the listing depends on their values
+            cached_obj.filter()
+
+    def next_slice(self, length: int) -> Tuple[int, int]:
+        """ The positions of the next slice of children polled """
+        start = self.cursor if self.cursor < length else 0
+        stop = min(start + self.slice_size, length)
+        self.cursor = stop
+        return start, stop
+
+    def next_items(self, obj: Any) -> List[Tuple[Any, Any]]:
+        """ The (key, value) of the next slice of keys of a dict, or the (index, item) of a set """
+        length = len(obj)
+        if self.items is None or self.cursor >= length or self.items_length != length:
+            self.items = iter_items(obj)
+            self.items_length = length
+            self.cursor = 0
+        polled = list(islice(self.items, self.slice_size))
+        self.cursor += len(polled)
+        return polled
+
+    def is_stale(self, key: Hashable, value: Any, child: CachedObject) -> bool:
+        """ True if the value of a child changed since it was last polled, or since its row was built """
+        current = fingerprint(value)
+        previous = self.fingerprints.get(key)
+        self.fingerprints[key] = current
+        if previous is None:
+            # Not polled since the watch started, compare with the row as it was built
+            return child.obj is not value or child.length != current[1]
+        return previous != current
+
+    def poll_dict(
+        self, cached_obj: CachedObject, visible: List[Hashable], now: float
+    ) -> bool:
+        """ Poll the keys in view and the next slice of keys, return True if keys were added or removed """
+        obj = cached_obj.obj
+        rows = cached_obj.dict_rows
+        polled = self.next_items(obj)
+        polled += [(key, obj[key]) for key in visible if key in obj]
+
+        resized = (
+            len(obj) != len(rows)
+            or any(key not in rows for key, _ in polled)
+            or any(key not in obj for key in visible)
+        )
+        if resized:
+            for key in rows.keys() - obj.keys():
+                del rows[key]
+                self.fingerprints.pop(key, None)
+            for key in obj.keys() - rows.keys():
+                row = rows[key] = cached_obj.dict_row(key, obj[key])
+                self.changed[row.cached_object] = now
+            cached_obj.length = len(rows)
+
+        for key, value in polled:
+            if self.is_stale(key, value, rows[key].cached_object):
+                row = rows[key] = cached_obj.dict_row(key, value)
+                self.changed[row.cached_object] = now
+                if key in cached_obj.filtered_dict:
+                    cached_obj.filtered_dict[key] = row
+        return resized
+
+    def poll_items(
+        self, cached_obj: CachedObject, visible: List[Hashable], now: float
+    ) -> bool:
+        """ Poll the items in view and the next slice of items, return True if items were added or removed """
+        obj = cached_obj.obj
+        rows = cached_obj.list_rows
+        resized = len(obj) != len(rows)
+        if resized:
+            self.resize_items(cached_obj, list(obj))
+            rows = cached_obj.list_rows
+
+        built = rows.rows if isinstance(rows, LazyRows) else {}
+        indexes = [index for index in visible if type(index) is int]
+        if isinstance(obj, set):
+            polled = self.next_items(obj)
+            if any(
+                index in built and built[index][1].obj not in obj for index in indexes
+            ):
+                # An item in view was replaced by another one, without resizing the set
+                self.resize_items(cached_obj, list(obj))
+                self.items = None
+                return True
+            polled += [
+                (index, built[index][1].obj) for index in indexes if index in built
+            ]
+        else:
+            start, stop = self.next_slice(len(rows))
+            polled = items_between(obj, start, stop)
+            if indexes:
+                polled += items_between(obj, min(indexes), max(indexes) + 1)
+
+        for index, value in polled:
+            row = built.get(index)
+            if row is None:
+                # Built from the items as they are when it is displayed
+                self.fingerprints[index] = fingerprint(value)
+            elif self.is_stale(index, value, row[1]):
+                row = built[index] = cached_obj.item_row(index, value)
+                self.changed[row[1]] = now
+        return resized
+
+    @staticmethod
+    def resize_items(cached_obj: CachedObject, items: List[Any]):
+        """ List the items as they are now, the rows built already for items at the same index are kept """
+        old_rows = cached_obj.list_rows
+        rows = LazyRows(
+            len(items), lambda index: cached_obj.item_row(index, items[index])
+        )
+        if isinstance(old_rows, LazyRows):
+            rows.rows = {
+                index: row
+                for index, row in old_rows.rows.items()
+                if index < len(items) and row[1].obj is items[index]
+            }
+        cached_obj.list_rows = rows
+        cached_obj.length = len(items)
+
+    def poll_attributes(self, cached_obj: CachedObject, now: float):
+        children = self.attributes(cached_obj)
+        fingerprints: Dict[Hashable, Fingerprint] = {
+            key: fingerprint(value) for key, value in children
+        }
+        changed = [
+            (key, value)
+            for key, value in children
+            if self.fingerprints.get(key) != fingerprints[key]
+        ]
+        removed = self.fingerprints.keys() - fingerprints.keys()
+        self.fingerprints = fingerprints
+        if changed or removed:
+            self.update_attributes(cached_obj, changed, removed, now)
+            cached_obj.filter()
+
+    @staticmethod
+    def attributes(cached_obj: CachedObject) -> List[Tuple[str, Any]]:
+        """ The current (name, value) of every attribute of the object """
+        obj = cached_obj.obj
+        public, private = attribute_names(obj)
+        return [(attr, safegetattr(obj, attr)) for attr in public + private]
+
+    def update_attributes(
+        self,
+        cached_obj: CachedObject,
+        changed: List[Tuple[Any, Any]],
+        removed: Any,
+        now: float,
+    ):
+        for attr in removed:
+            cached_obj.public_attributes.pop(attr, None)
+            cached_obj.private_attributes.pop(attr, None)
+        for attr, value in changed:
+            attributes = (
+                cached_obj.private_attributes
+                if attr.startswith("_")
+                else cached_obj.public_attributes
+            )
+            child = attributes[attr] = CachedObject(
+                value, parent_path=cached_obj.dotpath, attr_name=attr
+            )
+            self.changed[child] = now
+        cached_obj.plain_public_attributes = list(cached_obj.public_attributes)
+        cached_obj.plain_private_attributes = list(cached_obj.private_attributes)
+        cached_obj.num_public_attributes = len(cached_obj.public_attributes)
+        cached_obj.num_private_attributes = len(cached_obj.private_attributes)
+
+    def is_changed(self, child: CachedObject) -> bool:
+        """ True if the child was rebuilt by a recent poll """
+        when = self.changed.get(child)
+        return when is not None and time.monotonic() - when < self.highlight_seconds
@@ -0,0 +1,15 @@
+import pytest
+
+from objexplore.introspection import introspection_cache
+
+
+@pytest.fixture(autouse=True, scope="session")
+def introspection_cache_path(tmp_path_factory):
+    """ Keep the introspection cache of the tests out of the home directory """
+    if introspection_cache.connection is not None:
+        introspection_cache.connection.close()
+    introspection_cache.__init__(
+        str(tmp_path_factory.mktemp("introspection") / "introspection.db")
+    )
+    yield
+    introspection_cache.save()
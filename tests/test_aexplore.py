@@ -0,0 +1,61 @@
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+
+import pytest
+
+pty = pytest.importorskip("pty")
+fcntl = pytest.importorskip("fcntl")
+termios = pytest.importorskip("termios")
+
+TARGET = """
+import asyncio, sys
+import objexplore
+
+async def main():
+    state = {"ticks": 0}
+
+    async def tick():
+        while True:
+            state["ticks"] += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    await objexplore.aexplore(state, name="state")
+    ticker.cancel()
+    with open(sys.argv[1], "w") as file:
+        file.write(str(state["ticks"]))
+
+asyncio.run(main())
+"""
+
+
+def test_aexplore_keeps_loop_running(tmp_path):
+    result = tmp_path / "ticks"
+    controller, terminal = pty.openpty()
+    fcntl.ioctl(terminal, termios.TIOCSWINSZ, struct.pack("HHHH", 30, 100, 0, 0))
+    process = subprocess.Popen(
+        [sys.executable, "-c", TARGET, str(result)],
+        stdin=terminal,
+        stdout=terminal,
+        stderr=terminal,
+        # The introspection cache is kept in the home directory
+        env={**os.environ, "TERM": "xterm-256color", "HOME": str(tmp_path)},
+    )
+    os.close(terminal)
+    try:
+        deadline = time.time() + 1
+        while time.time() < deadline:
+            # Keep the pty from filling up with the explorer's output
+            if select.select([controller], [], [], 0.1)[0]:
+                os.read(controller, 65536)
+        os.write(controller, b"q")
+        process.wait(timeout=10)
+    finally:
+        process.kill()
+        os.close(controller)
+    # The ticker kept running for the second the explorer was open
+    assert int(result.read_text()) > 20
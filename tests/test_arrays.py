@@ -0,0 +1,38 @@
+import numpy as np
+
+from objexplore.arrays import ArrayCachedObject, ArrayStats
+from objexplore.cached_object import CachedObject
+
+
+def test_array_rows_are_views():
+    array = np.arange(24, dtype=np.float64).reshape(4, 3, 2)
+    cached_obj = CachedObject(array, attr_name="array")
+    assert isinstance(cached_obj, ArrayCachedObject)
+    cached_obj.cache()
+    assert len(cached_obj.filtered_list) == 4
+    # Only the rows displayed are built
+    assert list(cached_obj.list_rows.rows) == []
+
+    _, row = cached_obj.filtered_list[2]
+    assert np.shares_memory(row.obj, array)
+    row.cache()
+    _, item = row.filtered_list[1]
+    assert item.obj.shape == (2,)
+    item.cache()
+    text, scalar = item.filtered_list[1]
+    assert scalar.obj == 15.0
+    assert scalar.dotpath.plain == "array[2][1][1]"
+
+
+def test_array_stats_in_chunks(tmp_path):
+    path = tmp_path / "data.bin"
+    array = np.memmap(path, dtype=np.float32, mode="w+", shape=(1000, 10))
+    array[:] = np.arange(10_000).reshape(1000, 10)
+    array[5, 5] = np.nan
+    stats = ArrayStats(array, chunk_bytes=4096).start()
+    stats.task.join()  # type: ignore
+    assert stats.nan_count == 1
+    assert stats.min == 0 and stats.max == 9999
+    expected = (np.arange(10_000).sum() - 55) / 9999
+    assert abs(stats.mean - expected) < 1e-6  # type: ignore
+    assert "memmap" in stats.text().plain
@@ -0,0 +1,49 @@
+from objexplore.census import (
+    CensusCachedObject,
+    CensusDiff,
+    HeapCensus,
+    take_census,
+    type_name,
+)
+
+
+class Leak:
+    pass
+
+
+def test_heap_census():
+    leaks = [Leak() for _ in range(3)]
+    census = HeapCensus().start()
+    census.task.join()  # type: ignore
+    assert census.counts[Leak] == 3
+    assert census.sizes[Leak] > 0
+
+    cached_obj = CensusCachedObject(census)
+    cached_obj.cache()
+    row = cached_obj.filtered_dict[type_name(Leak)].cached_object
+    row.cache()
+    assert len(row.filtered_list) == 3
+    assert {id(instance.obj) for _, instance in row.filtered_list} == {
+        id(leak) for leak in leaks
+    }
+
+    # Instances are released as soon as the census is displayed again
+    cached_obj.refresh()
+    assert row.instances == []
+    census.close()
+    assert census.counts == {}
+
+
+def test_heap_census_diff():
+    before = take_census()
+    leaks = [Leak() for _ in range(5)]
+    diff = CensusDiff(before).start()
+    diff.task.join()  # type: ignore
+    assert diff.new_counts[Leak] == 5
+    record = next(record for record in diff.totals() if record.cls is Leak)
+    assert record.count == 5 and record.new == 5
+
+    new_instances = diff.instances(Leak)
+    assert {id(leak) for leak in new_instances} == {id(leak) for leak in leaks}
+    # Only ids and type codes are recorded, never the objects
+    assert all(type(value) is int for value in before.ids[:10])
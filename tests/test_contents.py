@@ -0,0 +1,52 @@
+from objexplore.contents import Contents, ContentsCache, sample_items, sample_positions
+
+
+def test_sample_positions():
+    assert sample_positions(5, 10, "stratified") == [0, 1, 2, 3, 4]
+    assert sample_positions(100, 4, "stratified") == [0, 25, 50, 75]
+    positions = sample_positions(1000, 10, "random")
+    assert positions == sorted(set(positions)) and len(positions) == 10
+
+
+def test_sample_items():
+    assert sample_items(list(range(100)), 4, "stratified") == [0, 25, 50, 75]
+    assert sample_items(set(range(100)), 4, "stratified") == [0, 25, 50, 75]
+    data = {key: str(key) for key in range(100)}
+    assert sample_items(data, 4, "stratified") == ["0", "25", "50", "75"]
+
+
+def test_contents_exact():
+    data = [[0] * (index % 4) if index % 2 else str(index) for index in range(50_000)]
+    contents = Contents(data, size=100)
+    assert contents.sample.count == 100
+    # Every 500th item, all of them strings
+    assert contents.sample.types == {str: 100}
+
+    contents.start_exact()
+    assert contents.task is not None
+    contents.task.join()
+    assert contents.exact is not None
+    assert contents.exact.count == 50_000
+    assert contents.exact.lengths == {1: 12_500, 3: 12_500}
+    assert contents.exact.length_percentile(50) == 1
+    assert "exact" in contents.get_lines()[0].plain
+
+
+def test_contents_sampled_in_background():
+    contents = Contents(set(range(50_000)), size=100)
+    assert contents.sample_task is not None
+    contents.sample_task.join()
+    assert contents.sample.count == 100
+    assert contents.sample.types == {int: 100}
+    assert "sample of 100" in contents.get_lines()[0].plain
+
+
+def test_contents_cache_keeps_recent_containers():
+    cache = ContentsCache(max_size=2)
+    containers = [list(range(100)) for _ in range(3)]
+    first = cache.get(containers[0])
+    assert cache.get(containers[0]) is first
+    for container in containers[1:]:
+        cache.get(container)
+    assert len(cache.contents) == 2
+    assert cache.get(containers[0]) is not first
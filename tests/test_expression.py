@@ -0,0 +1,71 @@
+import numpy
+import pandas
+
+from objexplore.cached_object import CachedObject
+from objexplore.expression import ExpressionFilter
+
+
+class Job:
+    def __init__(self, status: str):
+        self.status = status
+
+
+def evaluate(obj, query: str) -> ExpressionFilter:
+    cached_obj = CachedObject(obj, attr_name="obj")
+    cached_obj.cache()
+    expression_filter = ExpressionFilter()
+    expression_filter.open(cached_obj)
+    expression_filter.query = query
+    expression_filter.start()
+    if expression_filter.task:
+        expression_filter.task.join()
+    return expression_filter
+
+
+def test_list_items():
+    expression_filter = evaluate(list(range(100_000)), "x % 25_000 == 1")
+    assert [result.steps[0].name for result in expression_filter.results] == [
+        1,
+        25_001,
+        50_001,
+        75_001,
+    ]
+    assert expression_filter.task.progress == 100_000
+
+
+def test_dict_values_and_errors():
+    jobs = {"a": Job("ok"), "b": Job("failed"), "c": None}
+    expression_filter = evaluate(jobs, "x.status == 'failed'")
+    assert [result.steps[0].name for result in expression_filter.results] == ["b"]
+    assert expression_filter.num_errors == 1
+
+
+def test_syntax_error():
+    expression_filter = evaluate([1], "x >")
+    assert expression_filter.task is None
+    assert "SyntaxError" in expression_filter.status()
+
+
+def test_vectorized():
+    array = numpy.arange(50_000)
+    expression_filter = evaluate(array, "x > 49_997")
+    assert expression_filter.vectorized
+    assert [result.steps[0].name for result in expression_filter.results] == [
+        49_998,
+        49_999,
+    ]
+
+    # Not element-wise, evaluated one row at a time instead
+    expression_filter = evaluate(array[:10], "int(x) == 3")
+    assert not expression_filter.vectorized
+    assert [result.steps[0].name for result in expression_filter.results] == [3]
+
+
+def test_series_labels():
+    series = pandas.Series([5, 50, 500], index=["a", "b", "c"])
+    expression_filter = evaluate(series, "x > 10")
+    assert [result.steps[0].name for result in expression_filter.results] == [1, 2]
+    assert [result.dotpath.plain for result in expression_filter.results] == [
+        'obj["b"]',
+        'obj["c"]',
+    ]
@@ -0,0 +1,86 @@
+from blessed import Terminal
+
+from objexplore.cached_object import CachedObject, SortMode
+from objexplore.explorer import Explorer, parse_key
+
+
+def explorer_of(obj) -> Explorer:
+    cached_obj = CachedObject(obj, attr_name="obj")
+    cached_obj.cache()
+    return Explorer(cached_obj, Terminal())
+
+
+def test_parse_key():
+    assert parse_key("42") == 42
+    assert parse_key("(1, 'a')") == (1, "a")
+    assert parse_key("'42'") == "42"
+    assert parse_key("user_1") == "user_1"
+
+
+def test_go_to_dict_key():
+    explorer = explorer_of({**{f"user_{i}": i for i in range(300)}, 7: "int"})
+    assert explorer.go_to("user_213")
+    assert explorer.dict_index == 213
+    assert explorer.go_to("7")
+    assert explorer.dict_index == 300
+    assert not explorer.go_to("user_-1")
+    assert not explorer.go_to("[1]")
+
+
+def test_go_to_str_key_typed_without_quotes():
+    explorer = explorer_of({"42": "a"})
+    assert explorer.go_to("42")
+    assert explorer.selected_object.obj == "a"
+
+
+def test_go_to_list_index():
+    explorer = explorer_of(list(range(1000)))
+    assert explorer.go_to("500")
+    assert explorer.list_index == 500
+    assert explorer.selected_object.obj == 500
+    assert explorer.go_to("-1")
+    assert explorer.selected_object.obj == 999
+    assert not explorer.go_to("1000")
+
+
+def test_go_to_sorted_list_index():
+    explorer = explorer_of([3, 1, 2])
+    explorer.cached_obj.set_sort(SortMode.name)
+    assert explorer.go_to("0")
+    assert explorer.selected_object.obj == 3
+
+
+class Node:
+    def __init__(self, child=None):
+        self.child = child
+        self.items = [{"k": child}]
+
+
+def test_explore_path():
+    leaf = Node()
+    explorer = explorer_of(Node(Node(leaf)))
+    assert explorer.explore_path('obj.child.items[0]["k"]')
+    assert explorer.cached_obj.obj is leaf
+    assert len(explorer.stack.stack) == 4
+    assert explorer.explore_path(".child")
+    assert explorer.cached_obj.obj is None
+    assert not explorer.explore_path("obj.missing")
+    assert not explorer.explore_path("obj.child[")
+    assert explorer.cached_obj.obj is None
+
+    # Going back to a path resolved before reuses its cached objects
+    assert explorer.explore_path("obj.child")
+    first = explorer.cached_obj
+    assert explorer.explore_path('obj.child.items[0]["k"]')
+    assert explorer.explore_path("obj.child")
+    assert explorer.cached_obj is first
+    assert len(explorer.stack.stack) == 1
+
+
+def test_explore_path_builds_only_the_rows_on_the_path():
+    explorer = explorer_of({"lst": list(range(100_000))})
+    assert explorer.explore_path('obj["lst"][99999]')
+    assert explorer.cached_obj.obj == 99_999
+    parent = explorer.stack.stack[-1]
+    assert parent.list_index == 99_999
+    assert len(parent.cached_obj.list_rows.rows) < 100
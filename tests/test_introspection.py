@@ -0,0 +1,92 @@
+import importlib
+import sys
+
+from objexplore import introspection
+from objexplore.introspection import IntrospectionCache
+
+MODULE = '''
+class Client:
+    """ Talks to the server """
+
+    def fetch(self, key):
+        return key
+
+
+def fetch_all(keys):
+    return keys
+
+
+# Like functions exported by numpy and pandas, defined in one module but named after the package
+fetch_all.__module__ = "sdk"
+'''
+
+
+def import_module(tmp_path, monkeypatch):
+    package = tmp_path / "sdk"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "client.py").write_text(MODULE)
+    (package / "_internal.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("sdk", None)
+    sys.modules.pop("sdk.client", None)
+    return importlib.import_module("sdk.client")
+
+
+def test_members_cached_across_sessions(tmp_path, monkeypatch):
+    module = import_module(tmp_path, monkeypatch)
+    path = str(tmp_path / "cache.db")
+
+    cache = IntrospectionCache(path)
+    assert cache.source(module.Client).startswith("class Client:")
+    assert cache.docstring(module.Client.fetch) is None
+    cache.save()
+
+    def introspect(obj, kind):
+        raise AssertionError("introspected again")
+
+    monkeypatch.setattr(introspection, "introspect", introspect)
+    cache = IntrospectionCache(path)
+    assert cache.source(module.Client.fetch).strip().startswith("def fetch")
+    assert cache.docstring(module.Client).strip() == "Talks to the server"
+
+
+def test_changed_file_introspected_again(tmp_path, monkeypatch):
+    module = import_module(tmp_path, monkeypatch)
+    path = str(tmp_path / "cache.db")
+
+    cache = IntrospectionCache(path)
+    cache.lookup(module.Client)
+    cache.save()
+
+    (tmp_path / "sdk" / "client.py").write_text(MODULE.replace("server", "new server"))
+    cache = IntrospectionCache(path)
+    assert cache.lookup(module.Client) is not None
+    assert [entry[0] for entry in cache.pending] == ["file", "member"]
+
+
+def test_package_submodules(tmp_path, monkeypatch):
+    import_module(tmp_path, monkeypatch)
+    path = str(tmp_path / "cache.db")
+    package = [str(tmp_path / "sdk")]
+
+    cache = IntrospectionCache(path)
+    submodules = list(cache.submodules(package, "sdk."))
+    assert submodules == [("sdk._internal", False), ("sdk.client", False)]
+    cache.save()
+
+    cache = IntrospectionCache(path)
+    assert list(cache.submodules(package, "sdk.")) == submodules
+    assert not cache.pending
+
+    (tmp_path / "sdk" / "server.py").write_text("")
+    cache = IntrospectionCache(path)
+    assert ("sdk.server", False) in list(cache.submodules(package, "sdk."))
+
+
+def test_member_of_reassigned_module(tmp_path, monkeypatch):
+    module = import_module(tmp_path, monkeypatch)
+    cache = IntrospectionCache(str(tmp_path / "cache.db"))
+    path, member = cache.lookup(module.fetch_all)
+    assert path == module.__file__
+    assert cache.source(module.fetch_all).startswith("def fetch_all")
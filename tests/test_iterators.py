@@ -0,0 +1,49 @@
+import io
+
+from objexplore.cached_object import CachedObject
+from objexplore.iterators import IteratorBuffer, IteratorCachedObject, is_iterator
+
+
+def test_is_iterator():
+    assert is_iterator(iter([1]))
+    assert is_iterator(x for x in range(3))
+    assert not is_iterator([1])
+    assert not is_iterator(io.StringIO("a\nb"))
+
+
+def test_buffer_pulls_pages():
+    buffer = IteratorBuffer(iter(range(250)), page_size=100, max_items=1000)
+    assert buffer.pull(1)
+    assert buffer.items == list(range(100))
+    assert not buffer.pull(50)
+    buffer.pull(101)
+    buffer.pull(201)
+    assert len(buffer.items) == 250 and buffer.exhausted
+
+
+def test_buffer_bounded():
+    buffer = IteratorBuffer(iter(range(10**9)), page_size=100, max_items=150)
+    buffer.pull(1000)
+    assert len(buffer.items) == 150 and buffer.full and not buffer.exhausted
+
+
+def test_buffer_error():
+    def fails():
+        yield 1
+        raise ValueError("boom")
+
+    buffer = IteratorBuffer(fails())
+    buffer.pull(10)
+    assert buffer.items == [1]
+    assert isinstance(buffer.error, ValueError)
+
+
+def test_return_value_hands_back_items():
+    source = iter(range(300))
+    cached_obj = CachedObject(source, attr_name="source")
+    assert isinstance(cached_obj, IteratorCachedObject)
+    cached_obj.cache()
+    cached_obj.prefetch(10)
+    assert len(cached_obj.filtered_list) == 100
+    assert cached_obj.filtered_list[5][1].obj == 5
+    assert list(cached_obj.return_value()) == list(range(300))
@@ -1,3 +1,5 @@
+from objexplore.cached_object import CachedObject
+from objexplore.dataframes import DataFrameCachedObject, SeriesCachedObject
 from objexplore.utils import is_empty
 import pandas as pd
 
@@ -5,3 +7,35 @@ import pandas as pd
 def test_dataframe():
     df = pd.DataFrame()
     assert is_empty(df)
+
+
+def test_dataframe_columns():
+    df = pd.DataFrame({"a": range(1200), "b": [None, "x"] * 600})
+    cached_obj = CachedObject(df, attr_name="df")
+    assert isinstance(cached_obj, DataFrameCachedObject)
+    cached_obj.cache()
+    assert list(cached_obj.filtered_dict) == ["a", "b"]
+    # No attribute is looked up, `df.values` would convert the whole frame
+    assert cached_obj.public_attributes == {}
+
+    cached_obj.counts.task.join()  # type: ignore
+    cached_obj.refresh()
+    assert "600 null" in cached_obj.filtered_dict["b"].text.plain
+    assert "shape" in cached_obj.summary().plain
+
+    column = cached_obj.filtered_dict["a"].cached_object
+    assert isinstance(column, SeriesCachedObject)
+    column.cache()
+    assert len(column.filtered_list) == 1200
+    text, value = column.filtered_list[1100]
+    # Only the page of rows displayed is taken from the Series
+    assert list(column.pages) == [2]
+    assert value.obj == 1100
+    assert value.dotpath.plain == 'df["a"][1100]'
+
+
+def test_series_nulls_counted_in_background():
+    cached_obj = CachedObject(pd.Series([None, 1.0] * 500), attr_name="s")
+    cached_obj.summary()
+    cached_obj.deep_memory.task.join()  # type: ignore
+    assert "null 500" in cached_obj.summary().plain
@@ -0,0 +1,29 @@
+import json
+
+from objexplore.cached_object import CachedObject
+from objexplore.profiler import profile_attributes
+
+
+class Client:
+    ok = 1
+
+    @property
+    def broken(self):
+        raise ConnectionError("no route to host")
+
+
+def test_profile_records_exceptions():
+    report = profile_attributes(CachedObject(Client(), attr_name="client"))
+    profiles = {profile.name: profile for profile in report.profiles}
+    assert profiles["broken"].exception == "ConnectionError: no route to host"
+    assert profiles["ok"].exception is None
+
+
+def test_profile_export(tmp_path):
+    report = profile_attributes(
+        CachedObject(Client(), attr_name="client"), use_cprofile=True
+    )
+    path = report.export(str(tmp_path / "profile.json"))
+    data = json.loads(open(path).read())
+    assert data["dotpath"] == "client"
+    assert {"ok", "broken"} <= {attr["name"] for attr in data["attributes"]}
@@ -0,0 +1,59 @@
+import gc
+import weakref
+
+from objexplore.cached_object import CachedObject
+from objexplore.referrers import ReferrerCache, ReferrerSearch
+
+
+class Service:
+    def __init__(self, cache):
+        self.cache = cache
+
+
+def test_referrers():
+    cache = {"user": object()}
+    registry = {"main": Service(cache)}
+    # Objects created by objexplore are not listed as referrers
+    cached_obj = CachedObject(cache, attr_name="cache")
+
+    search = ReferrerSearch(cache).start()
+    search.task.join()  # type: ignore
+    lines = [(line.depth, line.label.plain) for line in search.lines]
+    assert (0, "Service.cache") in lines
+    assert (1, 'dict["main"]') in lines
+    assert not any("CachedObject" in label for _, label in lines)
+    assert registry and cached_obj
+
+
+def search_service(searches: ReferrerCache) -> weakref.ref:
+    """ Search the referrers of a new object, from a frame that is gone once the search is done """
+    service = Service(None)
+    search = searches.get(service)
+    assert searches.get(service) is search
+    search.task.join()  # type: ignore
+    # The cache holding on to the object is not one of its referrers
+    assert [line.label.plain.split()[0] for line in search.lines] == ["frame"]
+    return weakref.ref(service)
+
+
+def test_referrer_cache_releases_objects():
+    searches = ReferrerCache(max_size=2)
+    first = search_service(searches)
+    second = search_service(searches)
+    search_service(searches)
+    gc.collect()
+    assert first() is None
+    assert second() is not None
+
+
+def test_cancelled_search_restarted():
+    searches = ReferrerCache()
+    service = Service(None)
+    search = searches.get(service)
+    search.cancel()
+    search.task.join()  # type: ignore
+    restarted = searches.get(service)
+    assert restarted is not search
+    restarted.task.join()  # type: ignore
+    assert not restarted.cancelled
+    assert searches.get(service) is restarted
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from objexplore.remote import RemoteModel, Session, serve
+from objexplore.virtual import VirtualCachedObject
+from objexplore.walk import iter_children
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="Unix domain sockets are not available"
+)
+
+TARGET = """
+import sys, time
+import objexplore
+worker = {"jobs": list(range(1234)), "name": "w" * 1000}
+objexplore.serve(worker, sys.argv[1], name="worker")
+time.sleep(60)
+"""
+
+
+def test_explore_subprocess(tmp_path):
+    path = str(tmp_path / "worker.sock")
+    process = subprocess.Popen([sys.executable, "-c", TARGET, path])
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+
+        model = RemoteModel(path, repr_budget=50)
+        cached_obj = VirtualCachedObject(model, model.root(), attr_name=model.name)
+        cached_obj.cache()
+        assert list(cached_obj.filtered_dict) == ["jobs", "name"]
+        assert len(cached_obj.filtered_dict["name"].cached_object.node.repr) == 50
+
+        jobs = cached_obj.filtered_dict["jobs"].cached_object
+        jobs.cache()
+        assert len(jobs.filtered_list) == 1234
+        # Only the first page is fetched until further items are displayed
+        assert list(jobs.pages) == [0]
+        _, item = jobs.filtered_list[1200]
+        assert item.node.repr == "1200"
+        assert item.dotpath.plain == 'worker["jobs"][1200]'
+        model.close()
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_serve_in_process(tmp_path):
+    path = str(tmp_path / "obj.sock")
+    with serve(list(range(10)), path):
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        model = RemoteModel(path)
+        model.page_size = 3
+        assert [child.name for child in model.children(model.root().id)] == [
+            str(index) for index in range(10)
+        ]
+        model.close()
+    assert not os.path.exists(path)
+
+
+looked_up = []
+
+
+class Lookups:
+    """ Attributes `a` to `e` that record being looked up """
+
+    for name in "abcde":
+        locals()[name] = property(lambda self, name=name: looked_up.append(name))
+    del name
+
+
+def test_session_windows():
+    def window(session, node_id, offset, limit):
+        return [step.name for step, _ in session.children(node_id, offset, limit)]
+
+    for obj in (list(range(10)), {f"k{i}": i for i in range(10)}, set(range(10))):
+        session = Session(obj, "obj")
+        names = [step.name for step, _ in iter_children(obj)]
+        assert (
+            window(session, 0, 0, 4)
+            + window(session, 0, 4, 4)
+            + window(session, 0, 8, 4)
+            == names
+        )
+        # Windows that do not follow the previous one are skipped to
+        assert window(session, 0, 2, 3) == names[2:5]
+
+    session = Session(Lookups(), "obj")
+    assert window(session, 0, 1, 2) == ["b", "c"]
+    # Only the attributes in the window are looked up
+    assert looked_up == ["b", "c"]
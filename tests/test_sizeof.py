@@ -0,0 +1,69 @@
+import gc
+import sys
+import weakref
+
+from objexplore.sizeof import DeepSize, SizeCache, deep_sizeof
+
+
+def test_deep_sizeof_handles_cycles():
+    a = [1.5]
+    b = [a]
+    a.append(b)
+    assert deep_sizeof(a) == sys.getsizeof(a) + sys.getsizeof(b) + sys.getsizeof(1.5)
+
+
+def test_deep_sizeof_node_budget():
+    size = DeepSize([object() for _ in range(100)], max_nodes=10).compute()
+    assert size.done and size.truncated
+    assert size.num_nodes == 10
+
+
+class Blob:
+    pass
+
+
+def test_size_cache_releases_objects():
+    sizes = SizeCache(max_size=2)
+    first = Blob()
+    ref = weakref.ref(first)
+    sizes.get(first).compute()
+    assert sizes.get(first) is sizes.get(first)
+    for _ in range(2):
+        sizes.get(Blob()).compute()
+    sizes.task.join()
+    del first
+    gc.collect()
+    assert ref() is None
+
+
+def test_sort_by_deep_size_in_background():
+    from objexplore.cached_object import CachedObject, SortMode
+
+    cached_obj = CachedObject(
+        {"small": [1], "large": [[0] * 100 for _ in range(10)], "medium": [[0] * 100]},
+        attr_name="data",
+    )
+    cached_obj.cache()
+    cached_obj.set_sort(SortMode.deep_size)
+    # Listed in their default order until the sizes are computed
+    assert list(cached_obj.filtered_dict) == ["small", "large", "medium"]
+    assert cached_obj.sort_task is not None
+    cached_obj.sort_task.join()
+    cached_obj.update_sort()
+    assert list(cached_obj.filtered_dict) == ["large", "medium", "small"]
+    assert cached_obj.sort_task is None
+
+
+def test_size_breakdown_builds_no_rows():
+    from objexplore.cached_object import CachedObject
+    from objexplore.sizeof import SizeBreakdown
+
+    cached_obj = CachedObject([[0] * index for index in range(200)], attr_name="data")
+    cached_obj.cache()
+    breakdown = SizeBreakdown(cached_obj, SizeCache())
+    breakdown.task.join()
+    assert cached_obj.list_rows.rows == {}  # type: ignore
+    assert len(breakdown.children) == 200
+    label, entry = max(breakdown.children, key=lambda child: child[1].size)
+    assert label.plain.strip().startswith("[199]")
+    assert entry.done
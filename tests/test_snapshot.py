@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from objexplore import export_snapshot
+
+
+class Service:
+    def __init__(self):
+        self.name = "api"
+        self.config = {"port": 8080, "tags": ["a", "b"]}
+        self.same_config = self.config
+
+
+def test_export_snapshot(tmp_path):
+    path = str(tmp_path / "service.db")
+    num_nodes = export_snapshot(Service(), path, name="service", chunk_size=2)
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT count(*) FROM nodes").fetchone()[0] == num_nodes
+    root_edges = connection.execute(
+        "SELECT name, child FROM edges WHERE parent = 0 ORDER BY position"
+    ).fetchall()
+    assert [name for name, _ in root_edges] == ["config", "name", "same_config"]
+    # Shared objects are saved once and referenced by several edges
+    assert root_edges[0][1] == root_edges[2][1]
+    assert dict(connection.execute("SELECT key, value FROM meta"))["name"] == "service"
+
+
+def test_export_snapshot_node_budget(tmp_path):
+    path = str(tmp_path / "big.db")
+    assert export_snapshot(list(range(1000)), path, max_nodes=10) == 10
+
+
+def test_explore_snapshot_model(tmp_path):
+    from objexplore.snapshot import SnapshotModel
+    from objexplore.virtual import VirtualCachedObject
+
+    path = str(tmp_path / "service.db")
+    export_snapshot(Service(), path, name="service")
+    model = SnapshotModel(path)
+    cached_obj = VirtualCachedObject(model, model.root(), attr_name=model.name)
+    cached_obj.cache()
+    assert list(cached_obj.public_attributes) == ["config", "name", "same_config"]
+
+    config = cached_obj.public_attributes["config"]
+    config.cache()
+    assert list(config.filtered_dict) == ["port", "tags"]
+    assert (
+        config.filtered_dict["tags"].cached_object.dotpath.plain
+        == 'service.config["tags"]'
+    )
+
+
+def test_export_snapshot_overwrites(tmp_path):
+    path = str(tmp_path / "service.db")
+    export_snapshot(Service(), path, name="first")
+    num_nodes = export_snapshot(Service(), path, name="second")
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT count(*) FROM nodes").fetchone()[0] == num_nodes
+    assert dict(connection.execute("SELECT key, value FROM meta"))["name"] == "second"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["service.db"]
+
+
+class Interrupted:
+    def __len__(self):
+        raise KeyboardInterrupt
+
+
+def test_failed_export_keeps_snapshot(tmp_path):
+    path = str(tmp_path / "service.db")
+    num_nodes = export_snapshot(Service(), path, name="first")
+
+    service = Service()
+    service.config["broken"] = Interrupted()
+    with pytest.raises(KeyboardInterrupt):
+        export_snapshot(service, path, name="second")
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT count(*) FROM nodes").fetchone()[0] == num_nodes
+    assert dict(connection.execute("SELECT key, value FROM meta"))["name"] == "first"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["service.db"]
+
+
+def test_draw_snapshot_in_every_sort_mode(tmp_path):
+    from blessed import Terminal
+
+    from objexplore.cached_object import SortMode
+    from objexplore.explorer import Explorer
+    from objexplore.snapshot import SnapshotModel
+    from objexplore.virtual import VirtualCachedObject
+
+    path = str(tmp_path / "service.db")
+    export_snapshot({"small": 1, "large": list(range(100))}, path, name="service")
+    model = SnapshotModel(path)
+    cached_obj = VirtualCachedObject(model, model.root(), attr_name=model.name)
+    cached_obj.cache()
+    explorer = Explorer(cached_obj, Terminal())
+    explorer.get_layout()
+    for mode in SortMode.modes[1:]:
+        explorer.cycle_sort()
+        assert cached_obj.sort_mode == mode
+        explorer.get_layout()
+    # Sorted by the sizes saved in the snapshot, without computing any in the background
+    assert cached_obj.sort_task is None
+    assert list(cached_obj.filtered_dict) == ["large", "small"]
@@ -0,0 +1,38 @@
+from collections import namedtuple
+from dataclasses import dataclass
+
+from objexplore.tables import RecordTable, record_fields
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@dataclass
+class User:
+    name: str
+    age: int
+
+
+def test_record_fields():
+    assert record_fields([{"a": 1}, {"a": 2, "b": 3}]) == ["a", "b"]
+    assert record_fields([User("a", 1), User("b", 2)]) == ["name", "age"]
+    assert record_fields([Point(1, 2)] * 100) == ["x", "y"]
+    assert record_fields([{"a": 1}, Point(1, 2)]) is None
+    assert record_fields([{1: "a"}]) is None
+    assert record_fields([1, 2, 3]) is None
+    assert record_fields([]) is None
+
+
+def test_record_table_summaries():
+    records = [{"id": index, "tag": index % 3} for index in range(5000)]
+    records.append({"id": None})
+    table = RecordTable(records, ["id", "tag"])
+    table.task.join()
+    assert table.summaries["id"].nulls == 1
+    assert table.summaries["id"].max == 4999
+    assert table.summaries["tag"].distinct_text == "3"
+    assert table.summaries["tag"].nulls == 1
+
+    lines = table.get_lines(records[:2], selected=0)
+    # The header, two rows and the three lines of the summary
+    assert len(lines) == 6
+    assert "tag" in lines[0].plain
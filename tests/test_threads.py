@@ -0,0 +1,39 @@
+import threading
+
+from objexplore.threads import ThreadsCachedObject, snapshot_threads
+
+
+def wait_for(event: threading.Event, marker: str):
+    event.wait()
+
+
+def test_snapshot_threads():
+    event = threading.Event()
+    worker = threading.Thread(
+        target=wait_for, args=(event, "in the worker"), name="worker", daemon=True
+    )
+    worker.start()
+    try:
+        snapshot = snapshot_threads()
+        stacks = {stack.name: stack for stack in snapshot.stacks}
+        assert stacks["MainThread"].frames[0].f_code.co_name == "test_snapshot_threads"
+
+        cached_obj = ThreadsCachedObject(snapshot)
+        cached_obj.cache()
+        stack = cached_obj.filtered_dict["worker"].cached_object
+        stack.cache()
+        assert len(stack.filtered_list) == len(stacks["worker"].frames)
+        frame = next(
+            row[1]
+            for row in stack.filtered_list
+            if row[1].obj.f_code.co_name == "wait_for"
+        )
+        assert frame.dotpath.plain.startswith('threads["worker"][')
+        frame.cache()
+        f_locals = frame.public_attributes["f_locals"]
+        f_locals.cache()
+        assert f_locals.filtered_dict["marker"].cached_object.obj == "in the worker"
+        snapshot.close()
+    finally:
+        event.set()
+        worker.join()
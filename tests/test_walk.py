@@ -0,0 +1,71 @@
+from objexplore import walk
+from objexplore.cached_object import DotPath, build_dotpath
+from objexplore.walk import ATTR, INDEX, Step, extend_dotpath, format_path, parse_path
+
+
+class Config:
+    def __init__(self):
+        self.name = "service"
+        self.limits = {"cpu": 2, "hosts": ["a", "b"]}
+
+    def method(self):
+        pass
+
+
+def test_walk_breadth_first():
+    paths = [record.dotpath for record in walk(Config(), name="config")]
+    assert paths == [
+        "config",
+        "config.limits",
+        "config.name",
+        'config.limits["cpu"]',
+        'config.limits["hosts"]',
+        'config.limits["hosts"][0]',
+        'config.limits["hosts"][1]',
+    ]
+
+
+def test_walk_depth_first_limits():
+    records = list(walk(Config(), name="config", order="dfs", max_depth=2))
+    assert [record.dotpath for record in records] == [
+        "config",
+        "config.limits",
+        'config.limits["cpu"]',
+        'config.limits["hosts"]',
+        "config.name",
+    ]
+    assert len(list(walk(Config(), max_nodes=3))) == 3
+
+
+def test_walk_cycles_and_types():
+    a = {"name": "a"}
+    a["self"] = a
+    records = list(walk(a, name="a", order="dfs", unique=False, types=(str,)))
+    assert [(r.dotpath, r.length) for r in records] == [('a["name"]', 1)]
+
+
+def test_parse_path():
+    steps = (
+        Step(ATTR, "limits"),
+        Step(INDEX, "hosts"),
+        Step(INDEX, 1),
+    )
+    assert parse_path('config.limits["hosts"][1]') == ("config", steps)
+    assert parse_path(".limits['hosts'][1]") == (None, steps)
+    assert format_path("config", steps) == 'config.limits["hosts"][1]'
+    assert parse_path("[(1, 2)]") == (
+        None,
+        (Step(INDEX, (1, 2)),),
+    )
+
+
+def test_extend_dotpath():
+    root = DotPath(attr_name="obj")
+    path = extend_dotpath(root, (Step(ATTR, "a"), Step(INDEX, "k"), Step(INDEX, 3)))
+    assert path.plain == 'obj.a["k"][3]'
+    assert path.text.plain == path.plain
+    assert path == extend_dotpath(root, parse_path('obj.a["k"][3]')[1])
+    assert hash(path) == hash(build_dotpath(path.parent, None, 3))
+    assert path != extend_dotpath(
+        root, (Step(ATTR, "a"), Step(INDEX, "k"), Step(INDEX, "3"))
+    )
@@ -0,0 +1,129 @@
+from objexplore.cached_object import CachedObject
+from objexplore.watch import Watch, fingerprint
+
+
+class Counter:
+    def __init__(self):
+        self.hits = 0
+        self.queue = []
+
+
+def poll_now(watch: Watch, cached_obj: CachedObject, visible=()):
+    watch.next_poll = 0
+    watch.poll(cached_obj, visible)
+
+
+def test_fingerprint_bounded():
+    items = list(range(100))
+    before = fingerprint(items, max_items=10)
+    items[50] = -1
+    assert fingerprint(items, max_items=10) == before
+    items.append(0)
+    assert fingerprint(items, max_items=10) != before
+
+
+def test_watch_dict():
+    data = {"a": [1], "b": 2}
+    cached_obj = CachedObject(data, attr_name="data")
+    cached_obj.cache()
+    unchanged = cached_obj.dict_rows["b"].cached_object
+    watch = Watch()
+    watch.poll(cached_obj)
+
+    data["a"].append(2)
+    data["c"] = 3
+    del data["b"]
+    poll_now(watch, cached_obj)
+    assert list(cached_obj.filtered_dict) == ["a", "c"]
+    assert cached_obj.length == 2
+    assert watch.is_changed(cached_obj.filtered_dict["a"].cached_object)
+    assert not watch.is_changed(unchanged)
+
+
+def test_watch_list_and_attributes():
+    items = [[], "x"]
+    cached_obj = CachedObject(items, attr_name="items")
+    cached_obj.cache()
+    first = cached_obj.list_rows[1][1]
+    # Rows are only polled once they were displayed
+    cached_obj.list_rows[0]
+    watch = Watch()
+    watch.poll(cached_obj)
+    items[0].append(1)
+    items.append(None)
+    poll_now(watch, cached_obj)
+    assert len(cached_obj.filtered_list) == 3
+    # Rows that did not change are kept
+    assert cached_obj.list_rows[1][1] is first
+    assert watch.is_changed(cached_obj.list_rows[0][1])
+
+    counter = Counter()
+    cached_obj = CachedObject(counter, attr_name="counter")
+    cached_obj.cache()
+    watch.poll(cached_obj)
+    counter.hits += 1
+    poll_now(watch, cached_obj)
+    changed = [
+        attr
+        for attr, child in cached_obj.public_attributes.items()
+        if watch.is_changed(child)
+    ]
+    assert changed == ["hits"]
+
+
+def test_watch_polls_a_slice_at_a_time():
+    items = [[index] for index in range(100)]
+    cached_obj = CachedObject(items, attr_name="items")
+    cached_obj.cache()
+    rows = [cached_obj.list_rows[index][1] for index in (5, 50)]
+    watch = Watch(slice_size=10)
+    watch.poll(cached_obj)
+    items[5].append(0)
+    items[50].append(0)
+
+    poll_now(watch, cached_obj, visible=range(0, 10))
+    assert watch.is_changed(cached_obj.list_rows[5][1])
+    # Not in view nor in the first slice
+    assert cached_obj.list_rows[50][1] is rows[1]
+    for _ in range(5):
+        poll_now(watch, cached_obj)
+    assert cached_obj.list_rows[50][1] is not rows[1]
+    assert watch.is_changed(cached_obj.list_rows[50][1])
+    assert len(watch.fingerprints) == 60
+
+
+def test_watch_reads_dict_slices_in_order():
+    data = {key: [key] for key in range(25)}
+    cached_obj = CachedObject(data, attr_name="data")
+    cached_obj.cache()
+    watch = Watch(slice_size=10)
+    watch.poll(cached_obj)
+    poll_now(watch, cached_obj)
+    items = watch.items
+    poll_now(watch, cached_obj)
+    # Carried on from where the previous slice ended instead of skipping to it again
+    assert watch.items is items
+    assert watch.cursor == 20
+
+    data[22].append(0)
+    poll_now(watch, cached_obj)
+    assert watch.is_changed(cached_obj.dict_rows[22].cached_object)
+    # Started over from the first key once the end was reached, or the dict was resized
+    poll_now(watch, cached_obj)
+    assert watch.items is not items and watch.cursor == 10
+    data[25] = []
+    poll_now(watch, cached_obj)
+    assert watch.cursor == 10 and list(cached_obj.filtered_dict)[-1] == 25
+
+
+def test_watch_set_item_in_view_replaced():
+    data = {"a", "b", "c"}
+    cached_obj = CachedObject(data, attr_name="data")
+    cached_obj.cache()
+    text, child = cached_obj.list_rows[0]
+    watch = Watch(slice_size=1)
+    watch.poll(cached_obj)
+    data.remove(child.obj)
+    data.add("d")
+    poll_now(watch, cached_obj, visible=range(3))
+    assert sorted(row[1].obj for row in cached_obj.filtered_list) == sorted(data)